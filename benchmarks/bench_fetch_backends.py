@@ -0,0 +1,63 @@
+"""Compare the throughput and peak memory of the fetch backends on a real Elmer table.
+
+Each backend runs in its own subprocess so that peak resident memory is measured
+independently.  Needs a connection to Elmer; backends that are not installed are skipped.
+
+Usage:  python benchmarks/bench_fetch_backends.py --schema HHSurvey --table v_trips
+            [--backends pyodbc arrow-odbc] [--return-type pandas] [--repeat 3]
+"""
+import argparse
+import json
+import subprocess
+import sys
+import time
+
+
+def run_one(schema, table, backend, return_type, repeat):
+    import resource
+    from psrcelmerpy.conn.elmer_conn import ElmerConn
+    conn = ElmerConn(fetch_backend=backend)
+    best, rows = None, 0
+    for i in range(repeat):
+        start = time.perf_counter()
+        result = conn.get_table(schema, table, return_type=return_type)
+        elapsed = time.perf_counter() - start
+        rows = len(result)
+        best = elapsed if best is None else min(best, elapsed)
+        del result
+    peak_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    if sys.platform == 'darwin':
+        peak_mb /= 1024
+    print(json.dumps({'backend': backend, 'rows': rows, 'seconds': best, 'peak_mb': peak_mb}))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--schema', required=True)
+    parser.add_argument('--table', required=True)
+    parser.add_argument('--backends', nargs='+', default=['pyodbc', 'arrow-odbc'])
+    parser.add_argument('--return-type', default='pandas', choices=['pandas', 'arrow', 'pandas-arrow'])
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--child', action='store_true', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        run_one(args.schema, args.table, args.backends[0], args.return_type, args.repeat)
+        return
+
+    print(f"{args.schema}.{args.table}  return_type={args.return_type}")
+    for backend in args.backends:
+        cmd = [sys.executable, __file__, '--child', '--schema', args.schema, '--table', args.table,
+               '--backends', backend, '--return-type', args.return_type, '--repeat', str(args.repeat)]
+        proc = subprocess.run(cmd, capture_output=True, text=True)
+        if proc.returncode != 0:
+            print(f"{backend:12s} skipped: {proc.stderr.strip().splitlines()[-1] if proc.stderr else 'failed'}")
+            continue
+        result = json.loads(proc.stdout.strip().splitlines()[-1])
+        rate = result['rows'] / result['seconds'] if result['seconds'] else float('nan')
+        print(f"{backend:12s} rows: {result['rows']:>10d}   {result['seconds']:8.3f} s   "
+              f"{rate:12,.0f} rows/s   peak rss: {result['peak_mb']:8.1f} MB")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,61 @@
+"""Compare the WKT and WKB geometry paths of ElmerGeoConn.sql_to_gdf on synthetic polygons.
+
+No database is needed: get_query is replaced by a function that returns a prebuilt
+data frame, so the timings cover geometry decoding and geodataframe construction only.
+
+Usage:  python benchmarks/bench_geometry_decode.py [--rows 50000] [--vertices 64] [--repeat 3]
+"""
+import argparse
+import time
+import numpy as np
+import pandas as pd
+import shapely
+from psrcelmerpy.conn.elmergeo_conn import ElmerGeoConn
+
+
+def make_polygons(rows, vertices, seed=42):
+    rng = np.random.default_rng(seed)
+    angles = np.linspace(0, 2 * np.pi, vertices, endpoint=False)
+    centers = rng.uniform([1200000, 100000], [1400000, 300000], size=(rows, 2))
+    radii = rng.uniform(50, 500, size=(rows, vertices))
+    xs = centers[:, [0]] + radii * np.cos(angles)
+    ys = centers[:, [1]] + radii * np.sin(angles)
+    rings = [np.column_stack([x, y]) for x, y in zip(xs, ys)]
+    return(shapely.polygons(rings))
+
+
+def time_path(conn, frame, geometry_format, repeat):
+    conn.get_query = lambda sql, **kwargs: frame.copy()
+    best = None
+    for i in range(repeat):
+        start = time.perf_counter()
+        conn.sql_to_gdf('benchmark', geometry_format=geometry_format)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return(best)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=50000)
+    parser.add_argument('--vertices', type=int, default=64)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    geoms = make_polygons(args.rows, args.vertices)
+    ids = np.arange(args.rows)
+    wkt_frame = pd.DataFrame({'OBJECTID': ids, 'Shape': shapely.to_wkt(geoms, rounding_precision=-1)})
+    wkb_frame = pd.DataFrame({'OBJECTID': ids, 'Shape': shapely.to_wkb(geoms), 'SRID': 2285})
+    conn = ElmerGeoConn.__new__(ElmerGeoConn)
+
+    print(f"{args.rows} polygons x {args.vertices} vertices")
+    wkt_mb = wkt_frame['Shape'].str.len().sum() / 1e6
+    wkb_mb = wkb_frame['Shape'].map(len).sum() / 1e6
+    print(f"payload  wkt: {wkt_mb:8.1f} MB   wkb: {wkb_mb:8.1f} MB")
+    wkt_secs = time_path(conn, wkt_frame, 'wkt', args.repeat)
+    wkb_secs = time_path(conn, wkb_frame, 'wkb', args.repeat)
+    print(f"decode   wkt: {wkt_secs:8.3f} s    wkb: {wkb_secs:8.3f} s    speedup: {wkt_secs / wkb_secs:.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,146 @@
+"""Benchmark the main read and write paths of psrcelmerpy offline, against a SQLite stand-in.
+
+Builds a synthetic wide table and a polygon layer in a local stand-in database (see
+standin.py), then times get_query, get_table, stage_table, sql_to_gdf and read_geolayer
+through connections built on that engine.  Each case reports its best time, throughput
+and peak Python heap (traced in a separate, untimed run), and is appended to a JSON
+lines history so that runs can be compared over time; the change from the previous
+run of the same case and size is printed alongside.
+
+The stand-in is not SQL Server, so absolute numbers are not comparable to Elmer's.
+They are meant for catching regressions in the client-side work: materialization,
+geometry decoding, reprojection and bulk-load batching.
+
+Usage:  python benchmarks/bench_suite.py [--rows 100000] [--columns 40] [--features 20000]
+            [--vertices 64] [--repeat 3] [--cases get_query read_geolayer ...]
+            [--history benchmarks/results/history.jsonl] [--workdir DIR]
+"""
+import argparse
+import datetime
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import standin
+from psrcelmerpy.conn.elmer_conn import ElmerConn
+from psrcelmerpy.conn.elmergeo_conn import ElmerGeoConn
+
+CASES = ('get_query', 'get_table', 'stage_table', 'sql_to_gdf', 'read_geolayer')
+DEFAULT_HISTORY = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'results', 'history.jsonl')
+
+
+def result_bytes(result):
+    try:
+        return(int(result.memory_usage(index=True, deep=True).sum()))
+    except Exception:
+        return(0)
+
+
+def build_cases(engine, frame):
+    econn = ElmerConn(engine=engine)
+    gconn = ElmerGeoConn(engine=engine)
+    gdf_sql = "SELECT OBJECTID, Shape.STAsBinary() as Shape, Shape.STSrid as SRID FROM dbo.bench_layer"
+    return({'get_query': lambda: econn.get_query("select * from bench.wide"),
+            'get_table': lambda: econn.get_table('bench', 'wide'),
+            'stage_table': lambda: econn.stage_table(frame, 'bench_stage', if_exists='replace'),
+            'sql_to_gdf': lambda: gconn.sql_to_gdf(gdf_sql, geometry_format='wkb'),
+            'read_geolayer': lambda: gconn.read_geolayer('bench_layer')})
+
+
+def run_case(fn, repeat):
+    times = []
+    result = None
+    for i in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        times.append(time.perf_counter() - start)
+    # stage_table returns its load statistics rather than a frame
+    rows = result['rows'] if isinstance(result, dict) else len(result)
+    nbytes = result_bytes(result)
+    del result
+    tracemalloc.start()
+    fn()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    times.sort()
+    return({'seconds': times[0], 'median_seconds': times[len(times) // 2], 'rows': rows,
+            'result_mb': nbytes / 1e6, 'peak_mb': peak / 1e6})
+
+
+def git_commit():
+    try:
+        proc = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__)))
+        return(proc.stdout.strip() or None)
+    except OSError:
+        return(None)
+
+
+def read_history(path):
+    if not os.path.exists(path):
+        return([])
+    with open(path, 'r') as f:
+        return([json.loads(line) for line in f if line.strip()])
+
+
+def previous_run(history, case, size):
+    for entry in reversed(history):
+        if entry['case'] == case and entry['size'] == size:
+            return(entry)
+    return(None)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=100000)
+    parser.add_argument('--columns', type=int, default=40)
+    parser.add_argument('--features', type=int, default=20000)
+    parser.add_argument('--vertices', type=int, default=64)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--cases', nargs='+', default=list(CASES), choices=CASES)
+    parser.add_argument('--history', default=DEFAULT_HISTORY,
+                        help="JSON lines file the results are appended to ('' to not record them)")
+    parser.add_argument('--workdir', default=None, help="Where to build the stand-in (default: a temporary directory)")
+    args = parser.parse_args()
+
+    workdir = args.workdir or tempfile.mkdtemp(prefix='psrcelmerpy-bench-')
+    engine = standin.make_engine(workdir)
+    frame = standin.add_wide_table(engine, 'bench', 'wide', rows=args.rows, columns=args.columns)
+    standin.add_layer(engine, 'bench_layer', rows=args.features, vertices=args.vertices)
+    cases = build_cases(engine, frame)
+
+    history = read_history(args.history) if args.history else []
+    run_info = {'run_at': datetime.datetime.now().isoformat(timespec='seconds'),
+                'commit': git_commit(),
+                'python': platform.python_version()}
+    print(f"table: {args.rows} rows x {args.columns} columns   layer: {args.features} polygons x {args.vertices} vertices")
+    entries = []
+    for case in args.cases:
+        result = run_case(cases[case], args.repeat)
+        size = ({'rows': args.rows, 'columns': args.columns} if case in ('get_query', 'get_table', 'stage_table')
+                else {'features': args.features, 'vertices': args.vertices})
+        entry = dict(run_info, case=case, size=size, **result)
+        rate = result['rows'] / result['seconds'] if result['seconds'] else float('nan')
+        previous = previous_run(history, case, size)
+        change = ''
+        if previous is not None and previous['seconds']:
+            change = f"   vs {previous['commit'] or previous['run_at']}: {result['seconds'] / previous['seconds'] - 1:+.0%} time, " \
+                     f"{result['peak_mb'] - previous['peak_mb']:+.1f} MB peak"
+        print(f"{case:14s} {result['seconds']:8.3f} s   {rate:12,.0f} rows/s   peak heap: {result['peak_mb']:8.1f} MB{change}")
+        entries.append(entry)
+
+    if args.history:
+        os.makedirs(os.path.dirname(os.path.abspath(args.history)), exist_ok=True)
+        with open(args.history, 'a') as f:
+            for entry in entries:
+                f.write(json.dumps(entry) + '\n')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,163 @@
+"""A local SQLite stand-in for Elmer and ElmerGeo, with synthetic tables and layers.
+
+SQLite plays SQL Server well enough for the read and staging paths: schemas are
+attached databases, INFORMATION_SCHEMA is an ordinary pair of tables kept in step
+with the tables created here, and the few geometry methods psrcelmerpy emits
+(STAsBinary, STAsText, STSrid, STNumPoints, Reduce, STIntersects, STPointN and
+EnvelopeAggregate) are rewritten into shapely-backed SQL functions before each
+statement runs.  Geometries are stored as WKB.
+
+    engine = make_engine(directory)
+    add_wide_table(engine, 'bench', 'wide', rows=100000)
+    add_layer(engine, 'parcels', rows=20000)
+    conn = ElmerGeoConn(engine=engine)
+"""
+import os
+import re
+import numpy as np
+import pandas as pd
+import shapely
+import sqlalchemy
+
+SCHEMAS = ('dbo', 'stg', 'bench', 'INFORMATION_SCHEMA')
+
+_rewrites = ((re.compile(r'(\w+)\.Reduce\(([\w.:?]+)\)'), r'st_reduce(\1, \2)'),
+             (re.compile(r'(\w+)\.STNumPoints\(\)'), r'st_numpoints(\1)'),
+             (re.compile(r'DATALENGTH\('), 'length('),
+             (re.compile(r'(st_reduce\([^)]*\)|\w+)\.STAs(?:Binary|Text)\(\)'), r'\1'),
+             (re.compile(r'(\w+)\.STSrid'), '2285'),
+             (re.compile(r'\(max\)', re.IGNORECASE), ''),
+             (re.compile(r'(\w+)\.STIntersects\(geometry::STGeomFromText\(([^,]+), \d+\)\)'),
+              r'st_intersects(\1, \2)'),
+             (re.compile(r'geometry::EnvelopeAggregate\((\w+)\)'), r'st_envelope_aggregate(\1)'),
+             (re.compile(r'(\w+)\.(\w+)\.STPointN\((\d+)\)\.ST([XY])'), r"st_point_coord(\1.\2, \3, '\4')"))
+
+
+class _EnvelopeAggregate:
+
+    def __init__(self):
+        self.geoms = []
+
+    def step(self, wkb):
+        if wkb is not None:
+            self.geoms.append(shapely.from_wkb(wkb))
+
+    def finalize(self):
+        if not self.geoms:
+            return(None)
+        return(shapely.to_wkb(shapely.box(*shapely.total_bounds(self.geoms))))
+
+
+def _point_coord(wkb, n, axis):
+    if wkb is None:
+        return(None)
+    x, y = shapely.get_coordinates(shapely.from_wkb(wkb))[n - 1]
+    return(float(x if axis == 'X' else y))
+
+
+def _register_functions(dbapi_connection):
+    dbapi_connection.create_function(
+        'st_reduce', 2, lambda g, t: shapely.to_wkb(shapely.simplify(shapely.from_wkb(g), t)))
+    dbapi_connection.create_function(
+        'st_numpoints', 1, lambda g: int(shapely.get_num_coordinates(shapely.from_wkb(g))))
+    dbapi_connection.create_function(
+        'st_intersects', 2, lambda g, w: int(shapely.from_wkb(g).intersects(shapely.from_wkt(w))))
+    dbapi_connection.create_function('st_point_coord', 3, _point_coord)
+    dbapi_connection.create_aggregate('st_envelope_aggregate', 1, _EnvelopeAggregate)
+
+
+def make_engine(directory):
+    """Return a SQLAlchemy engine over SQLite files in directory, with SQL Server-like schemas."""
+    os.makedirs(directory, exist_ok=True)
+    engine = sqlalchemy.create_engine('sqlite:///{}'.format(os.path.join(directory, 'main.db')))
+
+    @sqlalchemy.event.listens_for(engine, 'connect')
+    def attach(dbapi_connection, record):
+        for schema in SCHEMAS:
+            dbapi_connection.execute("ATTACH DATABASE '{}' AS {}".format(
+                os.path.join(directory, schema + '.db'), schema))
+        _register_functions(dbapi_connection)
+
+    @sqlalchemy.event.listens_for(engine, 'before_cursor_execute', retval=True)
+    def rewrite(conn, cursor, statement, parameters, context, executemany):
+        for pattern, replacement in _rewrites:
+            statement = pattern.sub(replacement, statement)
+        return(statement, parameters)
+
+    with engine.begin() as connection:
+        connection.exec_driver_sql("CREATE TABLE IF NOT EXISTS INFORMATION_SCHEMA.TABLES "
+                                   "(TABLE_SCHEMA, TABLE_NAME, TABLE_TYPE)")
+        connection.exec_driver_sql("CREATE TABLE IF NOT EXISTS INFORMATION_SCHEMA.COLUMNS "
+                                   "(TABLE_SCHEMA, TABLE_NAME, COLUMN_NAME, DATA_TYPE, ORDINAL_POSITION)")
+    return(engine)
+
+
+def _register_table(connection, schema, name, columns, table_type='BASE TABLE'):
+    connection.exec_driver_sql("DELETE FROM INFORMATION_SCHEMA.TABLES WHERE TABLE_SCHEMA = ? AND TABLE_NAME = ?",
+                               (schema, name))
+    connection.exec_driver_sql("DELETE FROM INFORMATION_SCHEMA.COLUMNS WHERE TABLE_SCHEMA = ? AND TABLE_NAME = ?",
+                               (schema, name))
+    connection.exec_driver_sql("INSERT INTO INFORMATION_SCHEMA.TABLES VALUES (?, ?, ?)", (schema, name, table_type))
+    connection.exec_driver_sql("INSERT INTO INFORMATION_SCHEMA.COLUMNS VALUES (?, ?, ?, ?, ?)",
+                               [(schema, name, col_name, data_type, i + 1)
+                                for i, (col_name, data_type) in enumerate(columns)])
+
+
+def _load(engine, schema, name, columns, rows):
+    with engine.begin() as connection:
+        connection.exec_driver_sql("DROP TABLE IF EXISTS {}.{}".format(schema, name))
+        connection.exec_driver_sql("CREATE TABLE {}.{} ({})".format(
+            schema, name, ', '.join("{} {}".format(col_name, data_type) for col_name, data_type in columns)))
+        connection.exec_driver_sql("INSERT INTO {}.{} VALUES ({})".format(
+            schema, name, ', '.join('?' * len(columns))), rows)
+        _register_table(connection, schema, name, columns)
+
+
+def wide_frame(rows, columns=40, seed=42):
+    """A synthetic data frame of roughly equal numbers of int, float, low-cardinality text and free-text columns."""
+    rng = np.random.default_rng(seed)
+    data = {'id': np.arange(rows)}
+    categories = np.array(['King', 'Kitsap', 'Pierce', 'Snohomish', 'Region'])
+    for i in range(columns - 1):
+        kind = i % 4
+        if kind == 0:
+            data['int_{}'.format(i)] = rng.integers(0, 1000000, rows)
+        elif kind == 1:
+            data['float_{}'.format(i)] = rng.normal(1000, 250, rows).round(4)
+        elif kind == 2:
+            data['county_{}'.format(i)] = categories[rng.integers(0, len(categories), rows)]
+        else:
+            data['note_{}'.format(i)] = pd.Series(rng.integers(0, 10 ** 9, rows)).map('note {:09d}'.format).values
+    return(pd.DataFrame(data))
+
+
+def add_wide_table(engine, schema, name, rows=100000, columns=40, seed=42):
+    """Create schema.name from wide_frame() and return the frame."""
+    df = wide_frame(rows, columns, seed)
+    sql_types = {'i': 'INTEGER', 'u': 'INTEGER', 'f': 'REAL'}
+    table_columns = [(col_name, sql_types.get(df[col_name].dtype.kind, 'TEXT')) for col_name in df.columns]
+    values = list(df.astype(object).itertuples(index=False, name=None))
+    _load(engine, schema, name, table_columns, values)
+    return(df)
+
+
+def polygons(rows, vertices=64, seed=42):
+    """Random non-overlapping-ish polygons in State Plane (EPSG:2285) feet around central Puget Sound."""
+    rng = np.random.default_rng(seed)
+    angles = np.linspace(0, 2 * np.pi, vertices, endpoint=False)
+    centers = rng.uniform([1200000, 100000], [1400000, 300000], size=(rows, 2))
+    radii = rng.uniform(50, 500, size=(rows, vertices))
+    xs = centers[:, [0]] + radii * np.cos(angles)
+    ys = centers[:, [1]] + radii * np.sin(angles)
+    return(shapely.polygons([np.column_stack([x, y]) for x, y in zip(xs, ys)]))
+
+
+def add_layer(engine, name, rows=20000, vertices=64, attributes=8, seed=42):
+    """Create the feature class dbo.name with OBJECTID, some attributes and a Shape column; return the geometries."""
+    rng = np.random.default_rng(seed)
+    geoms = polygons(rows, vertices, seed)
+    columns = [('OBJECTID', 'int')] + [('attr_{}'.format(i), 'int') for i in range(attributes)] + [('Shape', 'geometry')]
+    attrs = rng.integers(0, 100000, size=(rows, attributes)).tolist()
+    values = [(i + 1, *attrs[i], wkb) for i, wkb in enumerate(shapely.to_wkb(geoms))]
+    _load(engine, 'dbo', name, columns, values)
+    return(geoms)
@@ -1,2 +1,21 @@
 from .conn.elmer_conn import ElmerConn
-from .conn.elmergeo_conn import ElmerGeoConn
+from .conn.async_conn import AsyncElmerConn, AsyncElmerGeoConn
+from .conn.engine_registry import pool_stats, dispose_engines
+from .conn.parallel import process_map
+from .conn.timeouts import QueryCancelled, QueryTimeout
+
+__all__ = ['ElmerConn', 'ElmerGeoConn', 'AsyncElmerConn', 'AsyncElmerGeoConn', 'pool_stats', 'dispose_engines',
+           'process_map', 'QueryCancelled', 'QueryTimeout']
+
+
+def __getattr__(name):
+    # ElmerGeoConn is imported on first use so that tabular-only scripts
+    # never pay for loading geopandas, shapely and pyproj
+    if name == 'ElmerGeoConn':
+        from .conn.elmergeo_conn import ElmerGeoConn
+        return(ElmerGeoConn)
+    raise AttributeError("module {!r} has no attribute {!r}".format(__name__, name))
+
+
+def __dir__():
+    return(sorted(list(globals()) + ['ElmerGeoConn']))
@@ -1,2 +1,12 @@
 from .elmer_conn import ElmerConn
-from .elmergeo_conn import ElmerGeoConn
\ No newline at end of file
+from .async_conn import AsyncElmerConn, AsyncElmerGeoConn
+from .engine_registry import pool_stats, dispose_engines
+from .parallel import process_map
+from .timeouts import QueryCancelled, QueryTimeout
+
+
+def __getattr__(name):
+    if name == 'ElmerGeoConn':
+        from .elmergeo_conn import ElmerGeoConn
+        return(ElmerGeoConn)
+    raise AttributeError("module {!r} has no attribute {!r}".format(__name__, name))
@@ -0,0 +1,192 @@
+import asyncio
+import contextlib
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from . import timeouts
+from .elmer_conn import ElmerConn
+
+async def gather(*aws, limit=None, return_exceptions=False):
+    """Await several coroutines concurrently, with at most `limit` of them running at a time.
+
+    Parameters
+    ----------
+    *aws : coroutines or awaitables
+    limit : int
+        The largest number of awaitables in flight at once, or None for no limit. (Default value = None)
+    return_exceptions : bool
+        As for asyncio.gather. (Default value = False)
+
+    Returns
+    -------
+    results : list
+        The results in the order the awaitables were passed in
+    """
+    if limit is None:
+        return(await asyncio.gather(*aws, return_exceptions=return_exceptions))
+    semaphore = asyncio.Semaphore(limit)
+
+    async def limited(aw):
+        async with semaphore:
+            return(await aw)
+
+    return(await asyncio.gather(*(limited(aw) for aw in aws), return_exceptions=return_exceptions))
+
+
+class AsyncConnection:
+    """Awaitable versions of a connection's query methods.
+
+    Calls run on a bounded pool of worker threads over the connection's pooled
+    engine, so many queries can be awaited at once (for example with gather())
+    without blocking the event loop.  Cancelling an awaiting task drops its call
+    if it has not started yet, and cancels the statement on the server if it has.
+    """
+
+    def __init__(self, conn, max_workers=None):
+        """
+        Parameters
+        ----------
+        conn : Connection
+            The synchronous connection whose methods are run
+        max_workers : int
+            The number of calls that run at once.  Defaults to the connection's
+            pool_size, so that no worker waits for a pooled connection. (Default value = None)
+        """
+        try:
+            self.conn = conn
+            self.max_workers = max_workers if max_workers is not None else conn.pool_size
+            if self.max_workers < 1:
+                raise ValueError("max_workers must be at least 1")
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers,
+                                                thread_name_prefix='psrcelmerpy')
+
+        except Exception as e:
+            print(e.args[0])
+            raise
+
+    async def run(self, fn, *args, **kwargs):
+        """Run fn(*args, **kwargs) on a worker thread and return its result."""
+        deadline = timeouts.Deadline(self.conn.query_timeout, self.conn.latency_budget,
+                                     method=getattr(fn, '__name__', None))
+        future = self._executor.submit(self._call, deadline, functools.partial(fn, *args, **kwargs))
+        try:
+            return(await asyncio.wrap_future(future))
+        except asyncio.CancelledError:
+            deadline.cancel()
+            raise
+
+    @staticmethod
+    def _call(deadline, fn):
+        # the connection's methods run under deadline, so cancelling the task
+        # cancels the statement that is running for it
+        with contextlib.closing(deadline), timeouts.enforce(deadline):
+            return(fn())
+
+    async def gather(self, *aws, limit=None, return_exceptions=False):
+        """Await several calls on this connection; see the module-level gather().
+
+        limit defaults to max_workers, so queued calls stay cancellable.
+        """
+        return(await gather(*aws, limit=limit if limit is not None else self.max_workers,
+                            return_exceptions=return_exceptions))
+
+    async def get_query(self, sql, **kwargs):
+        """Awaitable Connection.get_query; keyword arguments are passed through."""
+        try:
+            return(await self.run(self.conn.get_query, sql, **kwargs))
+
+        except Exception as e:
+            print("An error happened in AsyncConnection.get_query(): {}".format(e.args[0]))
+            raise
+
+    async def get_table(self, schema, table_name, **kwargs):
+        """Awaitable Connection.get_table; keyword arguments other than chunksize are passed through."""
+        try:
+            if kwargs.get('chunksize') is not None:
+                raise ValueError("chunksize is not supported by the async API; use the connection's iter_query")
+            return(await self.run(self.conn.get_table, schema, table_name, **kwargs))
+
+        except Exception as e:
+            print("An error happened in AsyncConnection.get_table(): {}".format(e.args[0]))
+            raise
+
+    async def execute_sql(self, sql, params=None, **kwargs):
+        """Awaitable Connection.execute_sql; keyword arguments are passed through."""
+        try:
+            return(await self.run(self.conn.execute_sql, sql, params, **kwargs))
+
+        except Exception as e:
+            print("An error happened in AsyncConnection.execute_sql(): {}".format(e.args[0]))
+            raise
+
+    def close(self, wait=True):
+        """Shut down the worker threads.  The pooled engine is shared and stays open."""
+        self._executor.shutdown(wait=wait)
+
+    async def __aenter__(self):
+        return(self)
+
+    async def __aexit__(self, exc_type, exc, tb):
+        self.close(wait=False)
+
+
+class AsyncElmerConn(AsyncConnection):
+
+    def __init__(self, max_workers=None, **kwargs):
+        """
+        Establish an async connection to Elmer.
+
+        Parameters
+        ----------
+        max_workers : int
+            The number of queries that run at once (Default value = the pool_size)
+        **kwargs
+            Passed to ElmerConn (pool_size, max_overflow, pool_recycle, fetch_backend, engine, 
+            query_timeout, latency_budget, login_timeout)
+        """
+        super().__init__(ElmerConn(**kwargs), max_workers=max_workers)
+
+    async def list_recordsets(self, schema_name='', include_base_tables=False, include_stats=True):
+        """Awaitable ElmerConn.list_recordsets."""
+        try:
+            return(await self.run(self.conn.list_recordsets, schema_name, include_base_tables, include_stats))
+
+        except Exception as e:
+            print("An error happened in AsyncElmerConn.list_recordsets(): {}".format(e.args[0]))
+            raise
+
+
+class AsyncElmerGeoConn(AsyncConnection):
+
+    def __init__(self, max_workers=None, **kwargs):
+        """
+        Establish an async connection to ElmerGeo.
+
+        Parameters
+        ----------
+        max_workers : int
+            The number of queries that run at once (Default value = the pool_size)
+        **kwargs
+            Passed to ElmerGeoConn (pool_size, max_overflow, pool_recycle, fetch_backend, engine, 
+            query_timeout, latency_budget, login_timeout)
+        """
+        # imported here so that importing psrcelmerpy does not load the geo stack
+        from .elmergeo_conn import ElmerGeoConn
+        super().__init__(ElmerGeoConn(**kwargs), max_workers=max_workers)
+
+    async def read_geolayer(self, layer_name, **kwargs):
+        """Awaitable ElmerGeoConn.read_geolayer; keyword arguments are passed through."""
+        try:
+            return(await self.run(self.conn.read_geolayer, layer_name, **kwargs))
+
+        except Exception as e:
+            print("An error happened in AsyncElmerGeoConn.read_geolayer(): {}".format(e.args[0]))
+            raise
+
+    async def list_feature_classes(self, feature_dataset='', feature_class=''):
+        """Awaitable ElmerGeoConn.list_feature_classes."""
+        try:
+            return(await self.run(self.conn.list_feature_classes, feature_dataset, feature_class))
+
+        except Exception as e:
+            print("An error happened in AsyncElmerGeoConn.list_feature_classes(): {}".format(e.args[0]))
+            raise
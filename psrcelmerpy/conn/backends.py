@@ -0,0 +1,158 @@
+import datetime
+import decimal
+import numbers
+import re
+import pandas as pd
+
+class ArrowOdbcBackend:
+    """Fetch results as Arrow record batches with the arrow-odbc package.
+
+    arrow-odbc reads ODBC result sets column-wise straight into Arrow buffers,
+    without creating a Python object per value, so it is much faster than
+    pyodbc for large pulls.  It opens its own ODBC connection per query rather
+    than using the SQLAlchemy pool.
+    """
+
+    name = 'arrow-odbc'
+
+    def __init__(self):
+        import arrow_odbc
+        self._arrow_odbc = arrow_odbc
+
+    @staticmethod
+    def available():
+        try:
+            import arrow_odbc
+            return(True)
+        except ImportError:
+            return(False)
+
+    def read_batches(self, connection_string, sql, params=None, batch_size=65536):
+        """Return a reader that yields pyarrow.RecordBatch objects of up to batch_size rows.
+
+        Named parameters (":name") are passed to the driver positionally, as text.
+        """
+        sql, parameters = positional_params(sql, params)
+        reader = self._arrow_odbc.read_arrow_batches_from_odbc(query=sql,
+                                                                connection_string=connection_string,
+                                                                batch_size=batch_size,
+                                                                parameters=parameters)
+        return(reader)
+
+    def read_table(self, connection_string, sql, params=None, batch_size=65536):
+        """Return the whole result as a pyarrow.Table."""
+        import pyarrow as pa
+        reader = self.read_batches(connection_string, sql, params, batch_size)
+        return(pa.Table.from_batches(list(reader), schema=reader.schema))
+
+
+BACKENDS = {'arrow-odbc': ArrowOdbcBackend}
+
+
+def resolve_backend(name):
+    """Return the backend object for a backend name, or None for the default pyodbc path.
+
+    Parameters
+    ----------
+    name : str
+        'pyodbc', 'arrow-odbc', or 'auto' (arrow-odbc if it is installed, otherwise pyodbc)
+    """
+    if name in (None, 'pyodbc'):
+        return(None)
+    if name == 'auto':
+        return(ArrowOdbcBackend() if ArrowOdbcBackend.available() else None)
+    if name not in BACKENDS:
+        raise ValueError("fetch_backend must be one of 'pyodbc', 'auto', {}".format(
+            ', '.join("'{}'".format(backend) for backend in BACKENDS)))
+    return(BACKENDS[name]())
+
+
+_param_pattern = re.compile(r"('(?:[^']|'')*')|(?<![:\w]):(\w+)")
+
+
+def positional_params(sql, params):
+    """Rewrite ':name' placeholders as '?' and return the values, as text, in order.
+
+    arrow-odbc binds every parameter as text, so values whose text form SQL Server 
+    would not convert back unambiguously are wrapped in an explicit CONVERT: bytes 
+    (e.g. rowversion marks) as hex, datetimes and dates as ISO 8601 and decimals 
+    with their own scale.  Other types raise TypeError.
+    """
+    if not params:
+        return(sql, None)
+    values = []
+    def replace(match):
+        if match.group(1) is not None:
+            return(match.group(1))
+        text, placeholder = text_param(params[match.group(2)])
+        values.append(text)
+        return(placeholder)
+    return(_param_pattern.sub(replace, sql), values)
+
+
+def text_param(value):
+    """Return a bind value as text, and the SQL placeholder that converts it back to its type."""
+    if value is None:
+        return(None, '?')
+    if isinstance(value, str):
+        return(value, '?')
+    if isinstance(value, (bytes, bytearray)):
+        return(bytes(value).hex(), 'CONVERT(varbinary(max), ?, 2)')
+    if isinstance(value, pd.Timestamp):
+        value = value.to_pydatetime()
+    if isinstance(value, datetime.datetime):
+        if value.tzinfo is not None:
+            return(value.isoformat(), 'CONVERT(datetimeoffset, ?, 127)')
+        return(value.isoformat(), 'CONVERT(datetime2, ?, 126)')
+    if isinstance(value, datetime.date):
+        return(value.isoformat(), 'CONVERT(date, ?, 126)')
+    if isinstance(value, bool):
+        return('1' if value else '0', '?')
+    if isinstance(value, decimal.Decimal):
+        if not value.is_finite():
+            raise TypeError("cannot bind the decimal {} as a parameter".format(value))
+        digits, exponent = value.as_tuple()[1:]
+        scale = max(0, -exponent)
+        precision = max(len(digits) + max(0, exponent), scale, 1)
+        if precision > 38:
+            raise TypeError("the decimal {} has more than 38 digits".format(value))
+        return('{:f}'.format(value), 'CONVERT(decimal({}, {}), ?)'.format(precision, scale))
+    if isinstance(value, numbers.Integral):
+        return(str(int(value)), '?')
+    if isinstance(value, numbers.Real):
+        return(repr(float(value)), '?')
+    raise TypeError("cannot bind a value of type {} as a parameter with the arrow-odbc backend".format(
+        type(value).__name__))
+
+
+def frame_to_arrow(df):
+    """Convert a pandas dataframe to a pyarrow.Table."""
+    import pyarrow as pa
+    return(pa.Table.from_pandas(df, preserve_index=False))
+
+
+def arrow_to_frame(table, arrow_dtypes=False, decimal_as='float'):
+    """Convert a pyarrow.Table to a pandas dataframe.
+
+    Parameters
+    ----------
+    table : pyarrow.Table
+    arrow_dtypes : bool
+        If True, keep the Arrow memory and return Arrow-backed (pd.ArrowDtype) columns. (Default value = False)
+    decimal_as : str
+        'float' to cast decimal columns to float64, or 'decimal' to keep them. (Default value = 'float')
+    """
+    if decimal_as == 'float':
+        table = decimals_to_float(table)
+    if arrow_dtypes:
+        return(table.to_pandas(types_mapper=pd.ArrowDtype))
+    return(table.to_pandas())
+
+
+def decimals_to_float(table):
+    """Cast the decimal columns of a pyarrow.Table to float64."""
+    import pyarrow as pa
+    for i, field in enumerate(table.schema):
+        if pa.types.is_decimal(field.type):
+            table = table.set_column(i, field.name, table.column(i).cast(pa.float64()))
+    return(table)
@@ -0,0 +1,108 @@
+import threading
+import time
+
+class CatalogCache:
+    """A small in-memory cache of database catalog lookups with a time-to-live.
+
+    Entries older than ``ttl`` seconds are treated as missing, so schema changes
+    on the server are picked up eventually; ``invalidate`` drops entries at once.
+    """
+
+    def __init__(self, ttl=300):
+        self.ttl = ttl
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """Return the cached value for key, or None if it is missing or expired."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return(None)
+            stored_at, value = entry
+            if self.ttl is not None and time.monotonic() - stored_at > self.ttl:
+                del self._entries[key]
+                return(None)
+            return(value)
+
+    def set(self, key, value):
+        """Store value under key."""
+        with self._lock:
+            self._entries[key] = (time.monotonic(), value)
+
+    def invalidate(self, key=None):
+        """Drop the entry for key, or every entry if key is None."""
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(key, None)
+
+    def __len__(self):
+        with self._lock:
+            return(len(self._entries))
+
+
+def _fold(value):
+    return(None if value is None else str(value).lower())
+
+
+class CatalogIndex:
+    """A catalog listing (of feature classes, recordsets, ...) indexed for fast lookups.
+
+    Lookups on the indexed columns are case-insensitive exact matches served from
+    dictionaries, so finding a layer by name, dataset or geometry type does not
+    scan the listing or query the server.
+    """
+
+    def __init__(self, df, columns, search_column=None):
+        """
+        Parameters
+        ----------
+        df : a data frame
+            The listing, one row per catalog object
+        columns : list of str
+            The columns to index
+        search_column : str
+            The column that find(search=...) looks for substrings in (Default value = the first of columns)
+        """
+        self.df = df.reset_index(drop=True)
+        self.search_column = search_column if search_column is not None else columns[0]
+        self.loaded_at = time.time()
+        self._index = {}
+        for col_name in columns:
+            positions = {}
+            for i, value in enumerate(self.df[col_name]):
+                positions.setdefault(_fold(value), []).append(i)
+            self._index[col_name] = positions
+
+    def find(self, search=None, **criteria):
+        """Return the rows matching every criterion (column=value); None or '' values are ignored.
+
+        Parameters
+        ----------
+        search : str
+            If supplied, keep only rows whose search_column contains this text (any case). (Default value = None)
+        **criteria
+            Indexed column names and the values they must equal (any case)
+
+        Returns
+        -------
+        df : a data frame
+            A copy of the matching rows, in listing order
+        """
+        rows = None
+        for col_name, value in criteria.items():
+            if value is None or value == '':
+                continue
+            if col_name not in self._index:
+                raise ValueError("{} is not an indexed column".format(col_name))
+            matches = set(self._index[col_name].get(_fold(value), ()))
+            rows = matches if rows is None else rows & matches
+        df = self.df if rows is None else self.df.iloc[sorted(rows)]
+        if search:
+            df = df[df[self.search_column].str.contains(search, case=False, regex=False, na=False)]
+        return(df.reset_index(drop=True))
+
+    def __len__(self):
+        return(len(self.df))
@@ -1,14 +1,57 @@
 from . import auth
+from .engine_registry import registry, odbc_connection_string
+from .export import open_writer
+from .catalog import CatalogCache
+from .backends import resolve_backend, frame_to_arrow, arrow_to_frame, decimals_to_float
+from .instrumentation import Instrumentation
+from .materialize import build_frame, compact_text
+from .memo import QueryMemo
+from .parallel import process_map
+from . import sync
+from . import timeouts
+from .result_cache import ResultCache
+from concurrent.futures import ThreadPoolExecutor
+import contextlib
+import functools
+import os
 import sqlalchemy
+import threading
+import time
 import pandas as pd
-import urllib
+
+@functools.lru_cache(maxsize=512)
+def _text(sql):
+    # reusing the TextClause for a statement lets SQLAlchemy reuse its compiled 
+    # form, so repeated parameterized queries skip parsing on the client
+    return(sqlalchemy.text(sql))
+
 
 class Connection:
 
-    def __init__(self, database_name):
+    driver_name = 'ODBC Driver 17 for SQL Server'
+    pool_size = 5
+    max_overflow = 10
+    pool_recycle = 3600
+    result_cache = None
+    memo = None
+    decimal_as = 'float'
+    text_as = None
+    category_threshold = 0.5
+    catalog_ttl = 300
+    fetch_backend = 'pyodbc'
+    query_timeout = None
+    latency_budget = None
+    login_timeout = None
+    _deadlines_lock = threading.Lock()
+
+    def __init__(self, database_name, pool_size=None, max_overflow=None, pool_recycle=None, fetch_backend=None,
+                 engine=None, query_timeout=None, latency_budget=None, login_timeout=None):
         try:
             self.database_name = database_name
-            self._create_engine()
+            self._set_pool_options(pool_size, max_overflow, pool_recycle)
+            self._set_timeouts(query_timeout, latency_budget, login_timeout)
+            self._set_fetch_backend(fetch_backend)
+            self._create_engine(engine)
         
         except Exception as e:
             print(e.args[0])
@@ -34,45 +77,504 @@ class Connection:
             print(e.args[0])
             raise
 
-    def _create_engine(self):
+    def _set_pool_options(self, pool_size=None, max_overflow=None, pool_recycle=None):
+        try:
+            if pool_size is not None:
+                self.pool_size = pool_size
+            if max_overflow is not None:
+                self.max_overflow = max_overflow
+            if pool_recycle is not None:
+                self.pool_recycle = pool_recycle
+
+        except Exception as e:
+            print(e.args[0])
+            raise
+
+    def _set_timeouts(self, query_timeout=None, latency_budget=None, login_timeout=None):
         try:
-            self.driver_name = 'ODBC Driver 17 for SQL Server'
-            conn_string = "DRIVER={}; SERVER={}; DATABASE={}; trusted_connection=yes".format(
-                self.driver_name,
-                self.server_name,
-                self.database_name
-                )
-            params = urllib.parse.quote_plus(conn_string)
-            self.engine = sqlalchemy.create_engine("mssql+pyodbc:///?odbc_connect=%s" % params)
+            for name, value in (('query_timeout', query_timeout), ('latency_budget', latency_budget),
+                                ('login_timeout', login_timeout)):
+                if value is not None:
+                    if not value > 0:
+                        raise ValueError("{} must be a positive number of seconds".format(name))
+                    setattr(self, name, value)
 
         except Exception as e:
             print(e.args[0])
             raise
 
-    def get_query(self, sql):
+    def _set_fetch_backend(self, fetch_backend=None):
+        try:
+            if fetch_backend is not None:
+                self.fetch_backend = fetch_backend
+            self._backend = resolve_backend(self.fetch_backend)
+
+        except Exception as e:
+            print(e.args[0])
+            raise
+
+    @property
+    def backend(self):
+        """The fetch backend object in use, or None for the default pyodbc path."""
+        if not hasattr(self, '_backend'):
+            self._backend = resolve_backend(self.fetch_backend)
+        return(self._backend)
+
+    @property
+    def odbc_connection_string(self):
+        return(odbc_connection_string(self.server_name, self.database_name, self.driver_name))
+
+    @property
+    def engine(self):
+        # the engine belongs to the process that made it: after a fork or an unpickle 
+        # it is looked up (or, for an engine passed in, given an empty pool) again, so 
+        # pooled connections are never shared between processes
+        engine = getattr(self, '_engine', None)
+        if engine is not None and self._engine_pid != os.getpid():
+            if self._engine_injected:
+                engine.dispose(close=False)
+                self._engine_pid = os.getpid()
+            else:
+                engine = None
+        if engine is None:
+            self._create_engine()
+            engine = self._engine
+        return(engine)
+
+    @engine.setter
+    def engine(self, value):
+        self._engine = value
+        self._engine_pid = os.getpid()
+
+    def __getstate__(self):
+        # a connection pickles as its settings; the engine, caches and 
+        # instrumentation are per process and are rebuilt on the other side
+        if getattr(self, '_engine_injected', False):
+            raise TypeError("a connection built on an engine that was passed in cannot be pickled")
+        state = self.__dict__.copy()
+        for name in ('_engine', '_engine_pid', '_instrumentation', '_backend', '_catalog_cache', '_active_deadlines'):
+            state.pop(name, None)
+        if self.result_cache is not None:
+            state['result_cache'] = {'directory': self.result_cache.directory,
+                                     'max_bytes': self.result_cache.max_bytes,
+                                     'max_age': self.result_cache.max_age}
+        if self.memo is not None:
+            state['memo'] = {'ttl': self.memo.ttl, 'max_bytes': self.memo.max_bytes}
+        return(state)
+
+    def __setstate__(self, state):
+        state = dict(state)
+        result_cache = state.pop('result_cache', None)
+        memo = state.pop('memo', None)
+        self.__dict__.update(state)
+        if result_cache is not None:
+            self.enable_result_cache(**result_cache)
+        if memo is not None:
+            self.enable_memoization(**memo)
+
+    def _create_engine(self, engine=None):
+        # an engine passed in (e.g. a SQLite stand-in for tests and benchmarks) is 
+        # used as-is; otherwise the shared pooled engine for this database is
+        try:
+            self._engine_injected = engine is not None
+            if engine is None:
+                engine = registry.get_engine(self.server_name,
+                                             self.database_name,
+                                             self.driver_name,
+                                             pool_size=self.pool_size,
+                                             max_overflow=self.max_overflow,
+                                             pool_recycle=self.pool_recycle,
+                                             login_timeout=self.login_timeout)
+            # statements run through the engine can then be timed out and cancelled
+            timeouts.watch(engine)
+            self.engine = engine
+
+        except Exception as e:
+            print(e.args[0])
+            raise
+
+    def pool_stats(self):
+        """Return statistics for the connection pool shared by connections to this database.
+
+        Returns
+        -------
+        stats : dict
+            The pool configuration, the number of new logins ('connects'), checkouts 
+            and checkins, and 'reuse_rate', the share of checkouts that reused an open connection.
+            Empty for a connection built on an engine that was passed in.
+        """
+        try:
+            if getattr(self, '_engine_injected', False):
+                return({})
+            stats = registry.pool_stats(self.server_name, self.database_name, self.driver_name)
+            return(stats[0] if len(stats) > 0 else {})
+
+        except Exception as e:
+            print("An error happened in pool_stats(): {}".format(e.args[0]))
+            raise
+
+    @property
+    def catalog_cache(self):
+        if getattr(self, '_catalog_cache', None) is None:
+            self._catalog_cache = CatalogCache(ttl=self.catalog_ttl)
+        return(self._catalog_cache)
+
+    @property
+    def instrumentation(self):
+        if getattr(self, '_instrumentation', None) is None:
+            self._instrumentation = Instrumentation()
+        return(self._instrumentation)
+
+    def add_query_hook(self, hook):
+        """Register a callback that receives timings for every call made through this connection.
+
+        Parameters
+        ----------
+        hook : callable
+            Called with one dict per finished call, with keys 'method', 'sql', 'duration', 
+            'phases' (seconds spent in 'checkout', 'execute', 'fetch', 'frame_build', 
+            'geometry_decode', 'reproject', ...), 'rows', 'bytes' (approximate size of the 
+            result in memory, for the outermost call only; shallow unless 
+            instrumentation.measure_bytes is set to 'deep'), 'error', 'cancelled' (None, or 'timeout', 'latency_budget' or 
+            'cancelled' for a call whose statement was cancelled), 'started', 'id' and 'parent' 
+            (the id of the enclosing call).
+        """
+        try:
+            self.instrumentation.add_hook(hook)
+
+        except Exception as e:
+            print("An error happened in add_query_hook(): {}".format(e.args[0]))
+            raise
+
+    def remove_query_hook(self, hook):
+        """Unregister a callback added with add_query_hook."""
+        try:
+            self.instrumentation.remove_hook(hook)
+
+        except Exception as e:
+            print("An error happened in remove_query_hook(): {}".format(e.args[0]))
+            raise
+
+    def query_stats(self):
+        """Summarize the calls made through this connection.
+
+        Returns
+        -------
+        df : A pandas dataframe
+            One row per method with call, error and cancellation counts, total and maximum seconds, 
+            rows, bytes, and total seconds per phase.
+        """
+        try:
+            return(self.instrumentation.summary())
+
+        except Exception as e:
+            print("An error happened in query_stats(): {}".format(e.args[0]))
+            raise
+
+    @property
+    def _deadlines(self):
+        # deadline -> the number of threads running calls under it
+        if getattr(self, '_active_deadlines', None) is None:
+            self._active_deadlines = {}
+        return(self._active_deadlines)
+
+    @contextlib.contextmanager
+    def _scope(self, deadline):
+        # make deadline the thread's active one, so the statements run under it can
+        # be cancelled, and list it in active_queries() while it lasts
+        with self._deadlines_lock:
+            self._deadlines[deadline] = self._deadlines.get(deadline, 0) + 1
+        try:
+            with timeouts.enforce(deadline):
+                yield deadline
+        finally:
+            with self._deadlines_lock:
+                self._deadlines[deadline] -= 1
+                if self._deadlines[deadline] == 0:
+                    del self._deadlines[deadline]
+
+    @contextlib.contextmanager
+    def _limits(self, rec, timeout=None, latency_budget=None):
+        # the outermost call on a thread sets the limits; the calls it makes 
+        # (and its worker threads) share them unless they set their own, in 
+        # which case their deadline is cancelled along with the outer one
+        outer = timeouts.current()
+        if outer is not None and timeout is None and latency_budget is None:
+            with self._scope(outer):
+                yield outer
+            return
+        if timeout is None:
+            timeout = outer.timeout if outer is not None else self.query_timeout
+        if latency_budget is None and outer is None:
+            latency_budget = self.latency_budget
+        deadline = timeouts.Deadline(timeout, latency_budget, method=rec.method, sql=rec.sql, parent=outer)
+        with contextlib.closing(deadline), self._scope(deadline):
+            yield deadline
+
+    @contextlib.contextmanager
+    def limits(self, timeout=None, latency_budget=None):
+        """Apply a statement timeout and a latency budget to every call made in a with block.
+
+        A statement that runs past the timeout, or that is still running when the 
+        block has used up its latency budget, is cancelled and the call raises QueryTimeout.
+
+        Parameters
+        ----------
+        timeout : float
+            Seconds any one statement may run (Default value = the connection's query_timeout)
+        latency_budget : float
+            Seconds the whole block may spend waiting on the server (Default value = the connection's latency_budget)
+
+        Returns
+        -------
+        A context manager
+        """
+        deadline = timeouts.Deadline(timeout if timeout is not None else self.query_timeout,
+                                     latency_budget if latency_budget is not None else self.latency_budget,
+                                     parent=timeouts.current())
+        with contextlib.closing(deadline), self._scope(deadline):
+            yield deadline
+
+    def cancel(self):
+        """Cancel the statements running for calls on this connection, from another thread.
+
+        The cancelled calls raise QueryCancelled.
+
+        Returns
+        -------
+        int
+            The number of calls cancelled
+        """
+        try:
+            cancelled = 0
+            with self._deadlines_lock:
+                deadlines = list(self._deadlines)
+            for deadline in deadlines:
+                if deadline.cancel():
+                    cancelled += 1
+            return(cancelled)
+
+        except Exception as e:
+            print("An error happened in cancel(): {}".format(e.args[0]))
+            raise
+
+    def active_queries(self):
+        """List the calls on this connection that are running now.
+
+        Returns
+        -------
+        df : A pandas dataframe
+            One row per call, with its method, sql, start time, seconds elapsed, 
+            timeout and latency budget, and the number of statements in flight.
+        """
+        try:
+            with self._deadlines_lock:
+                deadlines = list(self._deadlines)
+            return(pd.DataFrame([deadline.as_dict() for deadline in deadlines],
+                                columns=['method', 'sql', 'started', 'elapsed', 'timeout', 'latency_budget',
+                                         'statements', 'cancelled']))
+
+        except Exception as e:
+            print("An error happened in active_queries(): {}".format(e.args[0]))
+            raise
+
+    def enable_result_cache(self, directory=None, max_bytes=2 * 1024 ** 3, max_age=900):
+        """Keep results of get_table (and read_geolayer) in a local Parquet cache.
+
+        A cached result is reused without contacting the server for max_age seconds.  
+        After that it is reused only if the object's modify_date and row count on the 
+        server (and those of the objects it depends on) are unchanged.
+
+        Parameters
+        ----------
+        directory : str
+            Where cache files are kept.  Defaults to $PSRCELMERPY_CACHE_DIR or ~/.cache/psrcelmerpy. (Default value = None)
+        max_bytes : int
+            The disk budget; least recently used results are evicted beyond it. (Default value = 2 GB)
+        max_age : int
+            Seconds a validated result is trusted without checking the server. (Default value = 900)
+
+        Returns
+        -------
+        cache : ResultCache
+        """
+        try:
+            self.result_cache = ResultCache(directory=directory, max_bytes=max_bytes, max_age=max_age)
+            return(self.result_cache)
+
+        except Exception as e:
+            print("An error happened in enable_result_cache(): {}".format(e.args[0]))
+            raise
+
+    def disable_result_cache(self):
+        """Stop using the local result cache.  Files already cached are left on disk."""
+        self.result_cache = None
+
+    def enable_memoization(self, ttl=300, max_bytes=256 * 1024 ** 2):
+        """Keep get_query results in memory, so repeating a query does not go back to the server.
+
+        Results are keyed by the query's normalized SQL and parameters.  execute_sql and 
+        stage_table drop the results that read the tables they modify, and execute_sql 
+        drops them all for a statement whose tables it cannot tell (e.g. EXEC).
+
+        Parameters
+        ----------
+        ttl : int
+            Seconds a result is kept.  get_query's memo_ttl overrides it per query. (Default value = 300)
+        max_bytes : int
+            The memory the cached results may use; the least recently used are evicted beyond it. (Default value = 256 MB)
+
+        Returns
+        -------
+        memo : QueryMemo
+            Its stats() shows hits and misses
+        """
+        try:
+            self.memo = QueryMemo(ttl=ttl, max_bytes=max_bytes)
+            return(self.memo)
+
+        except Exception as e:
+            print("An error happened in enable_memoization(): {}".format(e.args[0]))
+            raise
+
+    def disable_memoization(self):
+        """Stop memoizing query results and release the ones held."""
+        self.memo = None
+
+    def invalidate_memo(self, table_name=None, schema=None):
+        """Drop memoized results that read table_name (in schema, if given), or all of them if table_name is None."""
+        try:
+            if self.memo is None:
+                return
+            if table_name is None:
+                self.memo.invalidate()
+            else:
+                self.memo.invalidate_table(table_name, schema)
+
+        except Exception as e:
+            print("An error happened in invalidate_memo(): {}".format(e.args[0]))
+            raise
+
+    def process_map(self, fn, items, max_workers=None, kwargs=None, mp_context=None):
+        """Map a function over a list of queries, tables or layers in a pool of worker processes.
+
+        Each worker gets its own copy of this connection, with its own engine.
+
+        Parameters
+        ----------
+        fn : callable or str
+            A top-level function called as fn(conn, item, **kwargs), or the name of a 
+            connection method called as conn.<fn>(item, **kwargs), e.g. 'get_query'
+        items : iterable
+            What to map over
+        max_workers : int
+            The number of worker processes (Default value = the number of CPUs)
+        kwargs : dict
+            Keyword arguments passed to every call (Default value = None)
+        mp_context : multiprocessing context
+            How workers are started (Default value = the platform default)
+
+        Returns
+        -------
+        results : list
+            The results in the order of items
+        """
+        try:
+            return(process_map(self, fn, items, max_workers=max_workers, kwargs=kwargs, mp_context=mp_context))
+
+        except Exception as e:
+            print("An error happened in process_map(): {}".format(e.args[0]))
+            raise
+
+    def _build_signature_sql(self, schema, object_name):
+        try:
+            target = ("SELECT o.object_id FROM sys.objects o",
+                      "JOIN sys.schemas s ON s.schema_id = o.schema_id",
+                      "WHERE s.name = :schema AND o.name = :object_name")
+            target = ' '.join(target)
+            signature_sql = ("WITH objs AS (",
+                             target,
+                             "UNION SELECT d.referenced_id FROM sys.sql_expression_dependencies d",
+                             "WHERE d.referencing_id IN ({}) AND d.referenced_id IS NOT NULL".format(target),
+                             ")",
+                             "SELECT CONVERT(varchar(30), MAX(o.modify_date), 126) AS modify_date,",
+                             "(SELECT SUM(p.rows) FROM sys.partitions p",
+                             " WHERE p.object_id IN (SELECT object_id FROM objs) AND p.index_id IN (0, 1)) AS row_count,",
+                             "COUNT(*) AS object_count",
+                             "FROM sys.objects o WHERE o.object_id IN (SELECT object_id FROM objs)")
+            signature_sql = ' '.join(signature_sql)
+            return(signature_sql)
+
+        except Exception as e:
+            print("An error happened in _build_signature_sql(): {}".format(e.args[0]))
+            raise
+
+    def _object_signature(self, schema, object_name):
+        try:
+            df = self.get_query(self._build_signature_sql(schema, object_name),
+                                params={'schema': schema, 'object_name': object_name}, use_memo=False)
+            if len(df) == 0 or df['object_count'][0] == 0:
+                return(None)
+            row = df.iloc[0]
+            signature = "{}|{}|{}".format(row['modify_date'], row['row_count'], row['object_count'])
+            return(signature)
+
+        except Exception as e:
+            print("An error happened in _object_signature(): {}".format(e.args[0]))
+            raise
+
+    def get_query(self, sql, params=None, text_as=None, decimal_as=None, return_type='pandas',
+                  use_memo=True, memo_ttl=None, timeout=None, latency_budget=None):
         """Return a recordset defined by a SELECT query against a named database.
 
+        Columns are built with dtypes taken from the cursor description: integers as 
+        int64 (nullable Int64 if they contain NULLs), decimals as float64 (or Decimal 
+        objects), datetimes as datetime64.
+
         Parameters
         ----------
         sql : str
             The query in SQL format that defines the recordset.
+        params : dict
+            Values for named placeholders (":name") in sql, sent as bind parameters. (Default value = None)
+        text_as : str
+            None for pandas' default text dtype, 'category' to make low-cardinality text columns 
+            categorical, 'pyarrow' for string[pyarrow], or 'auto' for both; 'object' keeps pandas' 
+            default even when the connection's text_as is set.  (Default value = the connection's text_as)
+        decimal_as : str
+            'float' or 'decimal'. (Default value = the connection's decimal_as)
+        return_type : str
+            'pandas' for a pandas dataframe, 'arrow' for a pyarrow.Table, or 'pandas-arrow' 
+            for a dataframe with Arrow-backed columns. (Default value = 'pandas')
+        use_memo : bool
+            If memoization is enabled (see enable_memoization), reuse a result held in memory. (Default value = True)
+        memo_ttl : int
+            Seconds to keep this result in memory. (Default value = the memo's ttl)
+        timeout : float
+            Seconds the statement may run before it is cancelled and QueryTimeout is raised. 
+            (Default value = the connection's query_timeout)
+        latency_budget : float
+            Seconds the whole call may take before its statement is cancelled and QueryTimeout 
+            is raised. (Default value = the connection's latency_budget)
 
         Returns
         -------
-        df : A pandas dataframe
+        df : A pandas dataframe (or pyarrow.Table)
         """
 
         try:
-            engine = self.engine
-            with engine.begin() as connection:
-                query = sqlalchemy.text(sql)
-                result = connection.execute(query)
-                df = pd.DataFrame(result.fetchall())
-                if len(df) > 0:
-                    df.columns = result.keys()
-                #colnames = list(df)
-                #print(f"df colnames for {sql}: {colnames}")
-                # df = pd.read_sql(sql=sql, con=engine)
+            with self.instrumentation.record('get_query', sql) as rec, self._limits(rec, timeout, latency_budget):
+                memo = self.memo if use_memo else None
+                if memo is not None:
+                    options = self._frame_options(text_as, decimal_as)
+                    key = memo.make_key(sql, params, return_type, options['text_as'], options['decimal_as'])
+                    with rec.phase('memo'):
+                        found, df = memo.get(key)
+                if memo is None or not found:
+                    df = self._fetch_result(sql, params, return_type=return_type, text_as=text_as, decimal_as=decimal_as)
+                    if memo is not None:
+                        memo.set(key, df, sql, ttl=memo_ttl)
+                rec.set_result(df)
             return(df)
         
         except Exception as e:
@@ -81,12 +583,84 @@ class Connection:
             raise
 
 
-    def execute_sql(self, sql):
+    def _frame_options(self, text_as=None, decimal_as=None):
+        text_as = text_as if text_as is not None else self.text_as
+        return({'text_as': None if text_as == 'object' else text_as,
+                'decimal_as': decimal_as if decimal_as is not None else self.decimal_as,
+                'category_threshold': self.category_threshold})
+
+
+    def _fetch_result(self, sql, params=None, return_type='pandas', text_as=None, decimal_as=None):
+        if return_type == 'pandas':
+            return(self._fetch_frame(sql, params, text_as=text_as, decimal_as=decimal_as))
+        if return_type not in ('arrow', 'pandas-arrow'):
+            raise ValueError("return_type must be 'pandas', 'arrow' or 'pandas-arrow'")
+        table = self._fetch_arrow(sql, params, decimal_as=decimal_as)
+        if return_type == 'arrow':
+            return(table)
+        with self.instrumentation.phase('frame_build'):
+            df = arrow_to_frame(table, arrow_dtypes=True, decimal_as='decimal')
+        return(df)
+
+
+    def _fetch_arrow(self, sql, params=None, decimal_as=None):
+        instrumentation = self.instrumentation
+        if self.backend is None:
+            df = self._fetch_frame(sql, params, decimal_as=decimal_as)
+            with instrumentation.phase('frame_build'):
+                return(frame_to_arrow(df))
+        with instrumentation.phase('execute'):
+            reader = self.backend.read_batches(self.odbc_connection_string, sql, params)
+        with instrumentation.phase('fetch'):
+            batches = list(reader)
+        import pyarrow as pa
+        table = pa.Table.from_batches(batches, schema=reader.schema)
+        if self._frame_options(decimal_as=decimal_as)['decimal_as'] == 'float':
+            table = decimals_to_float(table)
+        return(table)
+
+
+    def _fetch_frame(self, sql, params=None, text_as=None, decimal_as=None):
+        engine = self.engine
+        instrumentation = self.instrumentation
+        if self.backend is not None:
+            options = self._frame_options(text_as, decimal_as)
+            table = self._fetch_arrow(sql, params, decimal_as=decimal_as)
+            with instrumentation.phase('frame_build'):
+                df = arrow_to_frame(table, decimal_as=options['decimal_as'])
+                df = compact_text(df, options['text_as'], options['category_threshold'])
+            return(df)
+        with instrumentation.phase('checkout'):
+            connection = engine.connect()
+        with connection, connection.begin():
+            query = _text(sql)
+            with instrumentation.phase('execute'):
+                result = connection.execute(query, params or {})
+            description = result.cursor.description
+            columns = list(result.keys())
+            with instrumentation.phase('fetch'):
+                rows = result.fetchall()
+        # the connection goes back to the pool before the frame is built
+        with instrumentation.phase('frame_build'):
+            df = build_frame(rows, description, columns, **self._frame_options(text_as, decimal_as))
+            #colnames = list(df)
+            #print(f"df colnames for {sql}: {colnames}")
+            # df = pd.read_sql(sql=sql, con=engine)
+        return(df)
+
+
+    def execute_sql(self, sql, params=None, timeout=None, latency_budget=None):
         """
 
         Parameters
         ----------
         sql : a SQL query
+        params : dict or list of dict
+            Values for named placeholders (":name") in sql, sent as bind parameters.  A list 
+            of dicts runs the statement once per dict, as one batch (executemany). (Default value = None)
+        timeout, latency_budget : float
+            Seconds before the statement is cancelled and QueryTimeout is raised; see get_query. 
+            (Default value = the connection's query_timeout and latency_budget)
 
         Returns
         -------
@@ -95,15 +669,149 @@ class Connection:
         """
         try:
             engine = self.engine
-            engine.execute(sql)
-            engine.dispose()
+            with self.instrumentation.record('execute_sql', sql) as rec, self._limits(rec, timeout, latency_budget):
+                with rec.phase('checkout'):
+                    connection = engine.connect()
+                with connection, connection.begin():
+                    with rec.phase('execute'):
+                        if isinstance(params, (list, tuple)):
+                            if len(params) > 0:
+                                connection.execute(_text(sql), list(params))
+                        else:
+                            connection.execute(_text(sql), params or {})
+            if self.memo is not None:
+                self.memo.invalidate_tables(sql)
 
         except Exception as e:
             print("An error happened in connection.execute_sql(): {}".format(e.args[0]))
             raise
 
 
-    def get_table(self, schema, table_name):
+    def iter_query(self, sql, chunksize=10000, text_as=None, decimal_as=None, return_type='pandas', params=None):
+        """Return the recordset defined by a SELECT query as a stream of data frames.
+
+        Rows are fetched from the pyodbc cursor ``chunksize`` at a time with fetchmany, as 
+        the driver receives them, so peak memory depends on the chunk size rather than on 
+        the size of the recordset.  (SQL Server still runs the query as a normal result set; 
+        the mssql+pyodbc dialect has no server-side cursors.)
+
+        Parameters
+        ----------
+        sql : str
+            The query in SQL format that defines the recordset.
+        chunksize : int
+            The maximum number of rows in each data frame (Default value = 10000)
+        text_as, decimal_as : str
+            How text and decimal columns are materialized; see get_query. (Default value = None)
+        return_type : str
+            'pandas', 'arrow' (pyarrow.Table chunks) or 'pandas-arrow'; see get_query. (Default value = 'pandas')
+        params : dict
+            Values for named placeholders (":name") in sql. (Default value = None)
+
+        Returns
+        -------
+        generator
+            Yields pandas dataframes of at most ``chunksize`` rows.  A query that returns no 
+            rows yields one empty data frame, with the result's columns.
+        """
+        try:
+            if isinstance(chunksize, bool) or not isinstance(chunksize, int) or chunksize < 1:
+                raise ValueError("chunksize must be a positive integer")
+            if return_type not in ('pandas', 'arrow', 'pandas-arrow'):
+                raise ValueError("return_type must be 'pandas', 'arrow' or 'pandas-arrow'")
+            return(self._iter_chunks(sql, chunksize, self._frame_options(text_as, decimal_as), return_type, params))
+
+        except Exception as e:
+            print("An error happened in iter_query(): {}".format(e.args[0]))
+            raise
+
+
+    def _iter_chunks(self, sql, chunksize, frame_options, return_type='pandas', params=None):
+        # the record is not made the thread's active one, because the caller's 
+        # code runs between chunks
+        rec = self.instrumentation.start('iter_query', sql)
+        rec.rows, rec.bytes = 0, 0
+        try:
+            for chunk in self._iter_raw_chunks(sql, chunksize, frame_options, rec, params):
+                with rec.phase('frame_build'):
+                    chunk = self._convert_chunk(chunk, frame_options, return_type)
+                rec.add_result(chunk)
+                yield chunk
+
+        except Exception as e:
+            rec.error = "{}: {}".format(type(e).__name__, e)
+            print(f"An error happened in iter_query(): {e.args[0]}")
+            print(f"The query passed in was: {sql}")
+            raise
+
+        finally:
+            self.instrumentation.finish(rec)
+
+
+    def _iter_raw_chunks(self, sql, chunksize, frame_options, rec, params=None):
+        """Yield pandas dataframes (pyodbc) or pyarrow.RecordBatch objects (Arrow backends)."""
+        if self.backend is not None:
+            with rec.phase('execute'):
+                reader = self.backend.read_batches(self.odbc_connection_string, sql, params, batch_size=chunksize)
+            batches = iter(reader)
+            empty = True
+            while True:
+                with rec.phase('fetch'):
+                    batch = next(batches, None)
+                if batch is None:
+                    break
+                empty = False
+                yield batch
+            if empty:
+                import pyarrow as pa
+                yield pa.RecordBatch.from_pylist([], schema=reader.schema)
+            return
+        engine = self.engine
+        with rec.phase('checkout'):
+            connection = engine.connect()
+        with connection:
+            query = _text(sql)
+            with rec.phase('execute'):
+                # mssql+pyodbc has no server-side cursor for stream_results to open; memory 
+                # stays bounded because rows are only pulled from the pyodbc cursor by fetchmany below
+                result = connection.execution_options(stream_results=True).execute(query, params or {})
+            description = result.cursor.description
+            columns = list(result.keys())
+            empty = True
+            while True:
+                with rec.phase('fetch'):
+                    rows = result.fetchmany(chunksize)
+                if not rows and not empty:
+                    break
+                with rec.phase('frame_build'):
+                    df = build_frame(rows, description, columns, **frame_options)
+                yield df
+                if not rows:
+                    break
+                empty = False
+
+
+    def _convert_chunk(self, chunk, frame_options, return_type):
+        if isinstance(chunk, pd.DataFrame):
+            if return_type == 'pandas':
+                return(chunk)
+            table = frame_to_arrow(chunk)
+        else:
+            import pyarrow as pa
+            table = pa.Table.from_batches([chunk])
+            if return_type == 'pandas':
+                df = arrow_to_frame(table, decimal_as=frame_options['decimal_as'])
+                return(compact_text(df, frame_options['text_as'], frame_options['category_threshold']))
+            if frame_options['decimal_as'] == 'float':
+                table = decimals_to_float(table)
+        if return_type == 'arrow':
+            return(table)
+        return(arrow_to_frame(table, arrow_dtypes=True, decimal_as='decimal'))
+
+
+    def get_table(self, schema, table_name, chunksize=None, use_cache=True,
+                  parallelism=1, partition_column=None, partitions=None, partition_method='ntile',
+                  text_as=None, decimal_as=None, return_type='pandas', timeout=None, latency_budget=None):
         """
         Return a table or view from a database.
         
@@ -114,23 +822,420 @@ class Connection:
 
         table_name : str
             The name of the table or view that you wish to retrieve
+
+        chunksize : int
+            If supplied, stream the table from the server in data frames of at 
+            most this many rows instead of returning it all at once. (Default value = None)
+
+        use_cache : bool
+            If the result cache is enabled (see enable_result_cache), serve the table 
+            from it when it is still fresh. (Default value = True)
+
+        parallelism : int
+            If greater than 1, split the table into key ranges and fetch them at the same 
+            time on this many pooled connections. (Default value = 1)
+
+        partition_column : str
+            The numeric or date column to split the table on.  If None, the first column 
+            of the primary key is used; views have none, so it is required for them. (Default value = None)
+
+        partitions : int
+            The number of key ranges to split the table into. (Default value = parallelism)
+
+        partition_method : str
+            'ntile' to take range boundaries from NTILE statistics (evenly sized partitions, 
+            handles skew), or 'minmax' to split the min/max range evenly. (Default value = 'ntile')
+
+        text_as, decimal_as : str
+            How text and decimal columns are materialized; see get_query. (Default value = None)
+
+        return_type : str
+            'pandas', 'arrow' (a pyarrow.Table) or 'pandas-arrow' (Arrow-backed columns). (Default value = 'pandas')
+
+        timeout, latency_budget : float
+            Seconds before the read is cancelled and QueryTimeout is raised; see get_query.  They 
+            do not apply to a chunked read. (Default value = the connection's query_timeout and latency_budget)
             
         Returns
         -------
         df
-            A data frame representation of the table/view db_name.schema.table_name 
+            A data frame representation of the table/view db_name.schema.table_name,
+            or a generator of data frames if ``chunksize`` is supplied
         """
         try:
-            engine = self.engine
             sql = "select * from {}.{}".format(schema, table_name)
-            query = sqlalchemy.text(sql)
-            with engine.begin() as connection:
-                result = connection.execute(query)
-                df = pd.DataFrame(result.fetchall())
-                if len(df) > 0:
-                    df.columns = result.keys()
+            if chunksize is not None:
+                return(self.iter_query(sql, chunksize=chunksize, text_as=text_as, decimal_as=decimal_as,
+                                       return_type=return_type))
+            with self.instrumentation.record('get_table', sql) as rec, self._limits(rec, timeout, latency_budget):
+                if return_type != 'pandas' and parallelism <= 1 and (partitions is None or partitions <= 1):
+                    df = self._fetch_result(sql, return_type=return_type, text_as=text_as, decimal_as=decimal_as)
+                elif use_cache and self.result_cache is not None:
+                    # frames built with other text or decimal dtypes are cached under other keys
+                    options = self._frame_options(text_as, decimal_as)
+                    key = self.result_cache.make_key(self.server_name, self.database_name, 'table', schema, table_name,
+                                                     return_type, options['text_as'], options['decimal_as'])
+                    df = self.result_cache.fetch(key,
+                                                 lambda: self.get_table(schema, table_name, use_cache=False,
+                                                                        parallelism=parallelism,
+                                                                        partition_column=partition_column,
+                                                                        partitions=partitions,
+                                                                        partition_method=partition_method,
+                                                                        text_as=text_as,
+                                                                        decimal_as=decimal_as),
+                                                 lambda: self._object_signature(schema, table_name))
+                elif parallelism > 1 or (partitions is not None and partitions > 1):
+                    df = self._get_table_partitioned(schema, table_name, parallelism, partition_column,
+                                                     partitions or parallelism, partition_method,
+                                                     text_as=text_as, decimal_as=decimal_as)
+                else:
+                    df = self._fetch_frame(sql, text_as=text_as, decimal_as=decimal_as)
+                if return_type != 'pandas' and isinstance(df, pd.DataFrame):
+                    df = self._convert_chunk(df, self._frame_options(text_as, decimal_as), return_type)
+                rec.set_result(df)
             return(df)
         
         except Exception as e:
             print("An error happened in get_table(): {}".format(e.args[0]))
-            raise
\ No newline at end of file
+            raise
+
+
+    def export_table(self, schema, table_name, path, format='parquet', compression='default', chunksize=50000,
+                     text_as=None, decimal_as=None):
+        """Write a table or view straight to a Parquet or CSV file, without holding it all in memory.
+
+        Rows are streamed from the server ``chunksize`` at a time and each chunk is written 
+        (as a Parquet row group, or appended to the CSV) before the next is read.
+
+        Parameters
+        ----------
+        schema : str
+            The schema that the table or view lives in.
+        table_name : str
+            The name of the table or view to export
+        path : str
+            The file to write.  It is replaced only once the export has finished.
+        format : str
+            'parquet' or 'csv' (Default value = 'parquet')
+        compression : str
+            For Parquet, a codec such as 'snappy', 'zstd', 'gzip' or None; for CSV, None, 'gzip', 
+            'bz2' or 'xz'. (Default value = 'snappy' for Parquet, None for CSV)
+        chunksize : int
+            The number of rows read and written at a time (Default value = 50000)
+        text_as, decimal_as : str
+            How text and decimal columns are materialized; see get_query. (Default value = None)
+
+        Returns
+        -------
+        stats : dict
+            'rows', 'batches', 'bytes' (the size of the file) and 'seconds'
+        """
+        try:
+            sql = "select * from {}.{}".format(schema, table_name)
+            return(self._export_chunks('export_table', sql, self.iter_query(sql, chunksize=chunksize, text_as=text_as,
+                                                                           decimal_as=decimal_as,
+                                                                           return_type='arrow' if format == 'parquet' 
+                                                                           else 'pandas'),
+                                       path, format, compression))
+
+        except Exception as e:
+            print("An error happened in export_table(): {}".format(e.args[0]))
+            raise
+
+
+    def _export_chunks(self, method, sql, chunks, path, format, compression, metadata=None):
+        start = time.perf_counter()
+        with self.instrumentation.record(method, sql) as rec:
+            writer = open_writer(path, format=format, compression=compression, metadata=metadata)
+            try:
+                for chunk in chunks:
+                    with rec.phase('write'):
+                        writer.write(chunk)
+                nbytes = writer.close()
+            except BaseException:
+                writer.abort()
+                raise
+            rec.rows, rec.bytes = writer.rows, nbytes
+        stats = {'rows': writer.rows,
+                 'batches': writer.batches,
+                 'bytes': nbytes,
+                 'seconds': time.perf_counter() - start}
+        return(stats)
+
+
+    def sync_table(self, schema, table_name, path, mark_column, key_columns=None, full_refresh=False,
+                   chunksize=50000):
+        """Keep a local Parquet replica of a table up to date by fetching only new and changed rows.
+
+        The first sync (and any sync after the table's columns change) copies the whole table.  
+        Later syncs fetch the rows whose mark_column is past the highest value already copied, and 
+        append them to the replica, or, if key_columns are given, replace the replica's rows with 
+        the same keys.  The sync state is kept next to the replica, in {path}.sync.json.
+
+        Rows deleted on the server, and rows whose mark_column is NULL when they are added after 
+        the first sync, are not picked up; use full_refresh=True to start over.  A rowversion mark 
+        stops short of MIN_ACTIVE_ROWVERSION(), so rows of transactions still open during a sync 
+        are picked up by a later one.
+
+        Parameters
+        ----------
+        schema : str
+            The schema that the table or view lives in.
+        table_name : str
+            The name of the table or view
+        path : str
+            The Parquet file that holds the replica
+        mark_column : str
+            A column that grows with every insert (or update): a rowversion, an identity 
+            column or a modified timestamp
+        key_columns : list
+            The columns that identify a row, to update changed rows instead of appending them. (Default value = None)
+        full_refresh : bool
+            Copy the whole table regardless of the saved state. (Default value = False)
+        chunksize : int
+            The number of rows streamed at a time during a full copy. (Default value = 50000)
+
+        Returns
+        -------
+        stats : dict
+            'mode' ('full' or 'incremental'), 'rows_fetched', 'rows' (in the replica), 'mark' 
+            (the high-water mark now stored) and 'seconds'
+        """
+        try:
+            start = time.perf_counter()
+            key_columns = list(key_columns) if key_columns else []
+            with self.instrumentation.record('sync_table', "{}.{}".format(schema, table_name)) as rec:
+                columns = self._table_columns(schema, table_name)
+                if len(columns) == 0:
+                    raise ValueError("{}.{} was not found".format(schema, table_name))
+                column_names = [col[0].lower() for col in columns]
+                for col_name in [mark_column] + key_columns:
+                    if col_name.lower() not in column_names:
+                        raise ValueError("{}.{} has no column {}".format(schema, table_name, col_name))
+                state = None if full_refresh else sync.read_state(path)
+                if state is not None and (state.get('columns') != columns
+                                          or state.get('mark_column') != mark_column
+                                          or state.get('key_columns') != key_columns
+                                          or not os.path.exists(path)):
+                    state = None
+                mark_type = dict((col[0].lower(), col[1]) for col in columns)[mark_column.lower()]
+                high_mark = self._max_value(schema, table_name, mark_column,
+                                            rowversion=mark_type.lower() in ('timestamp', 'rowversion'))
+                if state is None:
+                    mode = 'full'
+                    sql = "select * from {}.{}".format(schema, table_name)
+                    params = None
+                    if high_mark is not None:
+                        sql += " where {0} <= :high_mark or {0} is null".format(self._quote_name(mark_column))
+                        params = {'high_mark': high_mark}
+                    chunks = self.iter_query(sql, chunksize=chunksize, return_type='arrow', params=params)
+                    export_stats = self._export_chunks('export_table', sql, chunks, path, 'parquet', 'default')
+                    rows_fetched = rows = export_stats['rows']
+                else:
+                    mode = 'incremental'
+                    rows_fetched = 0
+                    rows = state['rows']
+                    if high_mark is None:
+                        high_mark = state['mark']
+                    elif state['mark'] is None or high_mark != state['mark']:
+                        rows_fetched, merged_rows = self._sync_delta(schema, table_name, path, mark_column,
+                                                                     key_columns, state['mark'], high_mark)
+                        rows = merged_rows if merged_rows is not None else rows
+                sync.write_state(path, {'schema': schema,
+                                        'table_name': table_name,
+                                        'mark_column': mark_column,
+                                        'key_columns': key_columns,
+                                        'columns': columns,
+                                        'mark': high_mark,
+                                        'rows': rows,
+                                        'synced_at': time.time()})
+                rec.rows = rows_fetched
+            stats = {'mode': mode,
+                     'rows_fetched': rows_fetched,
+                     'rows': rows,
+                     'mark': high_mark,
+                     'seconds': time.perf_counter() - start}
+            return(stats)
+
+        except Exception as e:
+            print("An error happened in sync_table(): {}".format(e.args[0]))
+            raise
+
+
+    def _sync_delta(self, schema, table_name, path, mark_column, key_columns, low_mark, high_mark):
+        mark_column = self._quote_name(mark_column)
+        sql = "select * from {}.{} where {} <= :high_mark".format(schema, table_name, mark_column)
+        params = {'high_mark': high_mark}
+        if low_mark is not None:
+            sql += " and {} > :low_mark".format(mark_column)
+            params['low_mark'] = low_mark
+        delta = self.get_query(sql, params=params, use_memo=False)
+        if len(delta) == 0:
+            return(0, None)
+        with self.instrumentation.phase('merge'):
+            replica = pd.read_parquet(path)
+            if key_columns and len(replica) > 0:
+                changed = pd.MultiIndex.from_frame(delta[key_columns])
+                replica = replica[~pd.MultiIndex.from_frame(replica[key_columns]).isin(changed)]
+            # an empty replica (from the full copy of an empty table) has no column types to keep
+            merged = pd.concat([replica, delta], ignore_index=True) if len(replica) > 0 else delta
+        with self.instrumentation.phase('write'):
+            tmp_path = "{}.{}.tmp".format(path, os.getpid())
+            try:
+                merged.to_parquet(tmp_path, index=False)
+                os.replace(tmp_path, path)
+            finally:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+        return(len(delta), len(merged))
+
+
+    def _table_columns(self, schema, table_name):
+        columns_sql = ("SELECT COLUMN_NAME, DATA_TYPE FROM INFORMATION_SCHEMA.COLUMNS",
+                       "WHERE TABLE_SCHEMA = :schema AND TABLE_NAME = :table_name",
+                       "ORDER BY ORDINAL_POSITION")
+        df = self.get_query(' '.join(columns_sql), params={'schema': schema, 'table_name': table_name},
+                            use_memo=False)
+        return([[row.COLUMN_NAME, row.DATA_TYPE] for row in df.itertuples(index=False)])
+
+
+    def _max_value(self, schema, table_name, column, rowversion=False):
+        sql = "select max({}) as max_value from {}.{}".format(self._quote_name(column), schema, table_name)
+        if rowversion:
+            # rows of transactions that are still open commit later with lower rowversions 
+            # than max(), so the mark stays below the lowest active one
+            sql = ("select max({}) as max_value,".format(self._quote_name(column)),
+                   "convert(binary(8), convert(bigint, MIN_ACTIVE_ROWVERSION()) - 1) as active_limit",
+                   "from {}.{}".format(schema, table_name))
+            sql = ' '.join(sql)
+        df = self.get_query(sql, use_memo=False)
+        value = df['max_value'][0] if len(df) > 0 else None
+        if value is None or (not isinstance(value, (bytes, bytearray)) and pd.isna(value)):
+            return(None)
+        if rowversion:
+            value = min(bytes(value), bytes(df['active_limit'][0]))
+        return(self._python_value(value))
+
+
+    def _find_partition_column(self, schema, table_name):
+        try:
+            pk_sql = ("SELECT k.COLUMN_NAME",
+                      "FROM INFORMATION_SCHEMA.TABLE_CONSTRAINTS tc",
+                      "JOIN INFORMATION_SCHEMA.KEY_COLUMN_USAGE k",
+                      "   ON k.CONSTRAINT_NAME = tc.CONSTRAINT_NAME AND k.TABLE_SCHEMA = tc.TABLE_SCHEMA",
+                      "WHERE tc.CONSTRAINT_TYPE = 'PRIMARY KEY'",
+                      "   AND tc.TABLE_SCHEMA = :schema",
+                      "   AND tc.TABLE_NAME = :table_name",
+                      "ORDER BY k.ORDINAL_POSITION")
+            pk_df = self.get_query(' '.join(pk_sql), params={'schema': schema, 'table_name': table_name})
+            if len(pk_df) == 0:
+                raise ValueError("{}.{} has no primary key; supply partition_column".format(schema, table_name))
+            return(pk_df['COLUMN_NAME'][0])
+
+        except Exception as e:
+            print("An error happened in _find_partition_column(): {}".format(e.args[0]))
+            raise
+
+
+    def _partition_bounds(self, schema, table_name, partition_column, partitions, partition_method):
+        """Return the sorted lower bounds of each key range, and whether the column has NULLs."""
+        try:
+            partition_column = self._quote_name(partition_column)
+            if partition_method == 'ntile':
+                bounds_sql = ("SELECT MIN({col}) AS lower_bound,",
+                              "MAX(CASE WHEN {col} IS NULL THEN 1 ELSE 0 END) AS has_nulls",
+                              "FROM (SELECT {col}, NTILE({n}) OVER (ORDER BY {col}) AS tile FROM {schema}.{tbl}) x",
+                              "GROUP BY tile")
+                bounds_sql = ' '.join(bounds_sql).format(col=partition_column, n=int(partitions),
+                                                         schema=schema, tbl=table_name)
+                bounds_df = self.get_query(bounds_sql)
+                if len(bounds_df) == 0:
+                    return([], False)
+                has_nulls = bool(bounds_df['has_nulls'].max())
+                bounds = sorted(set(self._python_value(value) for value in bounds_df['lower_bound'].dropna()))
+            elif partition_method == 'minmax':
+                bounds_sql = ("SELECT MIN({col}) AS min_value, MAX({col}) AS max_value,",
+                              "COUNT(*) - COUNT({col}) AS null_count FROM {schema}.{tbl}")
+                bounds_sql = ' '.join(bounds_sql).format(col=partition_column, schema=schema, tbl=table_name)
+                bounds_df = self.get_query(bounds_sql)
+                if len(bounds_df) == 0:
+                    return([], False)
+                has_nulls = bool(bounds_df['null_count'][0] > 0)
+                if pd.isna(bounds_df['min_value'][0]):
+                    return([], has_nulls)
+                min_value = self._python_value(bounds_df['min_value'][0])
+                max_value = self._python_value(bounds_df['max_value'][0])
+                step = (max_value - min_value) / int(partitions)
+                bounds = [min_value]
+                for i in range(1, int(partitions)):
+                    bound = min_value + step * i
+                    if isinstance(min_value, int):
+                        bound = int(bound)
+                    if bound > bounds[-1]:
+                        bounds.append(bound)
+            else:
+                raise ValueError("partition_method must be 'ntile' or 'minmax'")
+            return(bounds, has_nulls)
+
+        except Exception as e:
+            print("An error happened in _partition_bounds(): {}".format(e.args[0]))
+            raise
+
+
+    @staticmethod
+    def _quote_name(name):
+        return("[{}]".format(str(name).replace(']', ']]')))
+
+
+    @staticmethod
+    def _python_value(value):
+        # numpy and pandas scalars are not accepted as bind parameters by pyodbc
+        if isinstance(value, pd.Timestamp):
+            return(value.to_pydatetime())
+        if hasattr(value, 'item'):
+            return(value.item())
+        return(value)
+
+
+    def _get_table_partitioned(self, schema, table_name, parallelism, partition_column, partitions, partition_method,
+                               text_as=None, decimal_as=None):
+        try:
+            if partition_column is None:
+                partition_column = self._find_partition_column(schema, table_name)
+            bounds, has_nulls = self._partition_bounds(schema, table_name, partition_column,
+                                                       partitions, partition_method)
+            partition_column = self._quote_name(partition_column)
+            base_sql = "select * from {}.{}".format(schema, table_name)
+            queries = []
+            for i, lower_bound in enumerate(bounds):
+                if i + 1 < len(bounds):
+                    queries.append(("{} where {col} >= :lower_bound and {col} < :upper_bound".format(
+                                        base_sql, col=partition_column),
+                                    {'lower_bound': lower_bound, 'upper_bound': bounds[i + 1]}))
+                else:
+                    queries.append(("{} where {col} >= :lower_bound".format(base_sql, col=partition_column),
+                                    {'lower_bound': lower_bound}))
+            if has_nulls:
+                queries.append(("{} where {} is null".format(base_sql, partition_column), {}))
+            if len(queries) == 0:
+                return(self._fetch_frame(base_sql, text_as=text_as, decimal_as=decimal_as))
+            parent = self.instrumentation.current()
+            deadline = timeouts.current()
+            def fetch_partition(query):
+                # text is compacted after concatenation, so categories match across partitions
+                with self.instrumentation.record('get_table_partition', query[0], parent=parent) as rec, \
+                        timeouts.bind(deadline):
+                    df = self._fetch_frame(*query, text_as='object', decimal_as=decimal_as)
+                    rec.set_result(df)
+                return(df)
+            with ThreadPoolExecutor(max_workers=max(1, int(parallelism))) as executor:
+                frames = list(executor.map(fetch_partition, queries))
+            non_empty = [frame for frame in frames if len(frame) > 0]
+            df = pd.concat(non_empty, ignore_index=True) if len(non_empty) > 0 else frames[0]
+            options = self._frame_options(text_as, decimal_as)
+            df = compact_text(df, options['text_as'], options['category_threshold'])
+            return(df)
+
+        except Exception as e:
+            print("An error happened in _get_table_partitioned(): {}".format(e.args[0]))
+            raise
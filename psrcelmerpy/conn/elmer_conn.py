@@ -1,16 +1,51 @@
 from .connection import Connection
+from .catalog import CatalogIndex
+import datetime
+import decimal
+import math
+import time
 import pandas as pd
+import sqlalchemy
 
 class ElmerConn(Connection):
     
-    def __init__(self):
+    def __init__(self, pool_size=None, max_overflow=None, pool_recycle=None, fetch_backend=None, engine=None,
+                 query_timeout=None, latency_budget=None, login_timeout=None):
         """
         Establish a connection to Elmer.
+
+        Connections to the same database share one pooled engine for the life of the process.
+
+        Parameters
+        ----------
+        pool_size : int
+            The number of connections kept open in the shared pool (Default value = 5)
+        max_overflow : int
+            The number of extra connections allowed under load (Default value = 10)
+        pool_recycle : int
+            Seconds after which a pooled connection is replaced (Default value = 3600)
+        fetch_backend : str
+            'pyodbc', 'arrow-odbc' (columnar fetches through arrow-odbc), or 'auto' to use 
+            arrow-odbc when it is installed (Default value = 'pyodbc')
+        engine : sqlalchemy.engine.Engine
+            An engine to use instead of the shared pooled one, such as a local stand-in 
+            database for offline tests and benchmarks. (Default value = None)
+        query_timeout : float
+            Seconds a statement may run before it is cancelled and the call raises 
+            QueryTimeout (Default value = None, no limit)
+        latency_budget : float
+            Seconds a call may take before its statement is cancelled and it raises 
+            QueryTimeout (Default value = None, no limit)
+        login_timeout : float
+            Seconds to wait for the server when opening a new connection (Default value = the driver's)
         """
         try:
             self.database_name = 'Elmer'
             self.server_name = 'SQLserver'
-            self._create_engine()
+            self._set_pool_options(pool_size, max_overflow, pool_recycle)
+            self._set_timeouts(query_timeout, latency_budget, login_timeout)
+            self._set_fetch_backend(fetch_backend)
+            self._create_engine(engine)
         
         except Exception as e:
             print(e.args[0])
@@ -25,7 +60,7 @@ class ElmerConn(Connection):
                         "WHERE table_schema not in ('dbo', 'tSQLt', 'DBA', 'meta', 'stg')")
             base_query = " ".join(base_query)
             if schema_name != '':
-                predicate_sql = f"AND t.TABLE_SCHEMA = '{schema_name}'"
+                predicate_sql = "AND t.TABLE_SCHEMA = :schema_name"
                 base_query = f"{base_query} {predicate_sql}"
             if include_base_tables is False:
                 second_predicate = "AND t.TABLE_TYPE = 'view'"
@@ -38,41 +73,288 @@ class ElmerConn(Connection):
             raise
 
 
-    def list_recordsets(self, schema_name='', include_base_tables=False):
+    def _build_recordset_stats_sql(self, schema_name=''):
+        # row counts and sizes come from partition and allocation metadata, so 
+        # no table is scanned; views (other than indexed views) have neither
+        try:
+            stats_query = ("SELECT s.name as [schema],",
+                           "o.name as recordset_name,",
+                           "r.row_count,",
+                           "CAST(a.total_pages * 8 / 1024.0 AS float) as size_mb,",
+                           "o.create_date as created,",
+                           "o.modify_date as modified",
+                           "FROM sys.objects o",
+                           "JOIN sys.schemas s ON s.schema_id = o.schema_id",
+                           "OUTER APPLY (SELECT SUM(p.rows) as row_count FROM sys.partitions p",
+                           "   WHERE p.object_id = o.object_id AND p.index_id IN (0, 1)) r",
+                           "OUTER APPLY (SELECT SUM(u.total_pages) as total_pages FROM sys.partitions p",
+                           "   JOIN sys.allocation_units u ON u.container_id = p.partition_id",
+                           "   WHERE p.object_id = o.object_id) a",
+                           "WHERE o.type IN ('U', 'V')")
+            stats_query = " ".join(stats_query)
+            if schema_name != '':
+                stats_query = f"{stats_query} AND s.name = :schema_name"
+            return(stats_query)
+
+        except Exception as e:
+            print("An error happened in _build_recordset_stats_sql(): {}".format(e.args[0]))
+            raise
+
+
+    def list_recordsets(self, schema_name='', include_base_tables=False, include_stats=True):
         """
         Return a list of tables and views in Elmer
         
         Parameters
         ----------
         schema_name : String.  The name of a schema to filter by.
+        include_base_tables : bool
+            List tables as well as views. (Default value = False)
+        include_stats : bool
+            Add row_count, size_mb, created and modified (when the definition last changed) 
+            columns, read from the catalog views without scanning any table.  Views have no 
+            row count or size. (Default value = True)
 
         """
         try:
-            engine = self.engine
             query = self._build_recordset_sql(schema_name = schema_name, 
                                              include_base_tables=include_base_tables)
-            df = self.get_query(query)
+            params = {'schema_name': schema_name} if schema_name != '' else None
+            df = self.get_query(query, params=params)
+            if include_stats:
+                stats = self.get_query(self._build_recordset_stats_sql(schema_name), params=params)
+                df = df.merge(stats, how='left', on=['schema', 'recordset_name'])
             return(df)
         
         except Exception as e:
             print("An error happened in list_recordsets(): {}".format(e.args[0]))
             raise
 
-    def stage_table(self, df, table_name):
+
+    def recordset_index(self, refresh=False):
+        """Return the index of every table and view in Elmer, with their statistics, by name, schema and type.
+
+        The index is built from one listing and kept for catalog_ttl seconds; 
+        the first call after that (or with refresh=True) builds it again.
+
+        Parameters
+        ----------
+        refresh : bool
+            Query the server even if the cached index is still fresh. (Default value = False)
+
+        Returns
+        -------
+        index : CatalogIndex
+            index.df is the full listing; index.find() looks up rows in it
+        """
+        try:
+            key = ('index', 'recordsets')
+            index = None if refresh else self.catalog_cache.get(key)
+            if index is None:
+                df = self.list_recordsets(include_base_tables=True)
+                index = CatalogIndex(df, ['recordset_name', 'schema', 'recordset_type'])
+                self.catalog_cache.set(key, index)
+            return(index)
+
+        except Exception as e:
+            print("An error happened in recordset_index(): {}".format(e.args[0]))
+            raise
+
+
+    def find_recordsets(self, search=None, schema_name=None, recordset_type=None, refresh=False):
+        """Look up tables and views in the cached index.
+
+        Parameters
+        ----------
+        search : str
+            Text that the recordset name contains, in any case (Default value = None)
+        schema_name : str
+            The schema the recordsets are in (Default value = None)
+        recordset_type : str
+            'VIEW' or 'BASE TABLE' (Default value = None)
+        refresh : bool
+            Rebuild the index first. (Default value = False)
+
+        Returns
+        -------
+        df : a pandas dataframe, with the columns of list_recordsets
+        """
+        try:
+            return(self.recordset_index(refresh).find(search=search, schema=schema_name,
+                                                      recordset_type=recordset_type))
+
+        except Exception as e:
+            print("An error happened in find_recordsets(): {}".format(e.args[0]))
+            raise
+
+
+    def invalidate_catalog(self):
+        """Forget the cached recordset index, so that the next lookup lists Elmer again."""
+        self.catalog_cache.invalidate()
+
+    def stage_table(self, df, table_name, if_exists='fail', fast=True, chunksize=10000):
         """
         Send a data frame to a new table in the database, in schema "stg"
 
+        With fast=True the table is created with column types mapped from the data frame's 
+        dtypes (see map_sql_types) and the rows are sent with pyodbc's fast_executemany, 
+        in batches of chunksize rows, all in one transaction.  Geometry columns of a 
+        GeoDataFrame are sent as WKB (VARBINARY).
+
         Parameters
         ----------
         df : a data frame 
             The data frame to write to the database
         table_name : str
             The name that the new staging table is to have.
+        if_exists : str
+            What to do if the table already exists: 'fail', 'replace' or 'append'. (Default value = 'fail')
+        fast : bool
+            Use the bulk-load path.  If False, fall back to pandas' DataFrame.to_sql. (Default value = True)
+        chunksize : int
+            The number of rows sent per batch. (Default value = 10000)
+
+        Returns
+        -------
+        stats : dict
+            'rows', 'batches' and 'seconds' taken by the load
         """
         try:
+            if if_exists not in ('fail', 'replace', 'append'):
+                raise ValueError("if_exists must be 'fail', 'replace' or 'append'")
             engine = self.engine
-            df.to_sql(name=table_name, schema='stg', con=engine, index=False)
+            start = time.perf_counter()
+            with self.instrumentation.record('stage_table', "stg.{}".format(table_name)) as rec:
+                if not fast:
+                    with rec.phase('insert'):
+                        df.to_sql(name=table_name, schema='stg', con=engine, index=False,
+                                  if_exists=if_exists, chunksize=chunksize)
+                    batches = max(1, math.ceil(len(df) / chunksize))
+                else:
+                    batches = self._bulk_load(df, table_name, if_exists, chunksize)
+                rec.set_result(df)
+            self.invalidate_memo(table_name, schema='stg')
+            seconds = time.perf_counter() - start
+            stats = {'rows': len(df), 'batches': batches, 'seconds': seconds}
+            return(stats)
 
         except Exception as e:
             print(e.args[0])
-            raise
\ No newline at end of file
+            raise
+
+    def map_sql_types(self, df):
+        """Choose a SQL Server column type for each column of a data frame.
+
+        Text columns get an NVARCHAR just wide enough for their longest value 
+        (NVARCHAR(max) only beyond 4000 characters), and geometry columns VARBINARY(max).
+
+        Parameters
+        ----------
+        df : a data frame
+
+        Returns
+        -------
+        sql_types : dict
+            The SQL type for each column name
+        """
+        try:
+            sql_types = {}
+            for col_name in df.columns:
+                sql_types[col_name] = self._sql_type(df[col_name])
+            return(sql_types)
+
+        except Exception as e:
+            print("An error happened in map_sql_types(): {}".format(e.args[0]))
+            raise
+
+    def _sql_type(self, series):
+        dtype = series.dtype
+        if str(dtype) == 'geometry':
+            return('VARBINARY(max)')
+        if isinstance(dtype, pd.CategoricalDtype):
+            series = series.astype(dtype.categories.dtype)
+            dtype = series.dtype
+        if pd.api.types.is_bool_dtype(dtype):
+            return('BIT')
+        if pd.api.types.is_integer_dtype(dtype):
+            if dtype.itemsize <= 2 and not pd.api.types.is_unsigned_integer_dtype(dtype):
+                return('SMALLINT')
+            if dtype.itemsize <= 4 and not pd.api.types.is_unsigned_integer_dtype(dtype):
+                return('INT')
+            return('BIGINT')
+        if pd.api.types.is_float_dtype(dtype):
+            return('REAL' if dtype.itemsize == 4 else 'FLOAT')
+        if pd.api.types.is_datetime64_any_dtype(dtype):
+            return('DATETIMEOFFSET' if getattr(dtype, 'tz', None) is not None else 'DATETIME2')
+        values = series.dropna()
+        if len(values) > 0 and values.map(lambda v: isinstance(v, (bytes, bytearray))).all():
+            return('VARBINARY(max)')
+        if len(values) > 0 and values.map(lambda v: isinstance(v, datetime.datetime)).all():
+            return('DATETIME2')
+        if len(values) > 0 and values.map(lambda v: isinstance(v, datetime.date)).all():
+            return('DATE')
+        if len(values) > 0 and values.map(lambda v: isinstance(v, decimal.Decimal)).all():
+            scale = int(values.map(lambda v: max(0, -v.as_tuple().exponent) if v.is_finite() else 0).max())
+            return('DECIMAL(38, {})'.format(min(scale, 18)))
+        max_len = int(values.astype(str).str.len().max()) if len(values) > 0 else 0
+        if max_len > 4000:
+            return('NVARCHAR(max)')
+        width = next(w for w in (16, 32, 64, 128, 256, 512, 1024, 2048, 4000) if w >= max_len)
+        return('NVARCHAR({})'.format(width))
+
+    def _bulk_values(self, df, sql_types):
+        columns = []
+        for col_name in df.columns:
+            series = df[col_name]
+            not_null = series.notna()
+            if str(series.dtype) == 'geometry':
+                series = series.to_wkb()
+            elif isinstance(series.dtype, pd.CategoricalDtype):
+                series = series.astype(series.dtype.categories.dtype)
+            if pd.api.types.is_datetime64_any_dtype(series.dtype):
+                series = pd.Series(series.dt.to_pydatetime(), index=series.index, dtype=object)
+            values = series.astype(object).where(not_null, None)
+            if sql_types[col_name].startswith('NVARCHAR'):
+                values = values.map(lambda v: v if v is None or isinstance(v, str) else str(v))
+            columns.append(values.tolist())
+        return(list(zip(*columns)))
+
+    def _bulk_load(self, df, table_name, if_exists, chunksize):
+        try:
+            engine = self.engine
+            full_name = "stg.{}".format(self._quote_name(table_name))
+            col_names = [self._quote_name(col_name) for col_name in df.columns]
+            sql_types = self.map_sql_types(df)
+            batches = 0
+            instrumentation = self.instrumentation
+            with instrumentation.phase('checkout'):
+                connection = engine.connect()
+            with connection, connection.begin():
+                exists = sqlalchemy.inspect(connection).has_table(table_name, schema='stg')
+                if exists and if_exists == 'fail':
+                    raise ValueError("Table {} already exists.".format(full_name))
+                if exists and if_exists == 'replace':
+                    connection.execute(sqlalchemy.text("DROP TABLE {}".format(full_name)))
+                if not exists or if_exists == 'replace':
+                    col_defs = ', '.join("{} {}".format(col_name, sql_types[df_col])
+                                         for col_name, df_col in zip(col_names, df.columns))
+                    connection.execute(sqlalchemy.text("CREATE TABLE {} ({})".format(full_name, col_defs)))
+                insert_sql = "INSERT INTO {} ({}) VALUES ({})".format(
+                    full_name, ', '.join(col_names), ', '.join('?' * len(col_names)))
+                cursor = connection.connection.cursor()
+                try:
+                    if hasattr(cursor, 'fast_executemany'):
+                        cursor.fast_executemany = True
+                    for start in range(0, len(df), chunksize):
+                        with instrumentation.phase('convert'):
+                            values = self._bulk_values(df.iloc[start:start + chunksize], sql_types)
+                        with instrumentation.phase('insert'):
+                            cursor.executemany(insert_sql, values)
+                        batches += 1
+                finally:
+                    cursor.close()
+            return(batches)
+
+        except Exception as e:
+            print("An error happened in _bulk_load(): {}".format(e.args[0]))
+            raise
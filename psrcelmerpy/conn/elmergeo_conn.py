@@ -1,27 +1,66 @@
 from .connection import Connection
+from .catalog import CatalogIndex
+from .projection import reproject
+from . import timeouts
+from concurrent.futures import ThreadPoolExecutor
+import numbers
+import time
 import pandas as pd
-import geopandas as gpd
-from shapely import wkt
+# geopandas and shapely (and through them pyproj) are imported inside the
+# methods that need them, so that importing psrcelmerpy stays cheap
 
 class ElmerGeoConn(Connection):
+
+    layer_crs = 'EPSG:2285'
+    layer_srid = 2285
     
-    def __init__(self):
+    def __init__(self, pool_size=None, max_overflow=None, pool_recycle=None, fetch_backend=None, engine=None,
+                 query_timeout=None, latency_budget=None, login_timeout=None):
         """
         Establish a connection to ElmerGeo.
+
+        Parameters
+        ----------
+        pool_size : int
+            The number of connections kept open in the shared pool (Default value = 5)
+        max_overflow : int
+            The number of extra connections allowed under load (Default value = 10)
+        pool_recycle : int
+            Seconds after which a pooled connection is replaced (Default value = 3600)
+        fetch_backend : str
+            'pyodbc', 'arrow-odbc' (columnar fetches through arrow-odbc), or 'auto' to use 
+            arrow-odbc when it is installed (Default value = 'pyodbc')
+        engine : sqlalchemy.engine.Engine
+            An engine to use instead of the shared pooled one, such as a local stand-in 
+            database for offline tests and benchmarks. (Default value = None)
+        query_timeout : float
+            Seconds a statement may run before it is cancelled and the call raises 
+            QueryTimeout (Default value = None, no limit)
+        latency_budget : float
+            Seconds a call may take before its statement is cancelled and it raises 
+            QueryTimeout (Default value = None, no limit)
+        login_timeout : float
+            Seconds to wait for the server when opening a new connection (Default value = the driver's)
         """
         try:
             self.database_name = 'ElmerGeo'
             self.server_name = r'SQLserver'
-            self._create_engine()
+            self._set_pool_options(pool_size, max_overflow, pool_recycle)
+            self._set_timeouts(query_timeout, latency_budget, login_timeout)
+            self._set_fetch_backend(fetch_backend)
+            self._create_engine(engine)
         
         except Exception as e:
             print(e.args[0])
             raise
 
 
-    def list_feature_classes(self, feature_dataset='', feature_class=''):
+    def list_feature_classes(self, feature_dataset='', feature_class='', use_cache=True):
         """List the feature clases available in ElmerGeo
 
+        By default the list is served from the cached feature class index (see 
+        feature_class_index), so only the first call in catalog_ttl seconds queries the server.
+
         Parameters
         ----------
         feature_dataset : str
@@ -30,15 +69,18 @@ class ElmerGeoConn(Connection):
             If supplied, this filters the list to just the named one.  
             This can be useful if you know the ame of the feature clas but not the geography type 
             or the feature dataset that it resides in.(Default value = '')
+        use_cache : bool
+            Filter the cached index rather than querying the server. (Default value = True)
 
         Returns
         -------
         df : a pandas dataframe listing the layer names along withthecorresponding feature datasets and geometry types.
         """
         try:
-            engine = self.engine
+            if use_cache:
+                return(self.feature_class_index().find(layer_name=feature_class, feature_dataset=feature_dataset))
             sql = self.build_fc_query(feature_dataset=feature_dataset, feature_class=feature_class)
-            df = self.get_query(sql)
+            df = self.get_query(sql, params=self.build_fc_params(feature_dataset, feature_class))
             return(df)
             
 
@@ -47,6 +89,66 @@ class ElmerGeoConn(Connection):
             raise
 
 
+    def feature_class_index(self, refresh=False):
+        """Return the index of every feature class in ElmerGeo, by name, feature dataset and geometry type.
+
+        The index is built from one catalog query and kept for catalog_ttl seconds; 
+        the first call after that (or with refresh=True) builds it again.
+
+        Parameters
+        ----------
+        refresh : bool
+            Query the server even if the cached index is still fresh. (Default value = False)
+
+        Returns
+        -------
+        index : CatalogIndex
+            index.df is the full listing; index.find() looks up rows in it
+        """
+        try:
+            key = ('index', 'feature_classes')
+            index = None if refresh else self.catalog_cache.get(key)
+            if index is None:
+                df = self.get_query(self.build_fc_query(), use_memo=False)
+                index = CatalogIndex(df, ['layer_name', 'feature_dataset', 'geometry_type'])
+                self.catalog_cache.set(key, index)
+            return(index)
+
+        except Exception as e:
+            print("An error happened in feature_class_index(): {}".format(e.args[0]))
+            raise
+
+
+    def find_feature_classes(self, search=None, feature_dataset=None, geometry_type=None, refresh=False):
+        """Look up feature classes in the cached index.
+
+        Parameters
+        ----------
+        search : str
+            Text that the layer name contains, in any case (Default value = None)
+        feature_dataset : str
+            The feature dataset the layers are in (Default value = None)
+        geometry_type : str
+            'Polygon', 'Polyline', 'Point', 'Multipoint' ..., with or without the 
+            'esriGeometry' prefix (Default value = None)
+        refresh : bool
+            Rebuild the index first. (Default value = False)
+
+        Returns
+        -------
+        df : a pandas dataframe of layer names, feature datasets and geometry types
+        """
+        try:
+            if geometry_type and not geometry_type.lower().startswith('esrigeometry'):
+                geometry_type = 'esriGeometry' + geometry_type
+            return(self.feature_class_index(refresh).find(search=search, feature_dataset=feature_dataset,
+                                                           geometry_type=geometry_type))
+
+        except Exception as e:
+            print("An error happened in find_feature_classes(): {}".format(e.args[0]))
+            raise
+
+
     def build_fc_query(self, feature_dataset='', feature_class=''):
         """Build a query to list feature classes in a geodatabase.
 
@@ -60,12 +162,13 @@ class ElmerGeoConn(Connection):
         Returns
         -------
         sql : str
-            A SQL query that can be run against a geodatabase
+            A SQL query that can be run against a geodatabase, with the values 
+            from build_fc_params() as its parameters
 
         """
         try:
-            feature_class_filter = f" AND d.PhysicalName = 'ElmerGeo.DBO.{feature_class}'"
-            feature_dataset_filter = f" AND o.[Name] = 'ElmerGeo.DBO.{feature_dataset}'"
+            feature_class_filter = " AND d.PhysicalName = :feature_class"
+            feature_dataset_filter = " AND o.[Name] = :feature_dataset"
             sql = ("select "
             "replace(d.PhysicalName, 'ELMERGEO.DBO.', '') as layer_name, "
             "replace(o.[Name],'ElmerGeo.DBO.', '') as feature_dataset, "
@@ -89,7 +192,20 @@ class ElmerGeoConn(Connection):
             raise
 
 
-    def read_geolayer(self, layer_name, schema_name='dbo', project_to_wgs84=True):
+    def build_fc_params(self, feature_dataset='', feature_class=''):
+        """Return the bind parameters for the query from build_fc_query()."""
+        params = {}
+        if feature_class != '':
+            params['feature_class'] = "ElmerGeo.DBO.{}".format(feature_class)
+        if feature_dataset != '':
+            params['feature_dataset'] = "ElmerGeo.DBO.{}".format(feature_dataset)
+        return(params or None)
+
+
+    def read_geolayer(self, layer_name, schema_name='dbo', project_to_wgs84=True, geometry_format='wkb', use_cache=True,
+                      columns=None, where=None, params=None, bbox=None, mask=None,
+                      simplify_tolerance=None, grid_size=None, tiles=None, parallelism=None, stream=False,
+                      id_column='OBJECTID', to_crs=None, extent_source='aggregate'):
         """ create a geodataframe from a layer in PSRC's in-house geodatabase.
 
         If the layer has been set up as an ESRI versioned layer in the geodatabase, 
@@ -104,29 +220,128 @@ class ElmerGeoConn(Connection):
             The name of the schema that layer_name exists in.  (Default value = 'dbo')
         project_to_wgs84 : bool
             If True then deliver the output in WGS84 projection, otherwise NAD84 / WA State Plane North.  (Default value = True)
+        geometry_format : str
+            How geometries are sent from the server: 'wkb' (binary, decoded in one vectorized call) 
+            or 'wkt' (text, parsed row by row).  'wkb' falls back to 'wkt' if shapely 2 is not installed. (Default value = 'wkb')
+        use_cache : bool
+            If the result cache is enabled (see enable_result_cache), serve the layer 
+            from its GeoParquet copy when that is still fresh. (Default value = True)
+        columns : list
+            The non-spatial columns to return.  If None, all of them. (Default value = None)
+        where : str
+            A SQL condition that rows must meet, e.g. "county_fip = :fips".  It may contain 
+            named placeholders whose values are given in params. (Default value = None)
+        params : dict
+            Values for the placeholders in where, sent as bind parameters. (Default value = None)
+        bbox : tuple or GeoDataFrame/GeoSeries
+            Only return features that intersect this (minx, miny, maxx, maxy) box, in the 
+            layer's CRS (EPSG:2285), or the total bounds of a GeoDataFrame/GeoSeries, which are 
+            reprojected first.  Cannot be combined with mask. (Default value = None)
+        mask : shapely geometry or GeoDataFrame/GeoSeries
+            Only return features that intersect this geometry (in EPSG:2285), or the union of 
+            a GeoDataFrame/GeoSeries, which is reprojected first. (Default value = None)
+        simplify_tolerance : float
+            If supplied, simplify geometries on the server with Reduce(simplify_tolerance), in 
+            the layer's units (feet), before they are sent. (Default value = None)
+        grid_size : float
+            If supplied, round coordinates to multiples of grid_size, in the units of the 
+            returned CRS (degrees if it is WGS84). (Default value = None)
+        tiles : int or tuple
+            If supplied, split the layer's extent (or bbox) into a grid of tiles, n x n for an 
+            int or (columns, rows), and read them at the same time on pooled connections.  
+            Features that cross tile borders are kept once, by id_column.  Cannot be combined 
+            with mask. (Default value = None)
+        parallelism : int
+            The number of tiles read at the same time. (Default value = the pool_size)
+        stream : bool
+            With tiles, return a generator that yields each tile's geodataframe as it 
+            arrives (never repeating a feature) instead of one geodataframe. (Default value = False)
+        id_column : str
+            The unique feature id used to drop repeated features between tiles. (Default value = 'OBJECTID')
+        to_crs : str or pyproj.CRS
+            The CRS to deliver the output in, e.g. 'EPSG:32610'; overrides project_to_wgs84. 
+            Large layers are reprojected in chunks on several threads. (Default value = None)
+        extent_source : str
+            With tiles and no bbox, where the extent split into tiles comes from: 'aggregate' 
+            (exact, scans the layer) or 'index' (the spatial index's bounding box, no scan); 
+            see layer_extent.  Either way, features outside the extent are read by the tiles 
+            at the edges of the grid, which reach out beyond it. (Default value = 'aggregate')
+
+        The column, where and spatial filters are applied on the server, with STIntersects 
+        so that the spatial index is used.  When simplify_tolerance or grid_size is used, 
+        gdf.attrs['geometry_stats'] reports the vertex and byte counts before and after.
 
         Returns
         -------
         gdf : A geodataframe
+            The layer's non-spatial columns and a geometry column.  The raw Shape column the 
+            server sends is not kept.
         
         """
 
         try:
+            if tiles is not None:
+                if mask is not None:
+                    raise ValueError("mask cannot be combined with tiles; use bbox")
+                tile_kwargs = dict(project_to_wgs84=project_to_wgs84, to_crs=to_crs, geometry_format=geometry_format,
+                                   columns=columns, where=where, params=params,
+                                   simplify_tolerance=simplify_tolerance, grid_size=grid_size)
+                tiled = self._iter_geolayer_tiles(layer_name, schema_name, tiles, bbox,
+                                                  parallelism or self.pool_size, id_column, tile_kwargs,
+                                                  extent_source)
+                if stream:
+                    return(tiled)
+                return(self._assemble_tiles(tiled, id_column))
             # engine = self.engine
-            layr_type = self.find_layer_type(layer_name, schema_name)
-            if layr_type == 'evw':
-                tbl_name = "{}_evw".format(layer_name)
-            elif layr_type == 'nonversioned':
-                tbl_name = layer_name 
-            elif layr_type == 'none':
-                raise ValueError("no layer error")
-            layer_sql = self.build_feature_class_sql(schema_name=schema_name,
-                                tbl_name=tbl_name)
-            crs='EPSG:2285'
-            gdf = self.sql_to_gdf(layer_sql)
-            gdf = gdf.set_crs(crs)
-            if project_to_wgs84:
-                gdf.to_crs('EPSG:4326', inplace=True)
+            with self.instrumentation.record('read_geolayer', "{}.{}".format(schema_name, layer_name)) as rec:
+                filter_wkt = self._spatial_filter_wkt(bbox, mask)
+                target_crs = self._target_crs(project_to_wgs84, to_crs)
+                if use_cache and self.result_cache is not None:
+                    # the cached copy is stored already projected, so a hit skips reprojection; 
+                    # the layer's metadata is only looked up to revalidate it or on a miss
+                    key = self.result_cache.make_key(self.server_name, self.database_name, 'geolayer', 
+                                                     schema_name.lower(), layer_name.lower(), self._crs_key(target_crs),
+                                                     columns, where, sorted((params or {}).items()), filter_wkt,
+                                                     simplify_tolerance, grid_size)
+                    gdf = self.result_cache.fetch(key,
+                                                  lambda: self.read_geolayer(layer_name, schema_name, project_to_wgs84,
+                                                                             geometry_format, use_cache=False,
+                                                                             columns=columns, where=where,
+                                                                             params=params, bbox=bbox, mask=mask,
+                                                                             simplify_tolerance=simplify_tolerance,
+                                                                             grid_size=grid_size, to_crs=target_crs),
+                                                  lambda: self._layer_signature(layer_name, schema_name),
+                                                  geo=True)
+                else:
+                    metadata = self.get_layer_metadata(layer_name, schema_name)
+                    if metadata['layer_type'] == 'none':
+                        raise ValueError("no layer error")
+                    tbl_name = metadata['tbl_name']
+                    geometry_format = self._resolve_geometry_format(geometry_format)
+                    layer_sql = self.build_feature_class_sql(schema_name=schema_name,
+                                        tbl_name=tbl_name,
+                                        geometry_format=geometry_format,
+                                        metadata=metadata,
+                                        columns=columns,
+                                        where=where,
+                                        spatial_filter=filter_wkt is not None,
+                                        simplify_tolerance=simplify_tolerance,
+                                        geometry_stats=simplify_tolerance is not None or grid_size is not None)
+                    query_params = dict(params or {})
+                    if filter_wkt is not None:
+                        query_params['filter_wkt'] = filter_wkt
+                    if simplify_tolerance is not None:
+                        query_params['simplify_tolerance'] = float(simplify_tolerance)
+                    crs = self.layer_crs
+                    gdf = self.sql_to_gdf(layer_sql, geometry_format=geometry_format, params=query_params or None)
+                    gdf = gdf.set_crs(crs)
+                    with rec.phase('reproject'):
+                        gdf = reproject(gdf, target_crs)
+                    if simplify_tolerance is not None or grid_size is not None:
+                        gdf = self._reduce_geometry(gdf, simplify_tolerance, grid_size)
+                    # the geometry column holds the decoded shapes; the raw WKB/WKT is not kept twice
+                    gdf = gdf.drop(columns='Shape')
+                rec.set_result(gdf)
             return(gdf)
 
         except Exception as e:
@@ -134,6 +349,332 @@ class ElmerGeoConn(Connection):
             raise
 
 
+    def _target_crs(self, project_to_wgs84=True, to_crs=None):
+        if to_crs is not None:
+            return(to_crs)
+        return('EPSG:4326' if project_to_wgs84 else self.layer_crs)
+
+
+    @staticmethod
+    def _crs_key(crs):
+        from pyproj import CRS
+        return(CRS.from_user_input(crs).to_string())
+
+
+    def layer_extent(self, layer_name, schema_name='dbo', source='aggregate'):
+        """Return the bounds of a layer, in its CRS (EPSG:2285).
+
+        Parameters
+        ----------
+        layer_name : str
+            The name of the feature layer
+        schema_name : str
+            The schema that layer_name exists in. (Default value = 'dbo')
+        source : str
+            'aggregate' for the exact bounds of the features (EnvelopeAggregate, computed on 
+            the server), or 'index' for the bounding box of the layer's spatial index, which 
+            needs no scan but is declared when the index is built, so it may be larger than 
+            the data or miss features outside it. (Default value = 'aggregate')
+
+        Returns
+        -------
+        extent : tuple
+            (minx, miny, maxx, maxy), or None if the layer has no features (or, for 
+            'index', no spatial index)
+        """
+        try:
+            metadata = self.get_layer_metadata(layer_name, schema_name)
+            if metadata['layer_type'] == 'none':
+                raise ValueError("no layer error")
+            if source == 'index':
+                sql = ' '.join(("SELECT t.bounding_box_xmin as x1, t.bounding_box_ymin as y1,",
+                                "t.bounding_box_xmax as x2, t.bounding_box_ymax as y2",
+                                "FROM sys.spatial_index_tessellations t",
+                                "JOIN sys.objects o ON o.object_id = t.object_id",
+                                "JOIN sys.schemas s ON s.schema_id = o.schema_id",
+                                "WHERE s.name = :schema_name AND o.name = :table_name"))
+                df = self.get_query(sql, params={'schema_name': schema_name, 'table_name': layer_name},
+                                    use_memo=False)
+            elif source == 'aggregate':
+                tbl_name = metadata['tbl_name']
+                s_col_name = metadata['tables'][tbl_name.lower()]['spatial_columns'][0][0]
+                sql = ' '.join(("SELECT e.env.STPointN(1).STX as x1, e.env.STPointN(1).STY as y1,",
+                                "e.env.STPointN(3).STX as x2, e.env.STPointN(3).STY as y2",
+                                "FROM (SELECT geometry::EnvelopeAggregate({}) as env FROM {}.{}) e".format(
+                                    s_col_name, schema_name, tbl_name)))
+                df = self.get_query(sql, use_memo=False)
+            else:
+                raise ValueError("source must be 'aggregate' or 'index'")
+            if len(df) == 0 or df.iloc[0].isna().any():
+                return(None)
+            x1, y1, x2, y2 = (float(value) for value in df.iloc[0][['x1', 'y1', 'x2', 'y2']])
+            return((min(x1, x2), min(y1, y2), max(x1, x2), max(y1, y2)))
+
+        except Exception as e:
+            print("An error happened in layer_extent(): {}".format(e.args[0]))
+            raise
+
+
+    # where the outer edges of an open tile grid are put: farther than any 
+    # projected coordinate, but finite, so the tiles are still valid boxes
+    _open_edge = 1e12
+
+    @classmethod
+    def _tile_grid(cls, extent, tiles, open_edges=False):
+        import numpy as np
+        n_cols, n_rows = (tiles, tiles) if isinstance(tiles, numbers.Integral) else tiles
+        if n_cols < 1 or n_rows < 1:
+            raise ValueError("tiles must be at least 1 in each direction")
+        minx, miny, maxx, maxy = extent
+        # a layer of one point (or one line along an axis) still needs tiles with an area
+        if maxx - minx == 0:
+            minx, maxx = minx - 0.5, maxx + 0.5
+        if maxy - miny == 0:
+            miny, maxy = miny - 0.5, maxy + 0.5
+        xs = np.linspace(minx, maxx, n_cols + 1)
+        ys = np.linspace(miny, maxy, n_rows + 1)
+        if open_edges:
+            xs[0], ys[0] = -cls._open_edge, -cls._open_edge
+            xs[-1], ys[-1] = cls._open_edge, cls._open_edge
+        return([(float(xs[i]), float(ys[j]), float(xs[i + 1]), float(ys[j + 1]))
+                for j in range(n_rows) for i in range(n_cols)])
+
+
+    def _iter_geolayer_tiles(self, layer_name, schema_name, tiles, bbox, parallelism, id_column, tile_kwargs,
+                             extent_source='aggregate'):
+        from concurrent.futures import wait, FIRST_COMPLETED
+        import shapely
+        metadata = self.get_layer_metadata(layer_name, schema_name)
+        if metadata['layer_type'] == 'none':
+            raise ValueError("no layer error")
+        known = {col.lower(): col for col in metadata['columns']}
+        if id_column.lower() not in known:
+            raise ValueError("{}.{} has no column {} to identify features by".format(schema_name, layer_name, id_column))
+        id_column = known[id_column.lower()]
+        columns = tile_kwargs['columns']
+        if columns is not None and id_column.lower() not in [col.lower() for col in columns]:
+            tile_kwargs = dict(tile_kwargs, columns=list(columns) + [id_column])
+        if bbox is not None:
+            extent = shapely.from_wkt(self._spatial_filter_wkt(bbox=bbox)).bounds
+        else:
+            extent = self.layer_extent(layer_name, schema_name, source=extent_source)
+        # the record is not made the thread's active one, because the caller's 
+        # code runs between tiles
+        rec = self.instrumentation.start('read_geolayer_tiled', "{}.{}".format(schema_name, layer_name))
+        rec.rows, rec.bytes = 0, 0
+        try:
+            if extent is None:
+                # nothing to split: the layer (or the part of it in bbox) is empty
+                yield self.read_geolayer(layer_name, schema_name, use_cache=False, bbox=bbox, **tile_kwargs)
+                return
+            # the extent may not hold every feature (a spatial index's box is declared, not 
+            # measured, and rows may be added after it is read), so without a bbox the tiles 
+            # at the edges of the grid reach out to take in everything beyond it
+            grid = self._tile_grid(extent, tiles, open_edges=bbox is None)
+            deadline = timeouts.current()
+
+            def read_tile(tile):
+                with self.instrumentation.record('read_geolayer_tile', str(tile), parent=rec) as tile_rec, \
+                        timeouts.bind(deadline):
+                    gdf = self.read_geolayer(layer_name, schema_name, use_cache=False, bbox=tile, **tile_kwargs)
+                    tile_rec.set_result(gdf)
+                return(gdf)
+
+            seen = set()
+            pending = set()
+            remaining = iter(grid)
+            with ThreadPoolExecutor(max_workers=max(1, min(parallelism, len(grid)))) as executor:
+                for tile in remaining:
+                    pending.add(executor.submit(read_tile, tile))
+                    if len(pending) >= parallelism:
+                        break
+                while pending:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        # keep at most `parallelism` tiles in flight, so a slow 
+                        # consumer bounds the memory used
+                        tile = next(remaining, None)
+                        if tile is not None:
+                            pending.add(executor.submit(read_tile, tile))
+                        gdf = future.result()
+                        gdf = gdf[~gdf[id_column].isin(seen)]
+                        seen.update(gdf[id_column].tolist())
+                        rec.add_result(gdf)
+                        yield gdf
+
+        except Exception as e:
+            rec.error = "{}: {}".format(type(e).__name__, e)
+            print("An error happened in read_geolayer() with tiles: {}".format(e.args[0]))
+            raise
+
+        finally:
+            self.instrumentation.finish(rec)
+
+
+    def _assemble_tiles(self, tiled, id_column):
+        try:
+            start = time.perf_counter()
+            gdfs = list(tiled)
+            nonempty = [gdf for gdf in gdfs if len(gdf) > 0]
+            if len(nonempty) == 0:
+                gdf = gdfs[0]
+            else:
+                gdf = pd.concat(nonempty, ignore_index=True) if len(nonempty) > 1 else nonempty[0]
+                id_col = next(col for col in gdf.columns if col.lower() == id_column.lower())
+                gdf = gdf.sort_values(id_col).reset_index(drop=True)
+            # the tiles' own attrs (srid, geometry_stats, ...) are kept; geometry_stats 
+            # are summed over the tiles as read, before repeated features were dropped
+            attrs = dict(gdfs[0].attrs)
+            tile_stats = [tile.attrs['geometry_stats'] for tile in gdfs if 'geometry_stats' in tile.attrs]
+            if len(tile_stats) > 0:
+                geometry_stats = dict(tile_stats[0])
+                for key in ('source_vertices', 'source_bytes', 'bytes', 'vertices'):
+                    geometry_stats[key] = sum(stats[key] for stats in tile_stats)
+                attrs['geometry_stats'] = geometry_stats
+            attrs['tile_stats'] = {'tiles': len(gdfs),
+                                   'rows': len(gdf),
+                                   'seconds': time.perf_counter() - start}
+            gdf.attrs = attrs
+            return(gdf)
+
+        except Exception as e:
+            print("An error happened in _assemble_tiles(): {}".format(e.args[0]))
+            raise
+
+
+    def read_geolayers(self, layer_names, schema_name='dbo', parallelism=None, **kwargs):
+        """Create geodataframes from several layers at once.
+
+        The metadata of all the layers is looked up in one catalog query, and the layers 
+        are then read at the same time on pooled connections.  Reprojection reuses one 
+        cached transformer per thread.
+
+        Parameters
+        ----------
+        layer_names : list
+            The names of the layers to read
+        schema_name : str
+            The schema that the layers exist in. (Default value = 'dbo')
+        parallelism : int
+            The number of layers read at the same time. (Default value = the pool_size)
+        **kwargs
+            Passed to read_geolayer for every layer (project_to_wgs84, geometry_format, columns, ...)
+
+        Returns
+        -------
+        gdfs : dict
+            A geodataframe per layer name, in the order given.  Each one's attrs['read_stats'] 
+            has the layer's duration in seconds and its time per phase.
+        """
+        try:
+            layer_names = list(dict.fromkeys(layer_names))
+            parallelism = parallelism if parallelism is not None else self.pool_size
+            with self.instrumentation.record('read_geolayers', ', '.join(layer_names)) as rec:
+                with rec.phase('catalog'):
+                    self._cache_layer_metadata(layer_names, schema_name)
+
+                deadline = timeouts.current()
+
+                def read_layer(layer_name):
+                    with self.instrumentation.record('read_geolayers_layer', layer_name, parent=rec) as layer_rec, \
+                            timeouts.bind(deadline):
+                        gdf = self.read_geolayer(layer_name, schema_name, **kwargs)
+                        layer_rec.set_result(gdf)
+                    gdf.attrs['read_stats'] = {'seconds': layer_rec.duration,
+                                               'phases': dict(layer_rec.phases),
+                                               'rows': len(gdf)}
+                    return(gdf)
+
+                with ThreadPoolExecutor(max_workers=max(1, min(parallelism, len(layer_names) or 1))) as executor:
+                    futures = {layer_name: executor.submit(read_layer, layer_name) for layer_name in layer_names}
+                    gdfs = {layer_name: future.result() for layer_name, future in futures.items()}
+                rec.rows = sum(len(gdf) for gdf in gdfs.values())
+            return(gdfs)
+
+        except Exception as e:
+            print("An error happened in read_geolayers(): {}".format(e.args[0]))
+            raise
+
+
+    def export_geolayer(self, layer_name, path, schema_name='dbo', format='parquet', compression='default',
+                        chunksize=50000, project_to_wgs84=True, geometry_format='wkb', columns=None,
+                        where=None, params=None, bbox=None, mask=None, simplify_tolerance=None, to_crs=None):
+        """Write a layer straight to a GeoParquet or CSV file, without holding it all in memory.
+
+        Features are streamed from the server ``chunksize`` at a time; each chunk is decoded, 
+        reprojected and written (as a GeoParquet row group, or appended to the CSV with the 
+        geometry as WKT) before the next is read.
+
+        Parameters
+        ----------
+        layer_name : str
+            The name of the feature layer or geodatabase table
+        path : str
+            The file to write.  It is replaced only once the export has finished.
+        schema_name : str
+            The schema that layer_name exists in. (Default value = 'dbo')
+        format : str
+            'parquet' (GeoParquet) or 'csv' (Default value = 'parquet')
+        compression : str
+            For Parquet, a codec such as 'snappy', 'zstd', 'gzip' or None; for CSV, None, 'gzip', 
+            'bz2' or 'xz'. (Default value = 'snappy' for Parquet, None for CSV)
+        chunksize : int
+            The number of features read and written at a time (Default value = 50000)
+        project_to_wgs84, geometry_format, columns, where, params, bbox, mask, simplify_tolerance, to_crs
+            As for read_geolayer
+
+        Returns
+        -------
+        stats : dict
+            'rows', 'batches', 'bytes' (the size of the file) and 'seconds'
+        """
+        try:
+            from .export import geoparquet_metadata
+            metadata = self.get_layer_metadata(layer_name, schema_name)
+            if metadata['layer_type'] == 'none':
+                raise ValueError("no layer error")
+            geometry_format = self._resolve_geometry_format(geometry_format)
+            filter_wkt = self._spatial_filter_wkt(bbox, mask)
+            layer_sql = self.build_feature_class_sql(schema_name=schema_name,
+                                                     tbl_name=metadata['tbl_name'],
+                                                     geometry_format=geometry_format,
+                                                     metadata=metadata,
+                                                     columns=columns,
+                                                     where=where,
+                                                     spatial_filter=filter_wkt is not None,
+                                                     simplify_tolerance=simplify_tolerance)
+            query_params = dict(params or {})
+            if filter_wkt is not None:
+                query_params['filter_wkt'] = filter_wkt
+            if simplify_tolerance is not None:
+                query_params['simplify_tolerance'] = float(simplify_tolerance)
+            crs = self._target_crs(project_to_wgs84, to_crs)
+            chunks = self._iter_export_chunks(layer_sql, query_params or None, chunksize, geometry_format,
+                                              crs, format)
+            stats = self._export_chunks('export_geolayer', layer_sql, chunks, path, format, compression,
+                                        metadata=geoparquet_metadata(crs) if format == 'parquet' else None)
+            return(stats)
+
+        except Exception as e:
+            print("An error happened in export_geolayer(): {}".format(e.args[0]))
+            raise
+
+
+    def _iter_export_chunks(self, sql, params, chunksize, geometry_format, crs, format):
+        import shapely
+        for df in self.iter_query(sql, chunksize=chunksize, params=params):
+            gdf = self._frame_to_gdf(df, geometry_format).set_crs(self.layer_crs)
+            with self.instrumentation.phase('reproject'):
+                gdf = reproject(gdf, crs)
+            geometries = gdf.geometry.to_numpy()
+            df = pd.DataFrame(gdf.drop(columns=['Shape', 'geometry']))
+            if format == 'parquet':
+                df['geometry'] = shapely.to_wkb(geometries)
+            else:
+                df['geometry'] = shapely.to_wkt(geometries)
+            yield df
+
+
     def find_layer_type(self, layer_name, schema_name):
         """Determine the type of layer (A versioned view, a nonversioned table, or neither)
 
@@ -143,8 +684,6 @@ class ElmerGeoConn(Connection):
             The name of the layer to check
         schema_name: str
             The schema name that the layer exists in in the database
-        conn : SQLAlchemy connectable str, or sqlite3 connection
-            A connection to an SDE database
 
         Returns
         -------
@@ -153,12 +692,7 @@ class ElmerGeoConn(Connection):
         
         """
         try:
-            if self.is_table_or_view(layer_name, schema_name, as_evw=True):
-                table_type = 'evw'
-            elif self.is_table_or_view(layer_name, schema_name, as_evw=False):
-                table_type = 'nonversioned'
-            else:
-                table_type = 'none'
+            table_type = self.get_layer_metadata(layer_name, schema_name)['layer_type']
             return(table_type)
         
         except Exception as e:
@@ -175,8 +709,6 @@ class ElmerGeoConn(Connection):
             The name of a geospatial layer or feature class
         schema_name : str
             The schema that the table sits within
-        conn : SQLAlchemy connectable str, or sqlite3 connection
-            A connection to an SDE database
         as_evw : bool
             A flag indicating that the layer is a versioned view (Default value = False)
 
@@ -187,17 +719,12 @@ class ElmerGeoConn(Connection):
         
         """
         try:
-            suffix = '_evw' if as_evw else ''
-            infoschm_tbl = 'VIEWS' if as_evw else 'TABLES'
-            info_schema_sql = ("SELECT TABLE_NAME",
-                            "FROM INFORMATION_SCHEMA.{} as v".format(infoschm_tbl),
-                            "WHERE v.TABLE_NAME = '{}{}'".format(
-                                layer_name, suffix),
-                            "   AND v.TABLE_SCHEMA = '{}'".format(schema_name)
-                            )
-            info_schema_sql = ' '.join(info_schema_sql)
-            info_schema_df = self.get_query(info_schema_sql)
-            ret_val = True if len(info_schema_df) > 0 else False
+            tables = self.get_layer_metadata(layer_name, schema_name)['tables']
+            if as_evw:
+                evw = tables.get("{}_evw".format(layer_name).lower())
+                ret_val = evw is not None and evw['table_type'] == 'VIEW'
+            else:
+                ret_val = layer_name.lower() in tables
             return(ret_val)
             
         except Exception as e:
@@ -205,11 +732,228 @@ class ElmerGeoConn(Connection):
             raise
 
 
-    def build_feature_class_sql(self, schema_name, tbl_name):
+    def invalidate_catalog(self, layer_name=None, schema_name='dbo'):
+        """Forget cached layer metadata so that the next read looks it up on the server again.
+
+        Parameters
+        ----------
+        layer_name : str
+            The layer to forget.  If None, all cached metadata is dropped, including the 
+            feature class index. (Default value = None)
+        schema_name : str
+            The schema that layer_name exists in. (Default value = 'dbo')
+        """
+        try:
+            if layer_name is None:
+                self.catalog_cache.invalidate()
+            else:
+                self.catalog_cache.invalidate((schema_name.lower(), layer_name.lower()))
+
+        except Exception as e:
+            print("An error happened in invalidate_catalog(): {}".format(e.args[0]))
+            raise
+
+
+    def _layer_signature(self, layer_name, schema_name='dbo'):
+        # the signature of the table or view a layer is read from, or None if there is no such layer
+        metadata = self.get_layer_metadata(layer_name, schema_name)
+        if metadata['layer_type'] == 'none':
+            return(None)
+        return(self._object_signature(schema_name, metadata['tbl_name']))
+
+
+    def get_layer_metadata(self, layer_name, schema_name='dbo'):
+        """Describe a layer: whether it is versioned, and its spatial and non-spatial columns.
+
+        The versioned view ({layer_name}_evw) and base table are resolved together 
+        in one catalog query, and the result is cached for catalog_ttl seconds.
+
+        Parameters
+        ----------
+        layer_name : str
+            The name of the feature class or geodatabase table
+        schema_name : str
+            The schema that the layer exists in. (Default value = 'dbo')
+
+        Returns
+        -------
+        metadata : dict
+            'layer_type' (one of ['evw' | 'nonversioned' | 'none']), 'tbl_name' (the table or 
+            view to read, or None), 'columns' (non-spatial column names), 'spatial_columns' 
+            (a list of (column name, data type) pairs) and 'tables' (every matching table or view).
+        """
+        try:
+            key = (schema_name.lower(), layer_name.lower())
+            metadata = self.catalog_cache.get(key)
+            if metadata is None:
+                metadata = self._fetch_layer_metadata([layer_name], schema_name)[layer_name.lower()]
+                self.catalog_cache.set(key, metadata)
+            return(metadata)
+
+        except Exception as e:
+            print("An error happened in get_layer_metadata(): {}".format(e.args[0]))
+            raise
+
+
+    def _cache_layer_metadata(self, layer_names, schema_name):
+        try:
+            missing = [layer_name for layer_name in layer_names
+                       if self.catalog_cache.get((schema_name.lower(), layer_name.lower())) is None]
+            if missing:
+                layers = self._fetch_layer_metadata(missing, schema_name)
+                for layer_name in missing:
+                    self.catalog_cache.set((schema_name.lower(), layer_name.lower()), layers[layer_name.lower()])
+
+        except Exception as e:
+            print("An error happened in _cache_layer_metadata(): {}".format(e.args[0]))
+            raise
+
+
+    def _build_layer_catalog_sql(self, layer_names, schema_name):
+        try:
+            tbl_params = [name for name in self._layer_catalog_params(layer_names, schema_name)
+                          if name.startswith('tbl_')]
+            catalog_sql = ("SELECT t.TABLE_NAME, t.TABLE_TYPE, c.COLUMN_NAME, c.DATA_TYPE",
+                           "FROM INFORMATION_SCHEMA.TABLES t",
+                           "JOIN INFORMATION_SCHEMA.COLUMNS c",
+                           "   ON c.TABLE_SCHEMA = t.TABLE_SCHEMA AND c.TABLE_NAME = t.TABLE_NAME",
+                           "WHERE t.TABLE_SCHEMA = :schema_name",
+                           "   AND t.TABLE_NAME IN ({})".format(
+                               ', '.join(":{}".format(name) for name in tbl_params)),
+                           "ORDER BY t.TABLE_NAME, c.ORDINAL_POSITION"
+                           )
+            catalog_sql = ' '.join(catalog_sql)
+            return(catalog_sql)
+
+        except Exception as e:
+            print("An error happened in _build_layer_catalog_sql(): {}".format(e.args[0]))
+            raise
+
+
+    def _layer_catalog_params(self, layer_names, schema_name):
+        # each layer is looked up as both its table and its versioned view
+        params = {'schema_name': schema_name}
+        for i, layer_name in enumerate(layer_names):
+            params['tbl_{}'.format(2 * i)] = layer_name
+            params['tbl_{}'.format(2 * i + 1)] = "{}_evw".format(layer_name)
+        return(params)
+
+
+    def _fetch_layer_metadata(self, layer_names, schema_name):
+        try:
+            catalog_df = self.get_query(self._build_layer_catalog_sql(layer_names, schema_name),
+                                        params=self._layer_catalog_params(layer_names, schema_name))
+            tables = {}
+            for row in catalog_df.itertuples(index=False):
+                tbl = tables.setdefault(row.TABLE_NAME.lower(), 
+                                        {'tbl_name': row.TABLE_NAME, 
+                                         'table_type': row.TABLE_TYPE,
+                                         'columns': [],
+                                         'spatial_columns': []})
+                if row.COLUMN_NAME == 'GDB_GEOMATTR_DATA':
+                    continue
+                if row.DATA_TYPE in ('geometry', 'geography'):
+                    tbl['spatial_columns'].append((row.COLUMN_NAME, row.DATA_TYPE))
+                else:
+                    tbl['columns'].append(row.COLUMN_NAME)
+            layers = {}
+            for layer_name in layer_names:
+                evw = tables.get("{}_evw".format(layer_name).lower())
+                base = tables.get(layer_name.lower())
+                layer_tables = {name: tables[name] for name in (layer_name.lower(), "{}_evw".format(layer_name).lower())
+                                if name in tables}
+                if evw is not None and evw['table_type'] == 'VIEW':
+                    layer_type, tbl = 'evw', evw
+                elif base is not None:
+                    layer_type, tbl = 'nonversioned', base
+                else:
+                    layer_type, tbl = 'none', None
+                layers[layer_name.lower()] = {'layer_type': layer_type,
+                                              'tbl_name': tbl['tbl_name'] if tbl else None,
+                                              'columns': tbl['columns'] if tbl else [],
+                                              'spatial_columns': tbl['spatial_columns'] if tbl else [],
+                                              'tables': layer_tables}
+            return(layers)
+
+        except Exception as e:
+            print("An error happened in _fetch_layer_metadata(): {}".format(e.args[0]))
+            raise
+
+
+    def _resolve_geometry_format(self, geometry_format):
+        try:
+            import shapely
+            if geometry_format not in ('wkb', 'wkt'):
+                raise ValueError("geometry_format must be 'wkb' or 'wkt'")
+            if geometry_format == 'wkb' and not hasattr(shapely, 'from_wkb'):
+                geometry_format = 'wkt'
+            return(geometry_format)
+
+        except Exception as e:
+            print("An error happened in _resolve_geometry_format(): {}".format(e.args[0]))
+            raise
+
+
+    def _reduce_geometry(self, gdf, simplify_tolerance, grid_size):
+        try:
+            import numpy as np
+            import shapely
+            stats = {'simplify_tolerance': simplify_tolerance,
+                     'grid_size': grid_size,
+                     'source_vertices': int(gdf['SourceVertices'].fillna(0).sum()),
+                     'source_bytes': int(gdf['SourceBytes'].fillna(0).sum()),
+                     'bytes': int(gdf['Shape'].map(lambda shape: len(shape) if shape is not None else 0).sum())}
+            gdf = gdf.drop(columns=['SourceVertices', 'SourceBytes'])
+            if grid_size is not None:
+                with self.instrumentation.phase('set_precision'):
+                    gdf['geometry'] = gdf.geometry.set_precision(grid_size)
+            stats['vertices'] = int(shapely.get_num_coordinates(np.asarray(gdf.geometry.array)).sum())
+            gdf.attrs['geometry_stats'] = stats
+            return(gdf)
+
+        except Exception as e:
+            print("An error happened in _reduce_geometry(): {}".format(e.args[0]))
+            raise
+
+
+    def _spatial_filter_wkt(self, bbox=None, mask=None):
+        try:
+            if bbox is None and mask is None:
+                return(None)
+            if bbox is not None and mask is not None:
+                raise ValueError("bbox and mask cannot be used together")
+            import shapely.geometry
+            from shapely.ops import unary_union
+            if bbox is not None:
+                if hasattr(bbox, 'total_bounds'):
+                    if bbox.crs is not None:
+                        bbox = bbox.to_crs(self.layer_crs)
+                    bbox = tuple(bbox.total_bounds)
+                if len(bbox) != 4:
+                    raise ValueError("bbox must be (minx, miny, maxx, maxy)")
+                geom = shapely.geometry.box(*bbox)
+            else:
+                if hasattr(mask, 'geometry'):
+                    if mask.crs is not None:
+                        mask = mask.to_crs(self.layer_crs)
+                    mask = unary_union(list(mask.geometry))
+                geom = mask
+            if geom.is_empty:
+                raise ValueError("the bbox or mask is empty")
+            return(geom.wkt)
+
+        except Exception as e:
+            print("An error happened in _spatial_filter_wkt(): {}".format(e.args[0]))
+            raise
+
+
+    def build_feature_class_sql(self, schema_name, tbl_name, geometry_format='wkt', metadata=None,
+                                columns=None, where=None, spatial_filter=False,
+                                simplify_tolerance=None, geometry_stats=False):
         """Build a SQL query to select all the columns in table or view {schema_name}.{tbl_name}.
         
         If any columns are of type [geography] or [geography], get its WKT representation
-        and name that column [Shape]
+        (or its WKB representation plus its SRID, as column [SRID]) and name that column [Shape]
 
         Parameters
         ----------
@@ -217,8 +961,24 @@ class ElmerGeoConn(Connection):
             The schema that the table sits within
         tbl_name: str
             The name of the table or view from which you want to select
-        conn : SQLAlchemy connectable str, or sqlite3 connection
-            A connection to an SDE database
+        geometry_format : str
+            Either 'wkt' (STAsText) or 'wkb' (STAsBinary and STSrid) (Default value = 'wkt')
+        metadata : dict
+            Layer metadata from get_layer_metadata().  If None it is looked up (or taken 
+            from the catalog cache). (Default value = None)
+        columns : list
+            The non-spatial columns to select.  If None, all of them. (Default value = None)
+        where : str
+            A SQL condition added to the WHERE clause. (Default value = None)
+        spatial_filter : bool
+            If True, only select rows whose geometry intersects the WKT geometry 
+            bound to the :filter_wkt parameter. (Default value = False)
+        simplify_tolerance : float
+            If supplied, send {column}.Reduce(:simplify_tolerance) instead of the full geometry; 
+            the tolerance is bound as a parameter. (Default value = None)
+        geometry_stats : bool
+            If True, also select the vertex count ([SourceVertices]) and serialized size 
+            ([SourceBytes]) of each unsimplified geometry. (Default value = False)
 
         Returns
         -------
@@ -228,32 +988,55 @@ class ElmerGeoConn(Connection):
         """
 
         try: 
-            col_name_ns_sql = ("select c.COLUMN_NAME",
-                    "from INFORMATION_SCHEMA.COLUMNS c",
-                    "where c.TABLE_SCHEMA = '{}'".format(schema_name),
-                        "and c.TABLE_NAME = '{}'".format(tbl_name),
-                        "and c.DATA_TYPE not in ('geometry', 'geography')",
-                        "and c.COLUMN_NAME not in ('GDB_GEOMATTR_DATA')"
-                        )
-            col_name_ns_sql = ' '.join(col_name_ns_sql)
-            col_df = self.get_query(col_name_ns_sql)
-            col_names_ns = ', '.join(col_df['COLUMN_NAME'])
-            s_col_name_sql = ("select c.COLUMN_NAME + '.STAsText() as Shape' as COLUMN_NAME "
-                    "from INFORMATION_SCHEMA.COLUMNS c",
-                    "where c.TABLE_SCHEMA = '{}'".format(schema_name),
-                        "and c.TABLE_NAME = '{}'".format(tbl_name),
-                        "and c.DATA_TYPE in ('geometry', 'geography')",
-                        "and c.COLUMN_NAME not in ('GDB_GEOMATTR_DATA')"
-                        )
-            s_col_name_sql = ' '.join(s_col_name_sql)
-            s_col_df = self.get_query(s_col_name_sql)
-            col_names_s = ', '.join(s_col_df['COLUMN_NAME'])
-            ret_str = "SELECT  {col_names_ns}, {col_names_s} FROM {schema_name}.{tbl_name}".format(
-                col_names_ns=col_names_ns,
-                col_names_s=col_names_s,
+            if metadata is None:
+                layer_name = tbl_name[:-4] if tbl_name.lower().endswith('_evw') else tbl_name
+                metadata = self.get_layer_metadata(layer_name, schema_name)
+            tbl = metadata['tables'].get(tbl_name.lower())
+            if tbl is None:
+                raise ValueError("{}.{} was not found".format(schema_name, tbl_name))
+            if len(tbl['spatial_columns']) == 0:
+                raise ValueError("{}.{} has no geometry or geography column".format(schema_name, tbl_name))
+            s_col_name = tbl['spatial_columns'][0][0]
+            geom = s_col_name
+            if simplify_tolerance is not None:
+                if float(simplify_tolerance) < 0:
+                    raise ValueError("simplify_tolerance must not be negative")
+                geom = "{}.Reduce(:simplify_tolerance)".format(s_col_name)
+            if geometry_format == 'wkb':
+                col_names_s = "{0}.STAsBinary() as Shape, {1}.STSrid as SRID".format(geom, s_col_name)
+            elif geometry_format == 'wkt':
+                col_names_s = "{}.STAsText() as Shape".format(geom)
+            else:
+                raise ValueError("geometry_format must be 'wkb' or 'wkt'")
+            if geometry_stats:
+                # WKT is measured in characters, to match the length of the strings received
+                size = "DATALENGTH({}.STAsBinary())" if geometry_format == 'wkb' else "LEN({}.STAsText())"
+                col_names_s += ", {}.STNumPoints() as SourceVertices, {} as SourceBytes".format(
+                    s_col_name, size.format(s_col_name))
+            if columns is None:
+                columns = tbl['columns']
+            else:
+                known = {col.lower(): col for col in tbl['columns']}
+                missing = [col for col in columns if col.lower() not in known]
+                if missing:
+                    raise ValueError("{}.{} has no column(s) {}".format(schema_name, tbl_name, ', '.join(missing)))
+                columns = [known[col.lower()] for col in columns]
+            col_names = ', '.join(list(columns) + [col_names_s])
+            ret_str = "SELECT  {col_names} FROM {schema_name}.{tbl_name}".format(
+                col_names=col_names,
                 schema_name=schema_name,
                 tbl_name=tbl_name
             )
+            conditions = []
+            if where:
+                conditions.append("({})".format(where))
+            if spatial_filter:
+                if tbl['spatial_columns'][0][1] != 'geometry':
+                    raise ValueError("bbox and mask filters need a geometry column")
+                conditions.append("{}.STIntersects(geometry::STGeomFromText(:filter_wkt, {})) = 1".format(
+                    s_col_name, self.layer_srid))
+            if conditions:
+                ret_str += " WHERE " + " AND ".join(conditions)
             return(ret_str)
         
         except Exception as e:
@@ -261,17 +1044,43 @@ class ElmerGeoConn(Connection):
             raise
 
 
-    def sql_to_gdf(self, sql):
+    def _frame_to_gdf(self, df, geometry_format):
+        import geopandas as gpd
+        import shapely
+        from shapely import wkt
+        with self.instrumentation.phase('geometry_decode'):
+            if geometry_format == 'wkb':
+                df['geometry'] = shapely.from_wkb(df['Shape'].to_numpy(dtype=object)) if len(df) > 0 else None
+            elif geometry_format == 'wkt':
+                df['geometry'] = df['Shape'].apply(wkt.loads) if len(df) > 0 else None
+            else:
+                raise ValueError("geometry_format must be 'wkb' or 'wkt'")
+        with self.instrumentation.phase('frame_build'):
+            srids = []
+            if 'SRID' in df.columns:
+                srids = [int(srid) for srid in df['SRID'].dropna().unique()]
+                df = df.drop(columns='SRID')
+            gdf = gpd.GeoDataFrame(df, geometry='geometry')
+            gdf.attrs['srid'] = srids
+        return(gdf)
+
+
+    def sql_to_gdf(self, sql, geometry_format='wkt', params=None):
         """Create a geodataframe from a SQL query
         
-        The SQL must define a Shape column that is a WKT representation of a geometry data type
+        The SQL must define a Shape column that is a WKT representation of a geometry data type,
+        or a WKB representation if geometry_format is 'wkb'.  WKB is decoded for the whole column 
+        in one vectorized call.  If the SQL also defines an SRID column, its distinct values are 
+        kept in gdf.attrs['srid'] and the column is dropped.  Values for named placeholders 
+        in the SQL can be passed in params.
         
         """
         try: 
-            # df = pd.read_sql(sql, self.engine)
-            df = self.get_query(sql)
-            df['geometry'] = df['Shape'].apply(wkt.loads)
-            gdf = gpd.GeoDataFrame(df, geometry='geometry')
+            with self.instrumentation.record('sql_to_gdf', sql) as rec:
+                # df = pd.read_sql(sql, self.engine)
+                df = self.get_query(sql, params=params)
+                gdf = self._frame_to_gdf(df, geometry_format)
+                rec.set_result(gdf)
             return(gdf)
 
         
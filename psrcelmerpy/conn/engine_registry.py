@@ -0,0 +1,186 @@
+import os
+import threading
+import urllib
+import warnings
+import sqlalchemy
+
+def odbc_connection_string(server_name, database_name, driver_name):
+    """Return the ODBC connection string for a database, using Windows authentication."""
+    conn_string = "DRIVER={}; SERVER={}; DATABASE={}; trusted_connection=yes".format(
+        driver_name,
+        server_name,
+        database_name
+        )
+    return(conn_string)
+
+
+class EngineRegistry:
+    """A process-wide collection of SQLAlchemy engines, one per (server, database, driver).
+
+    Connections that point at the same database share one engine, and so one
+    connection pool, instead of paying for a new ODBC login on every instance.
+    The pool settings of the first request for a key are the ones that are used;
+    a later request with different settings gets the same engine and a warning.
+    In a forked child process the engines are kept but their pools are emptied,
+    so the child opens its own connections.
+    """
+
+    def __init__(self):
+        self._engines = {}
+        self._stats = {}
+        self._settings = {}
+        self._lock = threading.Lock()
+
+    def get_engine(self, server_name, database_name, driver_name,
+                   pool_size=5, max_overflow=10, pool_recycle=3600, pool_timeout=30, login_timeout=None):
+        """Return the shared engine for a database, creating it on first use.
+
+        Parameters
+        ----------
+        server_name : str
+            The name of the SQL Server instance
+        database_name : str
+            The name of the database
+        driver_name : str
+            The name of the ODBC driver
+        pool_size : int
+            The number of connections kept open in the pool (Default value = 5)
+        max_overflow : int
+            The number of connections allowed beyond pool_size under load (Default value = 10)
+        pool_recycle : int
+            Seconds after which a pooled connection is replaced (Default value = 3600)
+        pool_timeout : int
+            Seconds to wait for a free connection before giving up (Default value = 30)
+        login_timeout : int
+            Seconds to wait for the server when opening a new connection (Default value = the driver's)
+
+        Returns
+        -------
+        engine : sqlalchemy.engine.Engine
+        """
+        try:
+            key = (server_name, database_name, driver_name)
+            settings = {'pool_size': pool_size, 'max_overflow': max_overflow, 'pool_recycle': pool_recycle,
+                        'pool_timeout': pool_timeout, 'login_timeout': login_timeout}
+            with self._lock:
+                if key in self._engines and settings != self._settings[key]:
+                    differences = ', '.join("{}={!r} (not {!r})".format(name, value, settings[name])
+                                            for name, value in self._settings[key].items()
+                                            if value != settings[name])
+                    warnings.warn("the shared engine for {} on {} was created with {}; those settings are "
+                                  "kept".format(database_name, server_name, differences), stacklevel=2)
+                if key not in self._engines:
+                    conn_string = odbc_connection_string(server_name, database_name, driver_name)
+                    params = urllib.parse.quote_plus(conn_string)
+                    # pyodbc's timeout keyword is the login timeout (SQL_ATTR_LOGIN_TIMEOUT)
+                    connect_args = {'timeout': int(login_timeout)} if login_timeout is not None else {}
+                    engine = sqlalchemy.create_engine("mssql+pyodbc:///?odbc_connect=%s" % params,
+                                                      pool_size=pool_size,
+                                                      max_overflow=max_overflow,
+                                                      pool_recycle=pool_recycle,
+                                                      pool_timeout=pool_timeout,
+                                                      pool_pre_ping=True,
+                                                      fast_executemany=True,
+                                                      connect_args=connect_args)
+                    self._engines[key] = engine
+                    self._settings[key] = settings
+                    self._stats[key] = {'connects': 0, 'checkouts': 0, 'checkins': 0}
+                    self._add_listeners(engine, self._stats[key])
+                return(self._engines[key])
+
+        except Exception as e:
+            print("An error happened in get_engine(): {}".format(e.args[0]))
+            raise
+
+    def _add_listeners(self, engine, counts):
+        def on_connect(dbapi_connection, connection_record):
+            counts['connects'] += 1
+
+        def on_checkout(dbapi_connection, connection_record, connection_proxy):
+            counts['checkouts'] += 1
+
+        def on_checkin(dbapi_connection, connection_record):
+            counts['checkins'] += 1
+
+        sqlalchemy.event.listen(engine, 'connect', on_connect)
+        sqlalchemy.event.listen(engine, 'checkout', on_checkout)
+        sqlalchemy.event.listen(engine, 'checkin', on_checkin)
+
+    def pool_stats(self, server_name=None, database_name=None, driver_name=None):
+        """Return connection pool statistics for the registered engines.
+
+        Parameters
+        ----------
+        server_name, database_name, driver_name : str
+            If supplied, only engines matching these values are reported. (Default value = None)
+
+        Returns
+        -------
+        stats : list of dict
+            One dict per engine, with the pool configuration, the number of new
+            logins ('connects'), checkouts and checkins, the connections currently
+            checked out, and 'reuse_rate', the share of checkouts served by an
+            already open connection.
+        """
+        try:
+            stats = []
+            with self._lock:
+                for key, engine in self._engines.items():
+                    if any(want is not None and want != have
+                           for want, have in zip((server_name, database_name, driver_name), key)):
+                        continue
+                    counts = dict(self._stats[key])
+                    checkouts = counts['checkouts']
+                    reuse_rate = (checkouts - counts['connects']) / checkouts if checkouts > 0 else None
+                    pool = engine.pool
+                    stats.append({'server_name': key[0],
+                                  'database_name': key[1],
+                                  'driver_name': key[2],
+                                  'pool_size': pool.size() if hasattr(pool, 'size') else None,
+                                  'checked_out': pool.checkedout() if hasattr(pool, 'checkedout') else None,
+                                  'overflow': pool.overflow() if hasattr(pool, 'overflow') else None,
+                                  **counts,
+                                  'reuse_rate': reuse_rate})
+            return(stats)
+
+        except Exception as e:
+            print("An error happened in pool_stats(): {}".format(e.args[0]))
+            raise
+
+    def dispose(self):
+        """Close every pooled connection and forget all registered engines."""
+        try:
+            with self._lock:
+                for engine in self._engines.values():
+                    engine.dispose()
+                self._engines.clear()
+                self._stats.clear()
+                self._settings.clear()
+
+        except Exception as e:
+            print("An error happened in dispose(): {}".format(e.args[0]))
+            raise
+
+
+    def _after_fork_in_child(self):
+        # a forked child inherits the parent's pooled connections, whose sockets 
+        # it must never use (or close); give every engine a fresh, empty pool
+        self._lock = threading.Lock()
+        for key, engine in self._engines.items():
+            engine.dispose(close=False)
+            self._stats[key].update(connects=0, checkouts=0, checkins=0)
+
+
+registry = EngineRegistry()
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=registry._after_fork_in_child)
+
+
+def pool_stats():
+    """Return connection pool statistics for every engine in the process-wide registry."""
+    return(registry.pool_stats())
+
+
+def dispose_engines():
+    """Close the pooled connections of every engine in the process-wide registry."""
+    registry.dispose()
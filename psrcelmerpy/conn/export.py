@@ -0,0 +1,153 @@
+import bz2
+import gzip
+import json
+import lzma
+import os
+import pandas as pd
+
+FORMATS = ('parquet', 'csv')
+CSV_COMPRESSIONS = {None: open, 'gzip': gzip.open, 'bz2': bz2.open, 'xz': lzma.open}
+
+
+class ChunkWriter:
+    """Write a stream of data frames (or pyarrow Tables) to one file.
+
+    The file is written under a temporary name and moved into place by close(),
+    so a failed export never leaves a partial file at path.  Writing an empty 
+    chunk gives the file its columns even when there are no rows to write.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.tmp_path = "{}.{}.tmp".format(path, os.getpid())
+        self.rows = 0
+        self.batches = 0
+
+    def write(self, chunk):
+        self._write(chunk)
+        self.rows += len(chunk)
+        self.batches += 1
+
+    def close(self):
+        """Finish the file and return its size in bytes."""
+        if self.batches == 0:
+            self._write_empty()
+        self._close()
+        os.replace(self.tmp_path, self.path)
+        return(os.path.getsize(self.path))
+
+    def abort(self):
+        try:
+            self._close()
+        except Exception:
+            pass
+        if os.path.exists(self.tmp_path):
+            os.remove(self.tmp_path)
+
+
+class ParquetChunkWriter(ChunkWriter):
+    """Write each chunk as a row group of a Parquet file.
+
+    The file's schema is taken from the first chunk.  A column that is entirely
+    NULL in the first chunk (so has no type yet) is written as text, or as 
+    binary if it is a WKB geometry column named in the GeoParquet metadata.
+    """
+
+    def __init__(self, path, compression='snappy', metadata=None):
+        super().__init__(path)
+        self.compression = 'none' if compression is None else compression
+        self.metadata = metadata
+        self._writer = None
+
+    def _to_table(self, chunk):
+        import pyarrow as pa
+        if isinstance(chunk, pd.DataFrame):
+            return(pa.Table.from_pandas(chunk, preserve_index=False))
+        return(chunk)
+
+    def _open(self, table):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+        schema = table.schema
+        metadata = dict(schema.metadata or {})
+        metadata.update(self.metadata or {})
+        geometry_columns = json.loads(metadata[b'geo'])['columns'] if b'geo' in metadata else {}
+        for i, field in enumerate(schema):
+            if pa.types.is_null(field.type):
+                schema = schema.set(i, field.with_type(pa.binary() if field.name in geometry_columns
+                                                       else pa.string()))
+        schema = schema.with_metadata(metadata)
+        self._writer = pq.ParquetWriter(self.tmp_path, schema, compression=self.compression)
+
+    def _write(self, chunk):
+        table = self._to_table(chunk)
+        if self._writer is None:
+            self._open(table)
+        schema = self._writer.schema
+        if not table.schema.equals(schema, check_metadata=False):
+            table = table.select(schema.names).cast(schema)
+        self._writer.write_table(table)
+
+    def _write_empty(self):
+        import pyarrow as pa
+        self._open(pa.table({}))
+
+    def _close(self):
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+
+
+class CsvChunkWriter(ChunkWriter):
+    """Append each chunk to a CSV file, with the header written once (from the first chunk, even if it is empty)."""
+
+    def __init__(self, path, compression=None):
+        super().__init__(path)
+        if compression not in CSV_COMPRESSIONS:
+            raise ValueError("compression for csv must be one of None, 'gzip', 'bz2' or 'xz'")
+        self._file = CSV_COMPRESSIONS[compression](self.tmp_path, 'wt', newline='', encoding='utf-8')
+
+    def _write(self, chunk):
+        if not isinstance(chunk, pd.DataFrame):
+            chunk = chunk.to_pandas()
+        chunk.to_csv(self._file, header=self.batches == 0, index=False)
+
+    def _write_empty(self):
+        pass
+
+    def _close(self):
+        if not self._file.closed:
+            self._file.close()
+
+
+def open_writer(path, format='parquet', compression='default', metadata=None):
+    """Return a ChunkWriter for an export file.
+
+    Parameters
+    ----------
+    path : str
+        The file to write
+    format : str
+        'parquet' or 'csv' (Default value = 'parquet')
+    compression : str
+        For Parquet, a codec such as 'snappy', 'zstd', 'gzip' or None; for CSV, None, 'gzip',
+        'bz2' or 'xz'. (Default value = 'snappy' for Parquet, None for CSV)
+    metadata : dict
+        Schema metadata for a Parquet file (bytes keys and values). (Default value = None)
+    """
+    if format == 'parquet':
+        return(ParquetChunkWriter(path, 'snappy' if compression == 'default' else compression, metadata))
+    if format == 'csv':
+        return(CsvChunkWriter(path, None if compression == 'default' else compression))
+    raise ValueError("format must be one of {}".format(', '.join("'{}'".format(f) for f in FORMATS)))
+
+
+def geoparquet_metadata(crs, geometry_column='geometry'):
+    """Return the 'geo' schema metadata that marks a Parquet file as GeoParquet, for WKB geometries in crs."""
+    from pyproj import CRS
+    geo = {'version': '1.0.0',
+           'primary_column': geometry_column,
+           'columns': {geometry_column: {'encoding': 'WKB',
+                                         'geometry_types': [],
+                                         'crs': CRS.from_user_input(crs).to_json_dict()}}}
+    return({b'geo': json.dumps(geo).encode('utf-8')})
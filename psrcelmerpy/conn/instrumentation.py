@@ -0,0 +1,211 @@
+import collections
+import contextlib
+import itertools
+import threading
+import time
+import pandas as pd
+from .timeouts import QueryCancelled
+
+class QueryRecord:
+    """Timings and sizes for one call to a Connection method.
+
+    Phase timings of nested calls (for example the get_query inside sql_to_gdf)
+    are added to their parent's phases when they finish, so the outermost record
+    of a call shows where all of its time went.
+    """
+
+    _ids = itertools.count(1)
+
+    def __init__(self, instrumentation, method, sql=None, parent=None):
+        self.instrumentation = instrumentation
+        self.id = next(self._ids)
+        self.method = method
+        self.sql = sql
+        self.parent = parent
+        self.phases = collections.OrderedDict()
+        self.rows = None
+        self.bytes = None
+        self.error = None
+        self.cancelled = None
+        self.started = time.time()
+        self._start = time.perf_counter()
+        self.duration = None
+
+    @contextlib.contextmanager
+    def phase(self, name):
+        """Time the enclosed block and add it to this record's phase `name`."""
+        start = time.perf_counter()
+        try:
+            yield self
+        finally:
+            self.add_phase(name, time.perf_counter() - start)
+
+    def add_phase(self, name, seconds):
+        with self.instrumentation._lock:
+            self.phases[name] = self.phases.get(name, 0.0) + seconds
+
+    def set_result(self, df):
+        """Record the number of rows and approximate in-memory bytes of a result."""
+        self.rows, self.bytes = None, None
+        self.add_result(df)
+
+    def add_result(self, df):
+        """Add the rows and approximate in-memory bytes of a result (or one chunk of it).
+
+        Bytes are only measured for an outermost record; a nested call's result is 
+        usually part of its parent's, and measuring it again costs time at every level.
+        """
+        try:
+            self.rows = (self.rows or 0) + len(df)
+            measure_bytes = self.instrumentation.measure_bytes
+            if measure_bytes and self.parent is None:
+                if hasattr(df, 'memory_usage'):
+                    nbytes = int(df.memory_usage(index=False, deep=measure_bytes == 'deep').sum())
+                else:
+                    nbytes = int(df.nbytes)
+                self.bytes = (self.bytes or 0) + nbytes
+        except Exception:
+            pass
+
+    def as_dict(self):
+        return({'id': self.id,
+                'method': self.method,
+                'sql': self.sql,
+                'parent': self.parent.id if self.parent is not None else None,
+                'started': self.started,
+                'duration': self.duration,
+                'phases': dict(self.phases),
+                'rows': self.rows,
+                'bytes': self.bytes,
+                'error': self.error,
+                'cancelled': self.cancelled})
+
+
+class Instrumentation:
+    """Collects a QueryRecord for every instrumented call on a connection.
+
+    Finished records are kept in memory (the most recent ``max_records``) and
+    passed, as dicts, to every registered hook so they can be forwarded to an
+    external metrics system.  Errors raised by hooks are printed and ignored.
+
+    ``measure_bytes`` is 'shallow' (the default: column buffers, with 8 bytes per 
+    Python object, which is nearly free), 'deep' (also the size of every string 
+    and other object in the result, which takes about a second per million rows of 
+    a few text columns) or False.
+    """
+
+    def __init__(self, max_records=1000, measure_bytes='shallow'):
+        if measure_bytes not in (False, None, 'shallow', 'deep'):
+            raise ValueError("measure_bytes must be 'shallow', 'deep' or False")
+        self.hooks = []
+        self.records = collections.deque(maxlen=max_records)
+        self.measure_bytes = measure_bytes
+        self._lock = threading.RLock()
+        self._local = threading.local()
+
+    def add_hook(self, hook):
+        """Call hook(record) with a dict describing each finished call."""
+        self.hooks.append(hook)
+
+    def remove_hook(self, hook):
+        self.hooks.remove(hook)
+
+    def _stack(self):
+        if not hasattr(self._local, 'stack'):
+            self._local.stack = []
+        return(self._local.stack)
+
+    def current(self):
+        """Return the innermost active record on this thread, or None."""
+        stack = self._stack()
+        return(stack[-1] if stack else None)
+
+    def start(self, method, sql=None, parent=None):
+        """Begin a record that is not tied to the current thread (e.g. for a generator)."""
+        return(QueryRecord(self, method, sql, parent=parent))
+
+    @contextlib.contextmanager
+    def record(self, method, sql=None, parent=None):
+        """Make a new record the active one on this thread for the enclosed block."""
+        rec = self.start(method, sql, parent=parent if parent is not None else self.current())
+        stack = self._stack()
+        stack.append(rec)
+        try:
+            yield rec
+        except BaseException as e:
+            rec.error = "{}: {}".format(type(e).__name__, e)
+            if isinstance(e, QueryCancelled):
+                rec.cancelled = e.reason
+            raise
+        finally:
+            stack.pop()
+            self.finish(rec)
+
+    @contextlib.contextmanager
+    def phase(self, name):
+        """Time the enclosed block as phase `name` of the active record, if there is one."""
+        rec = self.current()
+        if rec is None:
+            yield None
+        else:
+            with rec.phase(name):
+                yield rec
+
+    def finish(self, rec):
+        """Close a record, roll its phases up into its parent and notify the hooks."""
+        rec.duration = time.perf_counter() - rec._start
+        if rec.parent is not None:
+            for name, seconds in rec.phases.items():
+                rec.parent.add_phase(name, seconds)
+        record = rec.as_dict()
+        with self._lock:
+            self.records.append(record)
+        for hook in list(self.hooks):
+            try:
+                hook(record)
+            except Exception as e:
+                print("An error happened in a query hook: {}".format(e))
+
+    def summary(self):
+        """Summarize the recorded calls by method.
+
+        Returns
+        -------
+        df : A pandas dataframe
+            One row per method with the number of calls, errors and cancelled calls, total and
+            maximum duration, total rows and bytes, and the total seconds spent
+            in each phase (phase columns are prefixed with 'phase_').
+        """
+        with self._lock:
+            records = list(self.records)
+        if len(records) == 0:
+            return(pd.DataFrame())
+        rows = []
+        for record in records:
+            row = {'method': record['method'],
+                   'duration': record['duration'],
+                   'rows': record['rows'],
+                   'bytes': record['bytes'],
+                   'error': record['error'] is not None,
+                   'cancelled': record.get('cancelled') is not None}
+            for name, seconds in record['phases'].items():
+                row['phase_' + name] = seconds
+            rows.append(row)
+        df = pd.DataFrame(rows)
+        grouped = df.groupby('method')
+        summary = pd.DataFrame({'calls': grouped.size(),
+                                'errors': grouped['error'].sum(),
+                                'cancelled': grouped['cancelled'].sum(),
+                                'total_seconds': grouped['duration'].sum(),
+                                'max_seconds': grouped['duration'].max(),
+                                'rows': grouped['rows'].sum(),
+                                'bytes': grouped['bytes'].sum()})
+        phase_cols = [col for col in df.columns if col.startswith('phase_')]
+        if phase_cols:
+            summary = summary.join(grouped[phase_cols].sum())
+        return(summary.reset_index())
+
+    def reset(self):
+        """Forget all recorded calls."""
+        with self._lock:
+            self.records.clear()
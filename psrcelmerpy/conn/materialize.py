@@ -0,0 +1,115 @@
+import datetime
+import decimal
+import numpy as np
+import pandas as pd
+
+def build_frame(rows, description, columns=None, decimal_as='float', text_as=None, category_threshold=0.5):
+    """Build a data frame column by column, with dtypes taken from a DBAPI cursor description.
+
+    Parameters
+    ----------
+    rows : list
+        The fetched rows (tuples or SQLAlchemy Row objects)
+    description : list
+        The cursor's description; the second item of each entry is the Python type
+        pyodbc returns for the column.  Columns whose type is unknown are left to pandas' inference.
+    columns : list
+        The column names.  If None they are taken from the description. (Default value = None)
+    decimal_as : str
+        'float' to convert DECIMAL/NUMERIC/MONEY columns to float64, or 'decimal' to keep
+        decimal.Decimal objects. (Default value = 'float')
+    text_as : str
+        None to keep pandas' default text dtype, 'category' to make low-cardinality text
+        columns categorical, 'pyarrow' to store text as string[pyarrow], or 'auto' for
+        categorical where the cardinality is low and string[pyarrow] elsewhere. (Default value = None)
+    category_threshold : float
+        The largest share of distinct values for which a text column is considered
+        low-cardinality. (Default value = 0.5)
+
+    Returns
+    -------
+    df : A pandas dataframe
+        Integer columns are int64 (Int64 if they contain NULLs), floats and decimals float64,
+        datetimes datetime64, and bits bool (boolean if they contain NULLs).
+    """
+    if decimal_as not in ('float', 'decimal'):
+        raise ValueError("decimal_as must be 'float' or 'decimal'")
+    if text_as not in (None, 'category', 'pyarrow', 'auto'):
+        raise ValueError("text_as must be None, 'category', 'pyarrow' or 'auto'")
+    if columns is None:
+        columns = [col[0] for col in description]
+    columns = list(columns)
+    type_codes = [col[1] for col in description] if description else [None] * len(columns)
+    values = list(zip(*rows)) if len(rows) > 0 else [() for col in columns]
+    data = {}
+    for i, col_name in enumerate(columns):
+        data[i] = _build_column(list(values[i]), type_codes[i], decimal_as, text_as, category_threshold)
+    df = pd.DataFrame(data)
+    df.columns = columns
+    return(df)
+
+
+def _build_column(values, type_code, decimal_as, text_as, category_threshold):
+    has_nulls = any(value is None for value in values)
+    if type_code is bool:
+        return(pd.array(values, dtype='boolean') if has_nulls else np.array(values, dtype=bool))
+    if type_code is int:
+        return(pd.array(values, dtype='Int64') if has_nulls else np.array(values, dtype=np.int64))
+    if type_code is float:
+        return(np.array(values, dtype=np.float64))
+    if type_code is decimal.Decimal:
+        if decimal_as == 'float':
+            return(np.array(values, dtype=np.float64))
+        return(np.array(values, dtype=object))
+    if type_code is datetime.datetime:
+        try:
+            return(pd.to_datetime(pd.Series(values, dtype=object)))
+        except (ValueError, TypeError):
+            return(np.array(values, dtype=object))
+    if type_code is str:
+        return(_build_text_column(values, text_as, category_threshold))
+    series = pd.Series(values, dtype=object if len(values) == 0 else None)
+    if text_as is not None and pd.api.types.is_string_dtype(series.dtype) and len(values) > 0:
+        return(_build_text_column(values, text_as, category_threshold))
+    return(series)
+
+
+def _build_text_column(values, text_as, category_threshold):
+    if text_as is None:
+        return(pd.Series(values, dtype=None if len(values) > 0 else object))
+    if text_as in ('category', 'auto') and len(values) > 0:
+        distinct = len(set(values))
+        if distinct / len(values) <= category_threshold:
+            return(pd.Categorical(values))
+    if text_as in ('pyarrow', 'auto'):
+        try:
+            return(pd.array(values, dtype='string[pyarrow]'))
+        except ImportError:
+            pass
+    return(pd.Series(values, dtype=None if len(values) > 0 else object))
+
+
+def compact_text(df, text_as, category_threshold=0.5):
+    """Convert the text columns of an existing data frame as build_frame would with text_as.
+
+    Parameters
+    ----------
+    df : A pandas dataframe
+    text_as : str
+        None, 'category', 'pyarrow' or 'auto'; see build_frame.
+    category_threshold : float
+        The largest share of distinct values for a column to be made categorical. (Default value = 0.5)
+
+    Returns
+    -------
+    df : A pandas dataframe
+    """
+    if text_as is None:
+        return(df)
+    for col_name in df.columns:
+        series = df[col_name]
+        if len(series) > 0 and pd.api.types.is_string_dtype(series.dtype) \
+                and series.map(lambda value: isinstance(value, str) or pd.isna(value)).all():
+            values = [None if pd.isna(value) else value for value in series]
+            df[col_name] = _build_text_column(values, text_as, category_threshold)
+    return(df)
@@ -0,0 +1,184 @@
+import collections
+import json
+import re
+import threading
+import time
+
+# T-SQL lets DELETE and INSERT leave out FROM and INTO
+_table_pattern = re.compile(r"\b(?:from|join|into|update|table|merge|(?:delete|insert)(?!\s+(?:from|into)\b))\s+"
+                            r"((?:\[[^\]]+\]|[\w#]+)(?:\s*\.\s*(?:\[[^\]]+\]|[\w#]+))*)",
+                            re.IGNORECASE)
+# statements whose writes cannot be told from their text: procedures, dynamic SQL, and
+# MERGE, which can write through an alias or a CTE
+_unscoped_pattern = re.compile(r"\b(?:exec|execute|sp_executesql|merge)\b", re.IGNORECASE)
+_string_pattern = re.compile(r"'(?:[^']|'')*'")
+
+
+def normalize_sql(sql):
+    """Collapse the whitespace of a SQL statement (outside string literals) and drop a trailing ';'."""
+    parts = []
+    last = 0
+    for match in _string_pattern.finditer(sql):
+        parts.append(re.sub(r"\s+", " ", sql[last:match.start()]))
+        parts.append(match.group(0))
+        last = match.end()
+    parts.append(re.sub(r"\s+", " ", sql[last:]))
+    return(''.join(parts).strip().rstrip(';').strip())
+
+
+def table_refs(sql):
+    """Return the tables a statement names after FROM, JOIN, INTO, UPDATE, DELETE, INSERT, TABLE or MERGE.
+
+    Returns
+    -------
+    refs : set of tuple
+        (schema, table) pairs in lower case; schema is None when the statement does not give one
+    """
+    refs = set()
+    for match in _table_pattern.finditer(_string_pattern.sub("''", sql)):
+        names = [name.strip().strip('[]').lower() for name in match.group(1).split('.')]
+        refs.add((names[-2] if len(names) > 1 else None, names[-1]))
+    return(refs)
+
+
+def _refs_overlap(refs, other_refs):
+    for schema, table in refs:
+        for other_schema, other_table in other_refs:
+            if table == other_table and (schema is None or other_schema is None or schema == other_schema):
+                return(True)
+    return(False)
+
+
+class QueryMemo:
+    """An in-memory cache of query results, keyed by normalized SQL and parameters.
+
+    Entries expire after their time-to-live, and the least recently used are
+    evicted to keep the total (approximate) size of the cached results within
+    ``max_bytes``.  Each entry remembers the tables its query reads, so writes to
+    a table can drop just the results that depend on it.
+    """
+
+    def __init__(self, ttl=300, max_bytes=256 * 1024 ** 2):
+        """
+        Parameters
+        ----------
+        ttl : int
+            Seconds an entry is kept, unless set() is given another ttl. (Default value = 300)
+        max_bytes : int
+            The total in-memory size the cached results may use. (Default value = 256 MB)
+        """
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._entries = collections.OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(sql, params=None, *options):
+        """Build a key from a query's normalized SQL, its parameters and any options that change the result."""
+        params = sorted((str(name), repr(value)) for name, value in (params or {}).items())
+        return(json.dumps([normalize_sql(sql), params, [str(option) for option in options]]))
+
+    @staticmethod
+    def _copy(value):
+        return(value.copy() if hasattr(value, 'copy') else value)
+
+    @staticmethod
+    def _size(value):
+        try:
+            if hasattr(value, 'memory_usage'):
+                return(int(value.memory_usage(index=True, deep=True).sum()))
+            return(int(value.nbytes))
+        except Exception:
+            return(0)
+
+    def get(self, key):
+        """Return (True, a copy of the cached result) for a live entry, or (False, None)."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and time.monotonic() > entry['expires']:
+                self._drop(key)
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return(False, None)
+            self._entries.move_to_end(key)
+            self.hits += 1
+            value = entry['value']
+        return(True, self._copy(value))
+
+    def set(self, key, value, sql, ttl=None):
+        """Cache a result.  Results larger than max_bytes on their own are not cached."""
+        size = self._size(value)
+        if size > self.max_bytes:
+            return
+        ttl = self.ttl if ttl is None else ttl
+        with self._lock:
+            if key in self._entries:
+                self._drop(key)
+            self._entries[key] = {'value': self._copy(value),
+                                  'bytes': size,
+                                  'expires': time.monotonic() + ttl,
+                                  'tables': table_refs(sql)}
+            self._bytes += size
+            while self._bytes > self.max_bytes and self._entries:
+                self._drop(next(iter(self._entries)))
+
+    def _drop(self, key):
+        entry = self._entries.pop(key)
+        self._bytes -= entry['bytes']
+
+    def invalidate(self, key=None):
+        """Drop the entry for key, or every entry if key is None."""
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+                self._bytes = 0
+            elif key in self._entries:
+                self._drop(key)
+
+    def invalidate_tables(self, sql):
+        """Drop every entry whose query reads a table named in sql (e.g. a statement that modified it).
+
+        A statement that names no table, or whose writes cannot be told from its text 
+        (EXEC of a procedure, dynamic SQL, MERGE), drops every entry.
+
+        Returns
+        -------
+        dropped : int
+            The number of entries dropped
+        """
+        refs = table_refs(sql)
+        if len(refs) == 0 or _unscoped_pattern.search(_string_pattern.sub("''", sql)):
+            with self._lock:
+                dropped = len(self._entries)
+                self._entries.clear()
+                self._bytes = 0
+            return(dropped)
+        return(self._invalidate_refs(refs))
+
+    def invalidate_table(self, table_name, schema=None):
+        """Drop every entry whose query reads schema.table_name (or table_name in any schema)."""
+        return(self._invalidate_refs({(schema.lower() if schema else None, table_name.lower())}))
+
+    def _invalidate_refs(self, refs):
+        with self._lock:
+            keys = [key for key, entry in self._entries.items() if _refs_overlap(refs, entry['tables'])]
+            for key in keys:
+                self._drop(key)
+        return(len(keys))
+
+    def stats(self):
+        """Return the number of entries, bytes used, and hit/miss counts."""
+        with self._lock:
+            return({'entries': len(self._entries),
+                    'bytes': self._bytes,
+                    'max_bytes': self.max_bytes,
+                    'hits': self.hits,
+                    'misses': self.misses})
+
+    def __len__(self):
+        with self._lock:
+            return(len(self._entries))
@@ -0,0 +1,53 @@
+from concurrent.futures import ProcessPoolExecutor
+import functools
+
+# the connection each worker process was started with; it is unpickled (or
+# inherited through fork) once per worker and builds its own engine on first use
+_worker_conn = None
+
+
+def _init_worker(conn):
+    global _worker_conn
+    _worker_conn = conn
+
+
+def _call(fn, kwargs, item):
+    if isinstance(fn, str):
+        return(getattr(_worker_conn, fn)(item, **kwargs))
+    return(fn(_worker_conn, item, **kwargs))
+
+
+def process_map(conn, fn, items, max_workers=None, kwargs=None, mp_context=None, chunksize=1):
+    """Map a function over a list of queries, tables or layers in a pool of worker processes.
+
+    Each worker gets its own copy of the connection, with its own engine and
+    connection pool, so CPU-heavy work on the results runs on several cores.
+
+    Parameters
+    ----------
+    conn : Connection
+        The connection the workers use.  It must be picklable, so not one built on an engine that was passed in.
+    fn : callable or str
+        A function called as fn(conn, item, **kwargs), which must be defined at the top level
+        of a module so it can be pickled; or the name of a connection method, called as
+        conn.<fn>(item, **kwargs), e.g. 'get_query' or 'read_geolayer'
+    items : iterable
+        The SQL statements, layer names, counties, ... to map over
+    max_workers : int
+        The number of worker processes (Default value = the number of CPUs)
+    kwargs : dict
+        Keyword arguments passed to every call (Default value = None)
+    mp_context : multiprocessing context
+        e.g. multiprocessing.get_context('spawn') (Default value = the platform default)
+    chunksize : int
+        The number of items sent to a worker at a time (Default value = 1)
+
+    Returns
+    -------
+    results : list
+        The results in the order of items
+    """
+    call = functools.partial(_call, fn, kwargs or {})
+    with ProcessPoolExecutor(max_workers=max_workers, mp_context=mp_context,
+                             initializer=_init_worker, initargs=(conn,)) as executor:
+        return(list(executor.map(call, items, chunksize=chunksize)))
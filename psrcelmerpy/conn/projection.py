@@ -0,0 +1,124 @@
+from concurrent.futures import ThreadPoolExecutor
+import os
+import threading
+import numpy as np
+# pyproj and shapely are imported inside the functions, like the rest of the
+# geospatial stack, so that importing psrcelmerpy stays cheap
+
+_local = threading.local()
+
+
+def get_transformer(from_crs, to_crs):
+    """Return a pyproj Transformer from one CRS to another, reused across calls.
+
+    Building a transformer means searching the PROJ database, which costs more than
+    transforming a small layer.  Transformers are not thread-safe, so each thread
+    keeps its own.
+
+    Parameters
+    ----------
+    from_crs, to_crs : str or pyproj.CRS
+        Anything pyproj.CRS.from_user_input accepts, e.g. 'EPSG:2285'
+
+    Returns
+    -------
+    transformer : pyproj.Transformer
+        With always_xy=True, so coordinates are (x, y) / (lon, lat) like geopandas uses
+    """
+    from pyproj import Transformer
+    transformers = getattr(_local, 'transformers', None)
+    if transformers is None:
+        transformers = _local.transformers = {}
+    key = (from_crs, to_crs)
+    if key not in transformers:
+        transformers[key] = Transformer.from_crs(from_crs, to_crs, always_xy=True)
+    return(transformers[key])
+
+
+def _transform_chunk(coords, out, from_crs, to_crs):
+    transformer = get_transformer(from_crs, to_crs)
+    if coords.shape[1] == 2:
+        out[:, 0], out[:, 1] = transformer.transform(coords[:, 0], coords[:, 1])
+        return
+    # the 2D geometries among 3D ones have NaN z, which PROJ would turn into NaN x and y
+    flat = np.isnan(coords[:, 2])
+    out[:, 0], out[:, 1], z = transformer.transform(coords[:, 0], coords[:, 1], np.where(flat, 0.0, coords[:, 2]))
+    out[:, 2] = np.where(flat, np.nan, z)
+
+
+def transform_geometries(geometries, from_crs, to_crs, chunksize=250000, max_workers=None):
+    """Transform an array of shapely geometries (2D or 3D) with cached transformers.
+
+    The coordinates of all the geometries are gathered into one array and transformed 
+    in chunks of ``chunksize`` points on a pool of threads (pyproj releases the GIL 
+    while it transforms), each thread with its own transformer.
+
+    Parameters
+    ----------
+    geometries : array-like of shapely geometries
+    from_crs, to_crs : str or pyproj.CRS
+    chunksize : int
+        The number of points transformed per task. (Default value = 250000)
+    max_workers : int
+        The number of threads.  Defaults to the number of CPUs, and one thread is used 
+        when there is a single chunk. (Default value = None)
+
+    Returns
+    -------
+    geometries : numpy array of shapely geometries
+        New geometries, with the z coordinates of 3D ones kept; the ones passed in are not changed
+    """
+    import shapely
+    geometries = np.array(geometries, dtype=object)
+    coords = shapely.get_coordinates(geometries, include_z=bool(shapely.has_z(geometries).any()))
+    out = np.empty_like(coords)
+    starts = range(0, len(coords), chunksize)
+    if len(starts) <= 1 or max_workers == 1:
+        for start in starts:
+            _transform_chunk(coords[start:start + chunksize], out[start:start + chunksize], from_crs, to_crs)
+    else:
+        workers = min(len(starts), max_workers or os.cpu_count() or 1)
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='psrcelmerpy-reproject') as executor:
+            futures = [executor.submit(_transform_chunk, coords[start:start + chunksize],
+                                       out[start:start + chunksize], from_crs, to_crs)
+                       for start in starts]
+            for future in futures:
+                future.result()
+    return(shapely.set_coordinates(geometries, out))
+
+
+def same_crs(crs, other_crs):
+    """Whether two CRS definitions (strings, EPSG codes or pyproj.CRS) are the same."""
+    from pyproj import CRS
+    if crs is None or other_crs is None:
+        return(crs is None and other_crs is None)
+    return(CRS.from_user_input(crs) == CRS.from_user_input(other_crs))
+
+
+def reproject(gdf, to_crs, chunksize=250000, max_workers=None):
+    """Return a copy of a geodataframe with its geometry column in another CRS.
+
+    Does the same as gdf.to_crs(to_crs), but reuses transformers between calls and 
+    transforms large layers on several threads.  If the geodataframe is already in 
+    to_crs it is returned as it is.
+
+    Parameters
+    ----------
+    gdf : A geodataframe with a CRS set
+    to_crs : str or pyproj.CRS
+    chunksize, max_workers : int
+        As for transform_geometries
+
+    Returns
+    -------
+    gdf : A geodataframe
+    """
+    import geopandas as gpd
+    if gdf.crs is None:
+        raise ValueError("the geodataframe has no CRS to reproject from")
+    if same_crs(gdf.crs, to_crs):
+        return(gdf)
+    geometries = transform_geometries(gdf.geometry.array, gdf.crs, to_crs, chunksize, max_workers)
+    gdf = gdf.copy()
+    gdf[gdf.geometry.name] = gpd.GeoSeries(geometries, index=gdf.index, crs=to_crs)
+    return(gdf)
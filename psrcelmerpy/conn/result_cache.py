@@ -0,0 +1,211 @@
+import hashlib
+import json
+import os
+import threading
+import time
+import pandas as pd
+
+class ResultCache:
+    """An on-disk cache of query results stored as Parquet (or GeoParquet) files.
+
+    Each entry remembers a signature of the server object it came from (its
+    modify_date and row count, and those of the objects it depends on).  An entry
+    validated less than ``max_age`` seconds ago is served without contacting the
+    server; after that the signature is re-checked and the entry is dropped if it
+    changed.  The least recently used files are evicted to stay within ``max_bytes``.
+
+    Every entry is a data file plus a small JSON sidecar ({key}.json) holding its 
+    signature.  There is no shared index to read, modify and write back, so several 
+    processes (e.g. the workers of process_map) can use one directory without losing 
+    each other's entries, and eviction, which scans the directory, sees every file.
+    """
+
+    data_extensions = ('.parquet', '.geoparquet')
+
+    def __init__(self, directory=None, max_bytes=2 * 1024 ** 3, max_age=900):
+        """
+        Parameters
+        ----------
+        directory : str
+            Where cache files are kept.  Defaults to $PSRCELMERPY_CACHE_DIR,
+            or ~/.cache/psrcelmerpy if that is not set. (Default value = None)
+        max_bytes : int
+            The total size the cache may use on disk. (Default value = 2 GB)
+        max_age : int
+            Seconds during which a validated entry is served without checking the server. (Default value = 900)
+        """
+        try:
+            if directory is None:
+                directory = os.environ.get('PSRCELMERPY_CACHE_DIR',
+                                           os.path.join(os.path.expanduser('~'), '.cache', 'psrcelmerpy'))
+            self.directory = directory
+            self.max_bytes = max_bytes
+            self.max_age = max_age
+            self.hits = 0
+            self.misses = 0
+            os.makedirs(self.directory, exist_ok=True)
+
+        except Exception as e:
+            print(e.args[0])
+            raise
+
+    @staticmethod
+    def make_key(*parts):
+        """Build a cache key from the parts that identify a result."""
+        return(hashlib.sha1(json.dumps([str(part) for part in parts]).encode('utf-8')).hexdigest())
+
+    def _meta_path(self, key):
+        return(os.path.join(self.directory, key + '.json'))
+
+    def _read_meta(self, key):
+        try:
+            with open(self._meta_path(key), 'r') as f:
+                return(json.load(f))
+        except (OSError, ValueError):
+            return(None)
+
+    def _write_meta(self, key, meta):
+        # written under a name of its own and moved into place, so a reader in 
+        # another thread or process never sees half a file
+        path = self._meta_path(key)
+        tmp_path = "{}.{}.{}.tmp".format(path, os.getpid(), threading.get_ident())
+        with open(tmp_path, 'w') as f:
+            json.dump(meta, f)
+        os.replace(tmp_path, path)
+
+    def _scan(self):
+        """Return the entries on disk: {key: {'files', 'bytes', 'last_access' (the newest mtime)}}."""
+        entries = {}
+        for item in os.scandir(self.directory):
+            key, extension = os.path.splitext(item.name)
+            if extension not in self.data_extensions + ('.json',) or not item.is_file():
+                continue
+            try:
+                stat = item.stat()
+            except OSError:
+                continue
+            entry = entries.setdefault(key, {'files': [], 'bytes': 0, 'last_access': 0.0, 'data': False})
+            entry['files'].append(item.name)
+            entry['bytes'] += stat.st_size
+            entry['last_access'] = max(entry['last_access'], stat.st_mtime)
+            entry['data'] = entry['data'] or extension in self.data_extensions
+        return(entries)
+
+    def _remove(self, files):
+        # the sidecar goes first, so the entry stops being served before its data is deleted
+        for file_name in sorted(files, key=lambda name: not name.endswith('.json')):
+            try:
+                os.remove(os.path.join(self.directory, file_name))
+            except OSError:
+                pass
+
+    def fetch(self, key, fetch_fn, signature_fn, geo=False):
+        """Return a cached result if it is still fresh, otherwise fetch and cache it.
+
+        Parameters
+        ----------
+        key : str
+            The cache key, from make_key()
+        fetch_fn : callable
+            Called with no arguments to get the result from the server on a miss
+        signature_fn : callable
+            Called with no arguments to get the server object's current signature (a string),
+            or None if it cannot be determined, in which case the result is not cached
+        geo : bool
+            Store the result as GeoParquet rather than Parquet (Default value = False)
+
+        Returns
+        -------
+        df : A pandas dataframe (or geodataframe if geo is True)
+        """
+        try:
+            signature = None
+            meta = self._read_meta(key)
+            if meta is not None:
+                fresh = time.time() - meta['validated_at'] <= self.max_age
+                if not fresh:
+                    signature = signature_fn()
+                    fresh = signature is not None and signature == meta['signature']
+                if fresh:
+                    df = self._load(meta, geo)
+                    if df is not None:
+                        try:
+                            if signature is not None:
+                                meta['validated_at'] = time.time()
+                                self._write_meta(key, meta)
+                            else:
+                                # the sidecar's mtime is the entry's last access, for eviction
+                                os.utime(self._meta_path(key))
+                        except OSError:
+                            pass
+                        self.hits += 1
+                        return(df)
+            self.misses += 1
+            if signature is None:
+                signature = signature_fn()
+            df = fetch_fn()
+            if signature is not None:
+                self._store(key, df, signature, geo)
+            return(df)
+
+        except Exception as e:
+            print("An error happened in ResultCache.fetch(): {}".format(e.args[0]))
+            raise
+
+    def _load(self, meta, geo):
+        path = os.path.join(self.directory, meta['file'])
+        try:
+            if geo:
+                import geopandas as gpd
+                return(gpd.read_parquet(path))
+            return(pd.read_parquet(path))
+        except Exception as e:
+            print("Could not read cached result {}: {}".format(path, e))
+            return(None)
+
+    def _store(self, key, df, signature, geo):
+        file_name = key + ('.geoparquet' if geo else '.parquet')
+        path = os.path.join(self.directory, file_name)
+        tmp_path = "{}.{}.{}.tmp".format(path, os.getpid(), threading.get_ident())
+        try:
+            df.to_parquet(tmp_path, index=False)
+            os.replace(tmp_path, path)
+            self._write_meta(key, {'file': file_name,
+                                   'signature': signature,
+                                   'validated_at': time.time()})
+        except Exception as e:
+            print("Could not cache result: {}".format(e))
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            return
+        self._evict()
+
+    def _evict(self):
+        entries = self._scan()
+        total = sum(entry['bytes'] for entry in entries.values())
+        for key in sorted(entries, key=lambda k: entries[k]['last_access']):
+            if total <= self.max_bytes:
+                break
+            total -= entries[key]['bytes']
+            self._remove(entries[key]['files'])
+
+    def invalidate(self, key=None):
+        """Delete the cached result for key, or every cached result if key is None."""
+        try:
+            entries = self._scan()
+            for k in ([key] if key is not None else list(entries)):
+                if k in entries:
+                    self._remove(entries[k]['files'])
+
+        except Exception as e:
+            print("An error happened in ResultCache.invalidate(): {}".format(e.args[0]))
+            raise
+
+    def stats(self):
+        """Return the number of entries, bytes used, and hit/miss counts of this cache."""
+        entries = self._scan()
+        return({'entries': sum(1 for entry in entries.values() if entry['data']),
+                'bytes': sum(entry['bytes'] for entry in entries.values()),
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses})
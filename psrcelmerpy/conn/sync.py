@@ -0,0 +1,60 @@
+import datetime
+import decimal
+import json
+import os
+
+def state_path(path):
+    """The file that holds the sync state of the replica at path."""
+    return("{}.sync.json".format(path))
+
+
+def read_state(path):
+    """Return the saved sync state of a replica, or None if there is none (or it is unreadable)."""
+    try:
+        with open(state_path(path), 'r') as f:
+            state = json.load(f)
+        state['mark'] = decode_mark(state.get('mark'))
+        return(state)
+    except (OSError, ValueError, KeyError, TypeError):
+        return(None)
+
+
+def write_state(path, state):
+    state = dict(state, mark=encode_mark(state.get('mark')))
+    tmp_path = "{}.{}.tmp".format(state_path(path), os.getpid())
+    with open(tmp_path, 'w') as f:
+        json.dump(state, f, indent=1)
+    os.replace(tmp_path, state_path(path))
+
+
+def encode_mark(value):
+    """Turn a high-water mark (rowversion bytes, an integer, a timestamp, ...) into JSON."""
+    if value is None:
+        return(None)
+    if isinstance(value, (bytes, bytearray)):
+        return({'type': 'bytes', 'value': bytes(value).hex()})
+    if isinstance(value, datetime.datetime):
+        return({'type': 'datetime', 'value': value.isoformat()})
+    if isinstance(value, datetime.date):
+        return({'type': 'date', 'value': value.isoformat()})
+    if isinstance(value, decimal.Decimal):
+        return({'type': 'decimal', 'value': str(value)})
+    if isinstance(value, bool) or not isinstance(value, (int, float, str)):
+        raise ValueError("unsupported high-water mark type: {}".format(type(value).__name__))
+    return({'type': type(value).__name__, 'value': value})
+
+
+def decode_mark(encoded):
+    """Reverse encode_mark."""
+    if encoded is None:
+        return(None)
+    kind, value = encoded['type'], encoded['value']
+    if kind == 'bytes':
+        return(bytes.fromhex(value))
+    if kind == 'datetime':
+        return(datetime.datetime.fromisoformat(value))
+    if kind == 'date':
+        return(datetime.date.fromisoformat(value))
+    if kind == 'decimal':
+        return(decimal.Decimal(value))
+    return(value)
@@ -0,0 +1,280 @@
+import contextlib
+import math
+import threading
+import time
+import sqlalchemy
+
+_local = threading.local()
+
+
+class QueryCancelled(Exception):
+    """Raised by a call whose statement was cancelled with Connection.cancel()."""
+
+    def __init__(self, message, reason='cancelled', elapsed=None):
+        super().__init__(message)
+        self.reason = reason
+        self.elapsed = elapsed
+
+
+class QueryTimeout(QueryCancelled, TimeoutError):
+    """Raised by a call whose statement ran past its timeout or its latency budget."""
+
+
+class Deadline:
+    """The time limits of one call, and the statements it has in flight.
+
+    Statements run through a connection's engine while a deadline is active on
+    the thread are registered with it, so that a watchdog timer (or another
+    thread) can cancel them: pyodbc cursors with SQLCancel, SQLite connections
+    with interrupt().  ``timeout`` limits each statement, ``latency_budget`` the
+    whole call.  A deadline made inside another (``parent``) is cancelled with it.
+    """
+
+    def __init__(self, timeout=None, latency_budget=None, method=None, sql=None, parent=None):
+        for name, value in (('timeout', timeout), ('latency_budget', latency_budget)):
+            if value is not None and not value > 0:
+                raise ValueError("{} must be a positive number of seconds".format(name))
+        self.timeout = timeout
+        self.latency_budget = latency_budget
+        self.method = method
+        self.sql = sql
+        self.reason = None
+        self.started = time.time()
+        self._start = time.monotonic()
+        self._cancelled_at = None
+        self._statements = {}
+        self._timer = None
+        self._lock = threading.Lock()
+        self._children = set()
+        self.parent = parent
+        if parent is not None:
+            parent._adopt(self)
+
+    def _adopt(self, child):
+        with self._lock:
+            reason = self.reason
+            if reason is None:
+                self._children.add(child)
+        if reason is not None:
+            child.cancel(reason, report=False)
+
+    def elapsed(self):
+        end = self._cancelled_at if self._cancelled_at is not None else time.monotonic()
+        return(end - self._start)
+
+    def remaining(self):
+        """Seconds left in the latency budget, or None if there is no budget."""
+        if self.latency_budget is None:
+            return(None)
+        return(self.latency_budget - (time.monotonic() - self._start))
+
+    def attach(self, cursor):
+        """Register a statement that is about to run on this thread."""
+        remaining = self.remaining()
+        if self.reason is None and remaining is not None and remaining <= 0:
+            self.cancel('latency_budget')
+        if self.reason is not None:
+            raise self.error()
+        with self._lock:
+            self._statements[threading.get_ident()] = (cursor, time.monotonic())
+            self._arm()
+
+    def release(self, dbapi_connection):
+        """Forget the statements that ran on a connection going back to the pool."""
+        with self._lock:
+            for key, (cursor, started) in list(self._statements.items()):
+                if getattr(cursor, 'connection', None) is dbapi_connection:
+                    del self._statements[key]
+            self._arm()
+
+    def _arm(self):
+        # one timer, set for the earliest limit of the statements in flight
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if self.reason is not None or len(self._statements) == 0:
+            return
+        expiries = []
+        if self.latency_budget is not None:
+            expiries.append(self._start + self.latency_budget)
+        if self.timeout is not None:
+            expiries.append(min(started for cursor, started in self._statements.values()) + self.timeout)
+        if len(expiries) == 0:
+            return
+        self._timer = threading.Timer(max(0.0, min(expiries) - time.monotonic()), self._expire)
+        self._timer.daemon = True
+        self._timer.start()
+
+    def _expire(self):
+        now = time.monotonic()
+        if self.latency_budget is not None and now >= self._start + self.latency_budget:
+            self.cancel('latency_budget')
+            return
+        with self._lock:
+            expired = self.timeout is not None and any(now >= started + self.timeout
+                                                       for cursor, started in self._statements.values())
+            if not expired:
+                self._arm()
+        if expired:
+            self.cancel('timeout')
+
+    def cancel(self, reason='cancelled', report=True):
+        """Cancel the statements in flight, and any the call starts from now on.
+
+        Parameters
+        ----------
+        reason : str
+            'cancelled', 'timeout' or 'latency_budget' (Default value = 'cancelled')
+        report : bool
+            Print what was cancelled, for a timeout or an exhausted budget (Default value = True)
+
+        Returns
+        -------
+        bool
+            False if the call had already been cancelled
+        """
+        with self._lock:
+            if self.reason is not None:
+                return(False)
+            self.reason = reason
+            self._cancelled_at = time.monotonic()
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            statements = list(self._statements.values())
+            children = list(self._children)
+        for cursor, started in statements:
+            cancel_statement(cursor)
+        for child in children:
+            child.cancel(reason, report=False)
+        if report and reason != 'cancelled':
+            print("Cancelled {} after {:.1f} s: {}".format(self.method or 'a query', self.elapsed(), self.describe()))
+            if self.sql is not None:
+                print("The query was: {}".format(self.sql))
+        return(True)
+
+    def describe(self):
+        if self.reason == 'timeout':
+            return("a statement ran past its timeout of {} s".format(self.timeout))
+        if self.reason == 'latency_budget':
+            return("over its latency budget of {} s".format(self.latency_budget))
+        return("cancelled")
+
+    def error(self):
+        """The exception a call cancelled by this deadline raises."""
+        message = "{} cancelled after {:.1f} s".format(self.method or 'query', self.elapsed())
+        if self.reason == 'cancelled':
+            return(QueryCancelled(message, self.reason, self.elapsed()))
+        return(QueryTimeout("{}: {}".format(message, self.describe()), self.reason, self.elapsed()))
+
+    def close(self):
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            self._statements.clear()
+        if self.parent is not None:
+            with self.parent._lock:
+                self.parent._children.discard(self)
+
+    def as_dict(self):
+        return({'method': self.method,
+                'sql': self.sql,
+                'started': self.started,
+                'elapsed': self.elapsed(),
+                'timeout': self.timeout,
+                'latency_budget': self.latency_budget,
+                'statements': len(self._statements),
+                'cancelled': self.reason})
+
+
+def cancel_statement(cursor):
+    """Ask the driver to stop the statement running on a DBAPI cursor; safe to call from any thread."""
+    try:
+        if hasattr(cursor, 'cancel'):
+            cursor.cancel()
+        elif hasattr(getattr(cursor, 'connection', None), 'interrupt'):
+            cursor.connection.interrupt()
+    except Exception as e:
+        print("An error happened in cancel_statement(): {}".format(e))
+
+
+def is_timeout_error(error):
+    """True for the error a driver raises when its own query timeout expires (ODBC SQLSTATE HYT00)."""
+    return('HYT00' in str(error))
+
+
+def _stack():
+    if not hasattr(_local, 'stack'):
+        _local.stack = []
+    return(_local.stack)
+
+
+def current():
+    """Return the deadline active on this thread, or None."""
+    stack = _stack()
+    return(stack[-1] if stack else None)
+
+
+@contextlib.contextmanager
+def bind(deadline):
+    """Make deadline the active one on this thread (e.g. a worker thread of a call) for the enclosed block."""
+    if deadline is None:
+        yield None
+        return
+    stack = _stack()
+    stack.append(deadline)
+    try:
+        yield deadline
+    finally:
+        stack.pop()
+
+
+@contextlib.contextmanager
+def enforce(deadline):
+    """Run the enclosed block under deadline, raising QueryTimeout or QueryCancelled if it is cancelled."""
+    try:
+        with bind(deadline):
+            yield deadline
+    except QueryCancelled:
+        raise
+    except Exception as e:
+        if deadline.reason is None and deadline.timeout is not None and is_timeout_error(e):
+            deadline.reason = 'timeout'
+            deadline._cancelled_at = time.monotonic()
+        if deadline.reason is not None:
+            raise deadline.error() from e
+        raise
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    deadline = current()
+    if deadline is not None:
+        deadline.attach(cursor)
+
+
+def _on_checkout(dbapi_connection, connection_record, connection_proxy):
+    # pyodbc applies its query timeout (SQL_ATTR_QUERY_TIMEOUT) to the cursors
+    # created after it is set, so it is set when the connection is checked out
+    deadline = current()
+    if deadline is not None and deadline.timeout is not None and hasattr(dbapi_connection, 'timeout'):
+        dbapi_connection.timeout = int(math.ceil(deadline.timeout))
+        connection_record.info['psrcelmerpy_timeout'] = True
+
+
+def _on_checkin(dbapi_connection, connection_record):
+    if dbapi_connection is None:
+        return
+    if connection_record.info.pop('psrcelmerpy_timeout', False):
+        dbapi_connection.timeout = 0
+    deadline = current()
+    if deadline is not None:
+        deadline.release(dbapi_connection)
+
+
+def watch(engine):
+    """Add the listeners that register an engine's statements with the active deadline (once per engine)."""
+    if not sqlalchemy.event.contains(engine, 'before_cursor_execute', _before_cursor_execute):
+        sqlalchemy.event.listen(engine, 'before_cursor_execute', _before_cursor_execute)
+        sqlalchemy.event.listen(engine, 'checkout', _on_checkout)
+        sqlalchemy.event.listen(engine, 'checkin', _on_checkin)
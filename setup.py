@@ -14,5 +14,7 @@ setup(
                       #'urllib',
                       'sqlalchemy',
                       'geopandas',
-                      'shapely']
+                      'shapely'],
+    extras_require={'parquet': ['pyarrow'],
+                    'arrow': ['pyarrow', 'arrow-odbc']}
 )
@@ -0,0 +1,70 @@
+import asyncio
+import threading
+import time
+from pytest import raises
+from psrcelmerpy.conn.async_conn import AsyncConnection, gather
+
+class SlowConn:
+    pool_size = 2
+    query_timeout = None
+    latency_budget = None
+
+    def __init__(self):
+        self.running = 0
+        self.most_running = 0
+        self.calls = []
+        self._lock = threading.Lock()
+
+    def get_query(self, sql):
+        with self._lock:
+            self.running += 1
+            self.most_running = max(self.most_running, self.running)
+        time.sleep(0.05)
+        with self._lock:
+            self.running -= 1
+            self.calls.append(sql)
+        return(sql)
+
+def test_queries_run_concurrently_within_the_worker_limit():
+    conn = SlowConn()
+    aconn = AsyncConnection(conn)
+
+    async def main():
+        return(await aconn.gather(*(aconn.get_query(str(i)) for i in range(6))))
+
+    assert asyncio.run(main()) == [str(i) for i in range(6)]
+    assert conn.most_running == 2
+    aconn.close()
+
+def test_gather_limit():
+    conn = SlowConn()
+    aconn = AsyncConnection(conn, max_workers=4)
+
+    async def main():
+        return(await gather(*(aconn.get_query(str(i)) for i in range(4)), limit=1))
+
+    asyncio.run(main())
+    assert conn.most_running == 1
+    aconn.close()
+
+def test_cancelled_queries_are_not_run():
+    conn = SlowConn()
+    aconn = AsyncConnection(conn, max_workers=1)
+
+    async def main():
+        task = asyncio.ensure_future(aconn.gather(*(aconn.get_query(str(i)) for i in range(10)), limit=10))
+        await asyncio.sleep(0.07)
+        task.cancel()
+        with raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(main())
+    time.sleep(0.1)
+    assert len(conn.calls) < 10
+    aconn.close()
+
+def test_chunksize_is_rejected():
+    aconn = AsyncConnection(SlowConn())
+    with raises(ValueError):
+        asyncio.run(aconn.get_table('dbo', 't', chunksize=10))
+    aconn.close()
@@ -0,0 +1,48 @@
+import datetime
+import decimal
+import pandas as pd
+import pyarrow as pa
+from pytest import raises
+from psrcelmerpy.conn.backends import positional_params, resolve_backend, arrow_to_frame, frame_to_arrow
+
+def test_positional_params():
+    sql, values = positional_params("select * from t where a >= :low and b = ':not_a_param' and c < :high",
+                                    {'low': 1, 'high': 10})
+    assert sql == "select * from t where a >= ? and b = ':not_a_param' and c < ?"
+    assert values == ['1', '10']
+
+def test_positional_params_types():
+    sql, values = positional_params("select * from t where rv > :mark and updated >= :since and n = :n",
+                                    {'mark': b'\x00\x00\x00\x00\x00\x00\x07\xd1',
+                                     'since': datetime.datetime(2024, 5, 1, 12, 30, 15, 250000),
+                                     'n': decimal.Decimal('1E+3')})
+    assert sql == ("select * from t where rv > CONVERT(varbinary(max), ?, 2) "
+                   "and updated >= CONVERT(datetime2, ?, 126) and n = CONVERT(decimal(4, 0), ?)")
+    assert values == ['00000000000007d1', '2024-05-01T12:30:15.250000', '1000']
+    assert positional_params("select :d", {'d': datetime.date(2024, 5, 1)}) == \
+        ("select CONVERT(date, ?, 126)", ['2024-05-01'])
+    with raises(TypeError):
+        positional_params("select :x", {'x': [1, 2]})
+
+def test_positional_params_without_params():
+    assert positional_params("select 1", None) == ("select 1", None)
+
+def test_resolve_backend():
+    assert resolve_backend('pyodbc') is None
+    assert resolve_backend(None) is None
+    with raises(ValueError):
+        resolve_backend('turbodbc-please')
+
+def test_arrow_to_frame():
+    table = pa.table({'id': pa.array([1, 2], pa.int64()),
+                      'amount': pa.array([decimal.Decimal('1.50'), None], pa.decimal128(10, 2))})
+    df = arrow_to_frame(table)
+    assert df['amount'].dtype == 'float64'
+    df = arrow_to_frame(table, arrow_dtypes=True, decimal_as='decimal')
+    assert isinstance(df['id'].dtype, pd.ArrowDtype)
+    assert df['amount'][0] == decimal.Decimal('1.50')
+
+def test_frame_to_arrow():
+    table = frame_to_arrow(pd.DataFrame({'id': [1, 2], 'name': ['a', 'b']}))
+    assert table.num_rows == 2
+    assert table.column_names == ['id', 'name']
@@ -0,0 +1,38 @@
+import pandas as pd
+from pytest import raises
+from psrcelmerpy.conn.catalog import CatalogCache, CatalogIndex
+
+def make_index():
+    df = pd.DataFrame({'layer_name': ['micen', 'MICEN_evw', 'urban_centers', 'parcels_2023', 'tracts'],
+                       'feature_dataset': ['Centers', 'Centers', 'Centers', 'Parcels', 'Census'],
+                       'geometry_type': ['esriGeometryPolygon'] * 4 + ['esriGeometryPolyline']})
+    return(CatalogIndex(df, ['layer_name', 'feature_dataset', 'geometry_type']))
+
+def test_find_by_indexed_columns():
+    index = make_index()
+    assert len(index) == 5
+    assert index.find(layer_name='MICEN')['layer_name'].tolist() == ['micen']
+    assert index.find(feature_dataset='centers', geometry_type='esriGeometryPolygon')['layer_name'].tolist() == \
+        ['micen', 'MICEN_evw', 'urban_centers']
+    assert len(index.find(feature_dataset='centers', geometry_type='esriGeometryPolyline')) == 0
+    assert len(index.find(layer_name='', feature_dataset=None)) == 5
+    with raises(ValueError):
+        index.find(nope='x')
+
+def test_search_and_copies():
+    index = make_index()
+    assert index.find(search='CENT')['layer_name'].tolist() == ['urban_centers']
+    assert index.find(search='micen', feature_dataset='Centers')['layer_name'].tolist() == ['micen', 'MICEN_evw']
+    found = index.find(layer_name='tracts')
+    found['layer_name'] = 'changed'
+    assert index.find(layer_name='tracts')['layer_name'].tolist() == ['tracts']
+
+def test_catalog_cache():
+    cache = CatalogCache(ttl=60)
+    cache.set('key', 1)
+    assert cache.get('key') == 1
+    cache.invalidate()
+    assert cache.get('key') is None
+    cache = CatalogCache(ttl=-1)
+    cache.set('key', 1)
+    assert cache.get('key') is None and len(cache) == 0
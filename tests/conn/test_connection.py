@@ -0,0 +1,89 @@
+import multiprocessing
+import os
+import pickle
+import pandas as pd
+import pytest
+import sqlalchemy
+from pytest import raises
+from psrcelmerpy.conn.elmer_conn import ElmerConn
+from psrcelmerpy.conn.engine_registry import registry
+from psrcelmerpy.conn.parallel import process_map
+
+def test_injected_engine():
+    engine = sqlalchemy.create_engine('sqlite://')
+    conn = ElmerConn(engine=engine)
+    assert conn.engine is engine
+    assert conn.pool_stats() == {}
+    conn.execute_sql('create table t (id int, name text)')
+    conn.execute_sql('insert into t values (:id, :name)', params=[{'id': 1, 'name': 'a'}, {'id': 2, 'name': 'b'}])
+    df = conn.get_query('select name from t where id = :id', params={'id': 2})
+    assert df['name'].tolist() == ['b']
+    assert len(conn.get_table('main', 't')) == 2
+
+def sqlite_registry(monkeypatch, tmp_path):
+    engine = sqlalchemy.create_engine('sqlite:///{}'.format(tmp_path / 'elmer.db'))
+    monkeypatch.setattr(registry, 'get_engine', lambda *args, **kwargs: engine)
+    with engine.begin() as connection:
+        connection.exec_driver_sql('create table t (id int)')
+        connection.exec_driver_sql('insert into t values (1), (2), (3)')
+    return(engine)
+
+def count_rows(conn, sql):
+    return(os.getpid(), len(conn.get_query(sql)))
+
+def test_pickle_round_trip(monkeypatch, tmp_path):
+    engine = sqlite_registry(monkeypatch, tmp_path)
+    conn = ElmerConn()
+    conn.enable_memoization(ttl=60)
+    conn.get_query('select * from t')
+    clone = pickle.loads(pickle.dumps(conn))
+    assert '_engine' not in clone.__dict__
+    assert clone.memo is not conn.memo and len(clone.memo) == 0 and clone.memo.ttl == 60
+    assert len(clone.get_query('select * from t')) == 3
+    assert clone.engine is engine
+    with raises(TypeError):
+        pickle.dumps(ElmerConn(engine=engine))
+
+@pytest.mark.skipif(not hasattr(os, 'fork'), reason="needs fork")
+def test_process_map(monkeypatch, tmp_path):
+    sqlite_registry(monkeypatch, tmp_path)
+    conn = ElmerConn()
+    conn.get_query('select 1 as a')
+    context = multiprocessing.get_context('fork')
+    results = conn.process_map(count_rows, ['select * from t', 'select * from t where id > 1'],
+                               max_workers=2, mp_context=context)
+    assert [rows for pid, rows in results] == [3, 2]
+    assert all(pid != os.getpid() for pid, rows in results)
+    frames = process_map(conn, 'get_query', ['select * from t'], max_workers=1, mp_context=context)
+    assert len(frames[0]) == 3
+
+def test_partitioned_text_is_converted_once(tmp_path):
+    conn = ElmerConn(engine=sqlalchemy.create_engine('sqlite:///{}'.format(tmp_path / 'elmer.db')))
+    conn.text_as = 'category'
+    conn.execute_sql('create table t (id int, county text)')
+    conn.execute_sql('insert into t values (:id, :county)',
+                     params=[{'id': i, 'county': 'King' if i < 50 else 'Pierce'} for i in range(100)])
+    fetch_frame = conn._fetch_frame
+    text_options = []
+
+    def spy(*args, **kwargs):
+        text_options.append(conn._frame_options(kwargs.get('text_as'))['text_as'])
+        return(fetch_frame(*args, **kwargs))
+
+    conn._fetch_frame = spy
+    df = conn.get_table('main', 't', partition_column='id', partitions=2, partition_method='minmax')
+    assert text_options[-2:] == [None, None]
+    assert len(df) == 100
+    assert isinstance(df['county'].dtype, pd.CategoricalDtype)
+    assert sorted(df['county'].cat.categories) == ['King', 'Pierce']
+
+def test_partition_column_is_quoted(tmp_path):
+    conn = ElmerConn(engine=sqlalchemy.create_engine('sqlite:///{}'.format(tmp_path / 'elmer.db')))
+    conn.execute_sql('create table t ([order id] int, [select] int)')
+    conn.execute_sql('insert into t values (:id, :id)', params=[{'id': i} for i in range(20)] + [{'id': None}])
+    for column in ('order id', 'select'):
+        for method in ('ntile', 'minmax'):
+            df = conn.get_table('main', 't', parallelism=2, partition_column=column, partitions=3,
+                                partition_method=method)
+            assert len(df) == 21
+            assert sorted(df[column].dropna()) == list(range(20))
@@ -0,0 +1,50 @@
+import datetime
+import geopandas as gpd
+import pandas as pd
+import shapely
+from pytest import raises
+from benchmarks import standin
+from psrcelmerpy.conn.elmer_conn import ElmerConn
+
+def standin_conn(tmp_path):
+    return(ElmerConn(engine=standin.make_engine(str(tmp_path / 'db'))))
+
+def test_stage_table_nulls_and_categories(tmp_path):
+    conn = standin_conn(tmp_path)
+    df = pd.DataFrame({'n': pd.array([1, None, 3], dtype='Int64'),
+                       'when': pd.to_datetime(['2024-01-02 03:04:05', None, '2024-03-04 00:00:00']),
+                       'county': pd.Categorical(['King', 'Pierce', None]),
+                       'note': ['a', None, 'c' * 40]})
+    assert conn.map_sql_types(df) == {'n': 'BIGINT', 'when': 'DATETIME2', 'county': 'NVARCHAR(16)',
+                                      'note': 'NVARCHAR(64)'}
+    stats = conn.stage_table(df, 'nulls', chunksize=2)
+    assert (stats['rows'], stats['batches']) == (3, 2)
+    rows = conn.get_query('select * from stg.nulls')
+    assert rows['n'].tolist()[0] == 1 and pd.isna(rows['n'][1])
+    assert pd.Timestamp(rows['when'][0]) == datetime.datetime(2024, 1, 2, 3, 4, 5) and pd.isna(rows['when'][1])
+    assert rows['county'].tolist()[:2] == ['King', 'Pierce'] and pd.isna(rows['county'][2])
+    assert pd.isna(rows['note'][1]) and rows['note'][2] == 'c' * 40
+
+def test_stage_table_geodataframe_as_wkb(tmp_path):
+    conn = standin_conn(tmp_path)
+    geoms = [shapely.Point(1270000, 220000), None, shapely.box(0, 0, 1, 1)]
+    gdf = gpd.GeoDataFrame({'id': [1, 2, 3]}, geometry=geoms, crs='EPSG:2285')
+    assert conn.map_sql_types(gdf)['geometry'] == 'VARBINARY(max)'
+    conn.stage_table(gdf, 'shapes')
+    rows = conn.get_query('select * from stg.shapes order by id')
+    decoded = shapely.from_wkb(rows['geometry'].to_numpy(dtype=object))
+    assert shapely.equals(decoded[[0, 2]], [geoms[0], geoms[2]]).all()
+    assert decoded[1] is None
+
+def test_stage_table_if_exists(tmp_path):
+    conn = standin_conn(tmp_path)
+    df = pd.DataFrame({'id': [1, 2, 3], 'name': ['a', 'b', None]})
+    conn.stage_table(df, 'modes')
+    with raises(ValueError):
+        conn.stage_table(df, 'modes')
+    conn.stage_table(df, 'modes', if_exists='append')
+    assert len(conn.get_query('select * from stg.modes')) == 6
+    conn.stage_table(df.head(1), 'modes', if_exists='replace')
+    assert conn.get_query('select * from stg.modes')['id'].tolist() == [1]
+    with raises(ValueError):
+        conn.stage_table(df, 'modes', if_exists='truncate')
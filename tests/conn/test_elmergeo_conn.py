@@ -0,0 +1,40 @@
+import numpy as np
+import shapely
+from benchmarks import standin
+from psrcelmerpy.conn.elmergeo_conn import ElmerGeoConn
+
+def standin_conn(tmp_path, rows=50):
+    engine = standin.make_engine(str(tmp_path / 'db'))
+    geoms = standin.add_layer(engine, 'parcels', rows=rows, vertices=8)
+    return(ElmerGeoConn(engine=engine), geoms)
+
+def test_read_geolayer_keeps_only_decoded_geometry(tmp_path):
+    conn, geoms = standin_conn(tmp_path)
+    gdf = conn.read_geolayer('parcels', project_to_wgs84=False)
+    assert 'Shape' not in gdf.columns
+    assert gdf.geometry.name == 'geometry'
+    assert shapely.equals_exact(gdf.geometry.to_numpy(), geoms, tolerance=1e-6).all()
+    gdf = conn.read_geolayer('parcels', simplify_tolerance=10, columns=['OBJECTID'])
+    assert list(gdf.columns) == ['OBJECTID', 'geometry']
+    assert gdf.attrs['geometry_stats']['bytes'] > 0
+
+def test_tiled_read_matches_single_read(tmp_path):
+    conn, geoms = standin_conn(tmp_path, rows=200)
+    whole = conn.read_geolayer('parcels', project_to_wgs84=False)
+    tiled = conn.read_geolayer('parcels', project_to_wgs84=False, tiles=np.int64(3), parallelism=2)
+    assert tiled['OBJECTID'].tolist() == sorted(whole['OBJECTID'])
+    assert tiled.attrs['tile_stats']['tiles'] == 9
+    streamed = list(conn.read_geolayer('parcels', project_to_wgs84=False, tiles=(2, 3), stream=True))
+    ids = [i for gdf in streamed for i in gdf['OBJECTID']]
+    assert sorted(ids) == sorted(whole['OBJECTID']) and len(ids) == len(set(ids))
+
+def test_tiles_reach_past_an_index_extent(tmp_path, monkeypatch):
+    conn, geoms = standin_conn(tmp_path, rows=200)
+    minx, miny, maxx, maxy = shapely.total_bounds(geoms)
+    # a spatial index box that leaves out the edges of the layer
+    inner = (minx + 20000, miny + 20000, maxx - 20000, maxy - 20000)
+    monkeypatch.setattr(conn, 'layer_extent', lambda *args, **kwargs: inner)
+    tiled = conn.read_geolayer('parcels', tiles=2, extent_source='index')
+    assert tiled['OBJECTID'].tolist() == list(range(1, 201))
+    boxed = conn.read_geolayer('parcels', tiles=2, bbox=inner)
+    assert 0 < len(boxed) < 200
@@ -0,0 +1,18 @@
+import warnings
+import pytest
+import sqlalchemy
+from psrcelmerpy.conn import engine_registry
+from psrcelmerpy.conn.engine_registry import EngineRegistry
+
+def test_differing_pool_settings_warn(monkeypatch):
+    # a SQLite engine stands in for mssql+pyodbc, which needs the ODBC driver
+    create_engine = sqlalchemy.create_engine
+    monkeypatch.setattr(engine_registry.sqlalchemy, 'create_engine', lambda *args, **kwargs: create_engine('sqlite://'))
+    registry = EngineRegistry()
+    engine = registry.get_engine('server', 'Elmer', 'driver', pool_size=5)
+    with warnings.catch_warnings():
+        warnings.simplefilter('error')
+        assert registry.get_engine('server', 'Elmer', 'driver', pool_size=5) is engine
+    with pytest.warns(UserWarning, match='pool_size=5'):
+        assert registry.get_engine('server', 'Elmer', 'driver', pool_size=20, login_timeout=15) is engine
+    registry.dispose()
@@ -0,0 +1,77 @@
+import os
+import pandas as pd
+import pyarrow.parquet as pq
+from pytest import raises
+from psrcelmerpy.conn.export import open_writer, geoparquet_metadata
+
+def test_parquet_row_groups_and_null_first_chunk(tmp_path):
+    path = str(tmp_path / 'out.parquet')
+    writer = open_writer(path, compression='zstd')
+    writer.write(pd.DataFrame({'id': [1, 2], 'name': [None, None]}))
+    writer.write(pd.DataFrame({'id': [3], 'name': ['c']}))
+    assert writer.close() == os.path.getsize(path)
+    assert pq.ParquetFile(path).num_row_groups == 2
+    assert pd.read_parquet(path)['name'].tolist()[2] == 'c'
+    assert (writer.rows, writer.batches) == (3, 2)
+
+def test_csv_header_written_once(tmp_path):
+    path = str(tmp_path / 'out.csv.gz')
+    writer = open_writer(path, format='csv', compression='gzip')
+    writer.write(pd.DataFrame({'id': [1, 2]}))
+    writer.write(pd.DataFrame({'id': [3]}))
+    writer.close()
+    assert pd.read_csv(path)['id'].tolist() == [1, 2, 3]
+
+def test_abort_leaves_no_file(tmp_path):
+    path = str(tmp_path / 'out.parquet')
+    writer = open_writer(path)
+    writer.write(pd.DataFrame({'id': [1]}))
+    writer.abort()
+    assert os.listdir(str(tmp_path)) == []
+
+def test_bad_format_and_compression(tmp_path):
+    with raises(ValueError):
+        open_writer(str(tmp_path / 'out.xlsx'), format='xlsx')
+    with raises(ValueError):
+        open_writer(str(tmp_path / 'out.csv'), format='csv', compression='snappy')
+
+def test_geoparquet_metadata_is_readable(tmp_path):
+    import geopandas as gpd
+    import shapely
+    path = str(tmp_path / 'layer.parquet')
+    writer = open_writer(path, metadata=geoparquet_metadata('EPSG:4326'))
+    writer.write(pd.DataFrame({'id': [1], 'geometry': [shapely.to_wkb(shapely.Point(-122.3, 47.6))]}))
+    writer.close()
+    gdf = gpd.read_parquet(path)
+    assert gdf.crs == 'EPSG:4326'
+    assert gdf.geometry.iloc[0].x == -122.3
+
+def test_empty_exports_keep_columns(tmp_path):
+    import sqlalchemy
+    from psrcelmerpy.conn.elmer_conn import ElmerConn
+    conn = ElmerConn(engine=sqlalchemy.create_engine('sqlite:///{}'.format(tmp_path / 'elmer.db')))
+    conn.execute_sql('create table t (id int, name text)')
+    assert [len(chunk) for chunk in conn.iter_query('select * from t')] == [0]
+    path = str(tmp_path / 't.parquet')
+    stats = conn.export_table('main', 't', path)
+    assert stats['rows'] == 0 and os.path.getsize(path) == stats['bytes']
+    assert pd.read_parquet(path).columns.tolist() == ['id', 'name']
+    conn.export_table('main', 't', path + '.csv', format='csv')
+    with open(path + '.csv') as f:
+        assert f.read().strip() == 'id,name'
+    writer = open_writer(str(tmp_path / 'none.parquet'))
+    writer.close()
+    assert len(pd.read_parquet(str(tmp_path / 'none.parquet'))) == 0
+
+def test_empty_geoparquet_export(tmp_path):
+    import geopandas as gpd
+    from benchmarks import standin
+    from psrcelmerpy.conn.elmergeo_conn import ElmerGeoConn
+    engine = standin.make_engine(str(tmp_path / 'db'))
+    standin.add_layer(engine, 'parcels', rows=10, vertices=8)
+    conn = ElmerGeoConn(engine=engine)
+    path = str(tmp_path / 'parcels.parquet')
+    assert conn.export_geolayer('parcels', path, where='OBJECTID < 0')['rows'] == 0
+    gdf = gpd.read_parquet(path)
+    assert len(gdf) == 0 and gdf.crs == 'EPSG:4326'
+    assert 'OBJECTID' in gdf.columns and gdf.geometry.name == 'geometry'
@@ -0,0 +1,76 @@
+import time
+import pandas as pd
+from pytest import raises
+from psrcelmerpy.conn.instrumentation import Instrumentation
+
+def test_record_phases_and_result():
+    inst = Instrumentation()
+    with inst.record('get_query', 'select 1') as rec:
+        with inst.phase('execute'):
+            time.sleep(0.01)
+        rec.set_result(pd.DataFrame({'a': [1, 2, 3]}))
+    record = inst.records[-1]
+    assert record['method'] == 'get_query'
+    assert record['rows'] == 3
+    assert record['bytes'] > 0
+    assert record['phases']['execute'] >= 0.01
+    assert record['duration'] >= record['phases']['execute']
+    assert record['error'] is None
+
+def test_nested_phases_roll_up():
+    inst = Instrumentation()
+    with inst.record('read_geolayer') as outer:
+        with inst.record('get_query'):
+            with inst.phase('fetch'):
+                pass
+        with outer.phase('reproject'):
+            pass
+    child, parent = inst.records
+    assert child['parent'] == parent['id']
+    assert set(parent['phases']) == {'fetch', 'reproject'}
+
+def test_hooks_and_errors():
+    inst = Instrumentation()
+    seen = []
+    inst.add_hook(seen.append)
+    inst.add_hook(lambda record: 1 / 0)
+    with raises(ValueError):
+        with inst.record('execute_sql', 'bad sql'):
+            raise ValueError('boom')
+    assert len(seen) == 1
+    assert seen[0]['error'] == 'ValueError: boom'
+
+def test_summary():
+    inst = Instrumentation()
+    assert len(inst.summary()) == 0
+    for i in range(3):
+        with inst.record('get_query') as rec:
+            with rec.phase('fetch'):
+                pass
+    summary = inst.summary()
+    assert summary.loc[0, 'method'] == 'get_query'
+    assert summary.loc[0, 'calls'] == 3
+    assert 'phase_fetch' in summary.columns
+    inst.reset()
+    assert len(inst.records) == 0
+
+def test_bytes_measured_at_outermost_record():
+    df = pd.DataFrame({'name': pd.Series(['a' * 100] * 10, dtype=object)})
+    inst = Instrumentation()
+    with inst.record('read_geolayer') as outer:
+        with inst.record('get_query') as inner:
+            inner.set_result(df)
+        outer.set_result(df)
+    child, parent = inst.records
+    assert child['rows'] == 10 and child['bytes'] is None
+    assert parent['bytes'] == int(df.memory_usage(index=False).sum())
+    deep = Instrumentation(measure_bytes='deep')
+    with deep.record('get_query') as rec:
+        rec.set_result(df)
+    assert deep.records[-1]['bytes'] > parent['bytes']
+    off = Instrumentation(measure_bytes=False)
+    with off.record('get_query') as rec:
+        rec.set_result(df)
+    assert off.records[-1]['bytes'] is None and off.records[-1]['rows'] == 10
+    with raises(ValueError):
+        Instrumentation(measure_bytes='sampled')
@@ -0,0 +1,55 @@
+import datetime
+import decimal
+import pandas as pd
+from pytest import raises
+from psrcelmerpy.conn.materialize import build_frame, compact_text
+
+def describe(*columns):
+    return([(name, type_code, None, None, None, None, True) for name, type_code in columns])
+
+DESCRIPTION = describe(('id', int), ('n', int), ('amount', decimal.Decimal), ('x', float),
+                       ('flag', bool), ('updated', datetime.datetime), ('county', str))
+ROWS = [(1, 5, decimal.Decimal('1.50'), 0.5, True, datetime.datetime(2023, 1, 1), 'King'),
+        (2, None, None, None, False, None, 'King'),
+        (3, 7, decimal.Decimal('2.25'), 1.5, True, datetime.datetime(2023, 6, 1), 'Pierce')]
+
+def test_dtypes_from_description():
+    df = build_frame(ROWS, DESCRIPTION)
+    assert list(df.columns) == ['id', 'n', 'amount', 'x', 'flag', 'updated', 'county']
+    assert df['id'].dtype == 'int64'
+    assert df['n'].dtype == 'Int64'
+    assert df['amount'].dtype == 'float64'
+    assert df['x'].dtype == 'float64'
+    assert df['flag'].dtype == 'bool'
+    assert pd.api.types.is_datetime64_any_dtype(df['updated'])
+    assert pd.isna(df['n'][1]) and pd.isna(df['updated'][1])
+
+def test_decimal_option():
+    df = build_frame(ROWS, DESCRIPTION, decimal_as='decimal')
+    assert df['amount'][0] == decimal.Decimal('1.50')
+    with raises(ValueError):
+        build_frame(ROWS, DESCRIPTION, decimal_as='money')
+
+def test_text_options():
+    df = build_frame(ROWS, DESCRIPTION, text_as='category', category_threshold=0.7)
+    assert isinstance(df['county'].dtype, pd.CategoricalDtype)
+    df = build_frame(ROWS, DESCRIPTION, text_as='category', category_threshold=0.5)
+    assert not isinstance(df['county'].dtype, pd.CategoricalDtype)
+    df = build_frame(ROWS, DESCRIPTION, text_as='pyarrow')
+    assert str(df['county'].dtype).startswith('string')
+
+def test_empty_result_keeps_columns():
+    df = build_frame([], DESCRIPTION)
+    assert len(df) == 0
+    assert list(df.columns) == ['id', 'n', 'amount', 'x', 'flag', 'updated', 'county']
+
+def test_unknown_types_are_inferred():
+    df = build_frame([(1, 'a'), (2, 'b')], describe(('a', None), ('b', None)))
+    assert df['a'].dtype == 'int64'
+    assert df['b'].tolist() == ['a', 'b']
+
+def test_compact_text():
+    df = pd.DataFrame({'county': ['King', 'King', 'King', None], 'n': [1, 2, 3, 4]})
+    df = compact_text(df, 'category')
+    assert isinstance(df['county'].dtype, pd.CategoricalDtype)
+    assert df['n'].dtype == 'int64'
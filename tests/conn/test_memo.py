@@ -0,0 +1,82 @@
+import time
+import pandas as pd
+from psrcelmerpy.conn.memo import QueryMemo, normalize_sql, table_refs
+
+def test_normalize_sql_keeps_literals():
+    sql = "select  *\n from dbo.t   where name = 'a  b' ;"
+    assert normalize_sql(sql) == "select * from dbo.t where name = 'a  b'"
+
+def test_table_refs():
+    sql = "select * from [HHSurvey].[v_trips] t join dbo.persons p on 1 = 1 where x = 'from fake'"
+    assert table_refs(sql) == {('hhsurvey', 'v_trips'), ('dbo', 'persons')}
+    assert table_refs("update stg.my_table set x = 1") == {('stg', 'my_table')}
+
+def test_hits_misses_and_copies():
+    memo = QueryMemo()
+    key = memo.make_key("select * from dbo.t", {'a': 1})
+    assert memo.make_key("select *  from dbo.t", {'a': 1}) == key
+    assert memo.make_key("select * from dbo.t", {'a': 2}) != key
+    assert memo.get(key) == (False, None)
+    memo.set(key, pd.DataFrame({'x': [1, 2]}), "select * from dbo.t")
+    found, df = memo.get(key)
+    df.loc[0, 'x'] = 99
+    assert found and memo.get(key)[1]['x'][0] == 1
+    assert memo.stats()['hits'] == 2 and memo.stats()['misses'] == 1
+
+def test_ttl():
+    memo = QueryMemo(ttl=60)
+    memo.set('k', pd.DataFrame({'x': [1]}), "select 1", ttl=0.01)
+    time.sleep(0.02)
+    assert memo.get('k') == (False, None)
+
+def test_lru_eviction_within_budget():
+    df = pd.DataFrame({'x': range(1000)})
+    size = int(df.memory_usage(index=True, deep=True).sum())
+    memo = QueryMemo(max_bytes=size * 2)
+    memo.set('a', df, "select 1")
+    memo.set('b', df, "select 1")
+    memo.get('a')
+    memo.set('c', df, "select 1")
+    assert memo.get('b')[0] is False
+    assert memo.get('a')[0] and memo.get('c')[0]
+    assert memo.stats()['bytes'] <= size * 2
+
+def test_invalidate_tables():
+    memo = QueryMemo()
+    memo.set('trips', pd.DataFrame(), "select * from HHSurvey.trips")
+    memo.set('persons', pd.DataFrame(), "select * from persons")
+    memo.set('other', pd.DataFrame(), "select * from stg.other")
+    assert memo.invalidate_tables("delete from HHSurvey.trips where 1 = 0") == 1
+    assert memo.invalidate_table('persons', schema='dbo') == 1
+    assert len(memo) == 1
+
+def test_table_refs_without_from_or_into():
+    assert table_refs("DELETE bench.s WHERE id = 1") == {('bench', 's')}
+    assert table_refs("INSERT [bench].[s] VALUES (1)") == {('bench', 's')}
+    assert table_refs("insert into bench.s values (1)") == {('bench', 's')}
+    assert table_refs("delete from bench.s") == {('bench', 's')}
+
+def test_unscoped_writes_drop_everything():
+    for sql in ("EXEC dbo.refresh_trips", "execute sp_executesql N'delete x'", "select 1",
+                "merge bench.s as t using bench.u as u on t.id = u.id when matched then delete;"):
+        memo = QueryMemo()
+        memo.set('s', pd.DataFrame({'x': [1]}), "select * from bench.s")
+        memo.set('t', pd.DataFrame({'x': [1]}), "select * from bench.t")
+        assert memo.invalidate_tables(sql) == 2
+        assert len(memo) == 0 and memo.stats()['bytes'] == 0
+    memo = QueryMemo()
+    memo.set('s', pd.DataFrame({'x': [1]}), "select * from bench.s")
+    memo.set('t', pd.DataFrame({'x': [1]}), "select * from bench.t where note = 'exec'")
+    assert memo.invalidate_tables("DELETE bench.s WHERE note = 'exec'") == 1
+    assert memo.invalidate_tables("INSERT bench.t VALUES (1)") == 1
+
+def test_execute_sql_invalidates_memo(tmp_path):
+    import sqlalchemy
+    from psrcelmerpy.conn.elmer_conn import ElmerConn
+    conn = ElmerConn(engine=sqlalchemy.create_engine('sqlite:///{}'.format(tmp_path / 'elmer.db')))
+    conn.enable_memoization()
+    conn.execute_sql('create table s (id int)')
+    conn.execute_sql('insert into s values (1), (2)')
+    assert len(conn.get_query('select * from main.s')) == 2
+    conn.execute_sql('delete from main.s where id = 1')
+    assert len(conn.get_query('select * from main.s')) == 1
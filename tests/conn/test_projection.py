@@ -0,0 +1,53 @@
+import threading
+import geopandas as gpd
+import numpy as np
+import shapely
+from shapely.geometry import Point
+from psrcelmerpy.conn.projection import get_transformer, reproject, transform_geometries
+
+def test_reproject_matches_to_crs():
+    gdf = gpd.GeoDataFrame({'id': [1, 2, 3]},
+                           geometry=[Point(1270000, 220000).buffer(500), None, Point(1300000, 210000)],
+                           crs='EPSG:2285')
+    result = reproject(gdf, 'EPSG:4326')
+    expected = gdf.to_crs('EPSG:4326')
+    assert result.crs == expected.crs
+    assert result.geometry.iloc[1] is None
+    assert result.geometry.iloc[[0, 2]].geom_equals_exact(expected.geometry.iloc[[0, 2]], tolerance=1e-9).all()
+    assert gdf.crs == 'EPSG:2285'
+
+def test_transformers_are_cached_per_thread():
+    transformer = get_transformer('EPSG:2285', 'EPSG:4326')
+    assert get_transformer('EPSG:2285', 'EPSG:4326') is transformer
+    other = []
+    thread = threading.Thread(target=lambda: other.append(get_transformer('EPSG:2285', 'EPSG:4326')))
+    thread.start()
+    thread.join()
+    assert other[0] is not transformer
+
+def test_chunked_transform_matches_single_pass():
+    rng = np.random.default_rng(1)
+    geoms = shapely.points(rng.uniform([1200000, 100000], [1400000, 300000], size=(1000, 2)))
+    geoms = np.append(shapely.buffer(geoms[:500], 100), geoms[500:])
+    single = transform_geometries(geoms, 'EPSG:2285', 'EPSG:4326', chunksize=10 ** 9)
+    chunked = transform_geometries(geoms, 'EPSG:2285', 'EPSG:4326', chunksize=997, max_workers=4)
+    assert shapely.equals_exact(single, chunked, tolerance=0).all()
+    assert shapely.get_num_coordinates(chunked).sum() == shapely.get_num_coordinates(geoms).sum()
+    assert geoms[0].bounds[0] > 1000
+
+def test_reproject_to_same_crs_is_skipped():
+    gdf = gpd.GeoDataFrame({'id': [1]}, geometry=[Point(1270000, 220000)], crs='EPSG:2285')
+    assert reproject(gdf, 'epsg:2285') is gdf
+    assert reproject(gdf, 'EPSG:32610').crs == 'EPSG:32610'
+
+def test_reproject_keeps_z():
+    from shapely.geometry import LineString
+    gdf = gpd.GeoDataFrame({'id': [1, 2, 3, 4]},
+                           geometry=[Point(1270000, 220000, 5), Point(1270000, 220000), None,
+                                     LineString([(1270000, 220000, 1), (1270100, 220100, 2)])],
+                           crs='EPSG:2285')
+    result = reproject(gdf, 'EPSG:4326', chunksize=2)
+    expected = gdf.to_crs('EPSG:4326')
+    assert shapely.has_z(result.geometry.array).tolist() == [True, False, False, True]
+    assert result.geometry.iloc[[0, 1, 3]].geom_equals_exact(expected.geometry.iloc[[0, 1, 3]], tolerance=1e-9).all()
+    assert shapely.get_coordinates(result.geometry.iloc[3], include_z=True)[:, 2].tolist() == [1, 2]
@@ -0,0 +1,126 @@
+import multiprocessing
+import os
+import pandas as pd
+import pytest
+import time
+from psrcelmerpy.conn.result_cache import ResultCache
+
+def store_entries(directory, worker, count):
+    cache = ResultCache(directory=directory)
+    for i in range(count):
+        key = cache.make_key(worker, i)
+        cache.fetch(key, lambda: pd.DataFrame({'worker': [worker], 'i': [i]}), lambda: 'v1')
+    return(worker)
+
+@pytest.mark.skipif(not hasattr(os, 'fork'), reason="needs fork")
+def test_processes_sharing_a_directory_keep_every_entry(tmp_path):
+    directory = str(tmp_path / 'cache')
+    context = multiprocessing.get_context('fork')
+    with context.Pool(4) as pool:
+        pool.starmap(store_entries, [(directory, worker, 25) for worker in range(4)])
+    cache = ResultCache(directory=directory)
+    assert cache.stats()['entries'] == 100
+    df = cache.fetch(cache.make_key(3, 24), lambda: None, lambda: 'v1')
+    assert df['worker'].tolist() == [3] and cache.hits == 1
+    files = os.listdir(directory)
+    assert len(files) == 200 and not any(name.endswith('.tmp') for name in files)
+
+def test_eviction_sees_files_without_a_sidecar(tmp_path):
+    cache = ResultCache(directory=str(tmp_path))
+    orphan = os.path.join(str(tmp_path), 'f' * 40 + '.parquet')
+    pd.DataFrame({'x': range(1000)}).to_parquet(orphan)
+    os.utime(orphan, (0, 0))
+    cache.max_bytes = os.path.getsize(orphan) + 1
+    cache.fetch(cache.make_key('t'), lambda: pd.DataFrame({'x': [1]}), lambda: 'v1')
+    assert not os.path.exists(orphan)
+    assert cache.stats()['entries'] == 1
+
+def cached_conn(tmp_path, monkeypatch, **kwargs):
+    import sqlalchemy
+    from psrcelmerpy.conn.elmer_conn import ElmerConn
+    conn = ElmerConn(engine=sqlalchemy.create_engine('sqlite:///{}'.format(tmp_path / 'elmer.db')))
+    conn.execute_sql('create table t (id int, name text)')
+    conn.execute_sql("insert into t values (1, 'a'), (2, 'b')")
+    # stands in for the sys.objects lookup of the table's modify_date and row count
+    signatures = {'t': 'v1'}
+    monkeypatch.setattr(conn, '_object_signature', lambda schema, object_name: signatures.get(object_name))
+    cache = conn.enable_result_cache(directory=str(tmp_path / 'cache'), **kwargs)
+    return(conn, cache, signatures)
+
+def test_get_table_hit_and_miss(tmp_path, monkeypatch):
+    conn, cache, signatures = cached_conn(tmp_path, monkeypatch)
+    df = conn.get_table('main', 't')
+    assert (cache.hits, cache.misses) == (0, 1)
+    conn.execute_sql("insert into t values (3, 'c')")
+    # within max_age the cached copy is served without checking the server
+    assert conn.get_table('main', 't').equals(df)
+    assert (cache.hits, cache.misses) == (1, 1)
+    assert len(conn.get_table('main', 't', use_cache=False)) == 3
+    assert len(conn.get_table('main', 't', text_as='category')) == 3
+    assert cache.stats()['entries'] == 2
+
+def test_changed_signature_invalidates_after_max_age(tmp_path, monkeypatch):
+    conn, cache, signatures = cached_conn(tmp_path, monkeypatch, max_age=0)
+    conn.get_table('main', 't')
+    time.sleep(0.01)
+    assert len(conn.get_table('main', 't')) == 2
+    assert cache.hits == 1
+    conn.execute_sql("insert into t values (3, 'c')")
+    signatures['t'] = 'v2'
+    time.sleep(0.01)
+    assert len(conn.get_table('main', 't')) == 3
+    assert (cache.hits, cache.misses) == (1, 2)
+    assert cache.stats()['entries'] == 1
+
+def test_unknown_signature_is_not_cached(tmp_path, monkeypatch):
+    conn, cache, signatures = cached_conn(tmp_path, monkeypatch)
+    del signatures['t']
+    conn.get_table('main', 't')
+    conn.get_table('main', 't')
+    assert cache.misses == 2 and cache.stats()['entries'] == 0
+
+def set_last_access(directory, key, seconds):
+    for name in os.listdir(directory):
+        if name.startswith(key + '.'):
+            os.utime(os.path.join(directory, name), (seconds, seconds))
+
+def test_size_eviction_drops_least_recently_used(tmp_path):
+    directory = str(tmp_path)
+    cache = ResultCache(directory=directory)
+    frame = pd.DataFrame({'x': range(1000)})
+    cache.fetch('a', lambda: frame, lambda: 'v1')
+    # room for two entries (sidecars differ by a few bytes) but not three
+    cache.max_bytes = int(cache.stats()['bytes'] * 2.5)
+    set_last_access(directory, 'a', 1)
+    cache.fetch('b', lambda: frame, lambda: 'v1')
+    set_last_access(directory, 'b', 2)
+    # a hit makes 'a' the most recently used
+    assert cache.fetch('a', lambda: None, lambda: 'v1') is not None
+    cache.fetch('c', lambda: frame, lambda: 'v1')
+    assert sorted(name for name in os.listdir(directory) if name.endswith('.json')) == ['a.json', 'c.json']
+    assert cache.stats()['bytes'] <= cache.max_bytes
+    cache.invalidate('a')
+    assert cache.stats()['entries'] == 1
+    cache.invalidate()
+    assert os.listdir(directory) == []
+
+def test_geolayer_geoparquet_round_trip(tmp_path, monkeypatch):
+    from benchmarks import standin
+    from psrcelmerpy.conn.elmergeo_conn import ElmerGeoConn
+    engine = standin.make_engine(str(tmp_path / 'db'))
+    standin.add_layer(engine, 'parcels', rows=20, vertices=8)
+    conn = ElmerGeoConn(engine=engine)
+    monkeypatch.setattr(conn, '_object_signature', lambda schema, object_name: 'v1')
+    cache = conn.enable_result_cache(directory=str(tmp_path / 'cache'))
+    gdf = conn.read_geolayer('parcels', to_crs='EPSG:32610')
+    lookups = []
+    get_layer_metadata = conn.get_layer_metadata
+    monkeypatch.setattr(conn, 'get_layer_metadata', lambda *args: lookups.append(args) or get_layer_metadata(*args))
+    cached = conn.read_geolayer('PARCELS', to_crs='EPSG:32610')
+    assert cache.hits == 1 and lookups == []
+    assert cached.crs == gdf.crs
+    assert list(cached.columns) == list(gdf.columns)
+    assert cached.geometry.geom_equals_exact(gdf.geometry, tolerance=1e-6).all()
+    assert any(name.endswith('.geoparquet') for name in os.listdir(str(tmp_path / 'cache')))
+    conn.read_geolayer('parcels')
+    assert cache.misses == 2
@@ -0,0 +1,61 @@
+import datetime
+import decimal
+from pytest import raises
+from psrcelmerpy.conn import sync
+
+def test_marks_round_trip():
+    for mark in (b'\x00\x00\x00\x00\x00\x01\x86\xa0', 42, 1.5, 'a',
+                 datetime.datetime(2024, 1, 2, 3, 4, 5, 6), datetime.date(2024, 1, 2), decimal.Decimal('12.50')):
+        assert sync.decode_mark(sync.encode_mark(mark)) == mark
+    assert sync.decode_mark(sync.encode_mark(None)) is None
+    with raises(ValueError):
+        sync.encode_mark(object())
+
+def test_state_round_trip(tmp_path):
+    path = str(tmp_path / 'trips.parquet')
+    assert sync.read_state(path) is None
+    sync.write_state(path, {'mark': datetime.datetime(2024, 1, 1), 'rows': 3})
+    assert sync.read_state(path) == {'mark': datetime.datetime(2024, 1, 1), 'rows': 3}
+
+def sync_source(tmp_path):
+    from psrcelmerpy.conn.elmer_conn import ElmerConn
+    from benchmarks import standin
+    conn = ElmerConn(engine=standin.make_engine(str(tmp_path / 'db')))
+    conn.execute_sql('create table stg.src (id int, value int, version int)')
+    conn.execute_sql("insert into INFORMATION_SCHEMA.COLUMNS values (:schema, :table_name, :column, 'int', :position)",
+                     params=[{'schema': 'stg', 'table_name': 'src', 'column': column, 'position': i + 1}
+                             for i, column in enumerate(['id', 'value', 'version'])])
+    return(conn)
+
+def test_sync_table_from_empty(tmp_path):
+    import pandas as pd
+    conn = sync_source(tmp_path)
+    path = str(tmp_path / 'src.parquet')
+    stats = conn.sync_table('stg', 'src', path, 'version', key_columns=['id'])
+    assert (stats['mode'], stats['rows'], stats['mark']) == ('full', 0, None)
+    assert pd.read_parquet(path).columns.tolist() == ['id', 'value', 'version']
+    assert sync.read_state(path)['mark'] is None
+    conn.execute_sql('insert into stg.src values (1, 10, 1), (2, 20, 2)')
+    stats = conn.sync_table('stg', 'src', path, 'version', key_columns=['id'])
+    assert (stats['mode'], stats['rows_fetched'], stats['rows'], stats['mark']) == ('incremental', 2, 2, 2)
+    conn.execute_sql('update stg.src set value = 21, version = 3 where id = 2')
+    conn.execute_sql('insert into stg.src values (3, 30, 4)')
+    stats = conn.sync_table('stg', 'src', path, 'version', key_columns=['id'])
+    assert (stats['rows_fetched'], stats['rows'], stats['mark']) == (2, 3, 4)
+    df = pd.read_parquet(path).sort_values('id')
+    assert df['value'].tolist() == [10, 21, 30]
+    assert df['id'].dtype == 'int64'
+    assert conn.sync_table('stg', 'src', path, 'version', key_columns=['id'])['rows_fetched'] == 0
+
+def test_sync_table_appends_without_keys(tmp_path):
+    import pandas as pd
+    conn = sync_source(tmp_path)
+    conn.execute_sql('insert into stg.src values (1, 10, 1)')
+    path = str(tmp_path / 'src.parquet')
+    assert conn.sync_table('stg', 'src', path, 'version')['rows'] == 1
+    conn.execute_sql('update stg.src set value = 11, version = 2 where id = 1')
+    stats = conn.sync_table('stg', 'src', path, 'version')
+    assert (stats['mode'], stats['rows_fetched'], stats['rows']) == ('incremental', 1, 2)
+    assert pd.read_parquet(path)['value'].tolist() == [10, 11]
+    stats = conn.sync_table('stg', 'src', path, 'version', full_refresh=True)
+    assert (stats['mode'], stats['rows']) == ('full', 1)
@@ -0,0 +1,104 @@
+import asyncio
+import threading
+import time
+import sqlalchemy
+from pytest import raises
+from psrcelmerpy.conn.async_conn import AsyncConnection
+from psrcelmerpy.conn.elmer_conn import ElmerConn
+from psrcelmerpy.conn.timeouts import QueryCancelled, QueryTimeout
+
+# counts to a billion; SQLite takes minutes, so it only ever ends by being interrupted
+SLOW_SQL = ("with recursive c(x) as (select 1 union all select x + 1 from c where x < 1000000000) "
+            "select count(*) as n from c")
+
+def sqlite_conn(tmp_path, **kwargs):
+    engine = sqlalchemy.create_engine('sqlite:///{}'.format(tmp_path / 'elmer.db'))
+    return(ElmerConn(engine=engine, **kwargs))
+
+def test_statement_timeout(tmp_path):
+    conn = sqlite_conn(tmp_path)
+    start = time.monotonic()
+    with raises(QueryTimeout) as info:
+        conn.get_query(SLOW_SQL, timeout=0.2)
+    assert time.monotonic() - start < 5
+    assert info.value.reason == 'timeout'
+    record = conn.instrumentation.records[-1]
+    assert record['cancelled'] == 'timeout'
+    assert record['duration'] >= 0.2
+    assert conn.query_stats().loc[0, 'cancelled'] == 1
+    # the interrupted connection goes back to the pool in working order
+    assert conn.get_query('select 1 as a')['a'].tolist() == [1]
+
+def test_latency_budget(tmp_path):
+    conn = sqlite_conn(tmp_path, latency_budget=0.2)
+    with raises(QueryTimeout) as info:
+        conn.get_query(SLOW_SQL)
+    assert info.value.reason == 'latency_budget'
+    with raises(QueryTimeout):
+        conn.execute_sql("create table t as " + SLOW_SQL)
+    assert len(conn.get_query('select 1 as a', latency_budget=5)) == 1
+
+def test_cancel_from_another_thread(tmp_path):
+    conn = sqlite_conn(tmp_path)
+    active = []
+
+    def cancel():
+        active.append(conn.active_queries())
+        conn.cancel()
+
+    timer = threading.Timer(0.2, cancel)
+    timer.start()
+    with raises(QueryCancelled) as info:
+        conn.get_query(SLOW_SQL)
+    assert not isinstance(info.value, QueryTimeout)
+    assert active[0]['method'].tolist() == ['get_query']
+    assert active[0].loc[0, 'statements'] == 1
+    assert len(conn.active_queries()) == 0
+    assert conn.cancel() == 0
+
+def test_limits_apply_to_a_block(tmp_path):
+    conn = sqlite_conn(tmp_path)
+    with raises(QueryTimeout):
+        with conn.limits(latency_budget=0.3):
+            assert len(conn.get_query('select 1 as a')) == 1
+            conn.get_query(SLOW_SQL)
+    assert [record['cancelled'] for record in conn.instrumentation.records] == [None, 'latency_budget']
+
+def test_cancelling_a_task_cancels_its_statement(tmp_path):
+    conn = sqlite_conn(tmp_path)
+    aconn = AsyncConnection(conn, max_workers=1)
+
+    async def main():
+        task = asyncio.ensure_future(aconn.get_query(SLOW_SQL))
+        await asyncio.sleep(0.2)
+        task.cancel()
+        with raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(main())
+    start = time.monotonic()
+    aconn.close(wait=True)
+    assert time.monotonic() - start < 5
+    assert conn.instrumentation.records[-1]['cancelled'] == 'cancelled'
+
+def test_invalid_timeout():
+    with raises(ValueError):
+        ElmerConn(engine=sqlalchemy.create_engine('sqlite://'), query_timeout=0)
+
+def test_cancelling_a_task_cancels_a_call_with_its_own_timeout(tmp_path):
+    conn = sqlite_conn(tmp_path)
+    aconn = AsyncConnection(conn, max_workers=1)
+
+    async def main():
+        task = asyncio.ensure_future(aconn.get_query(SLOW_SQL, timeout=60))
+        await asyncio.sleep(0.2)
+        task.cancel()
+        with raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(main())
+    start = time.monotonic()
+    aconn.close(wait=True)
+    assert time.monotonic() - start < 5
+    assert conn.instrumentation.records[-1]['cancelled'] == 'cancelled'
+    assert len(conn.active_queries()) == 0
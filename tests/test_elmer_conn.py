@@ -2,6 +2,7 @@
 # from psrcelmerpy.conn.elmer_conn import ElmerConn
 # from psrcelmerpy.conn.elmergeo_conn import ElmerGeoConn
 import psrcelmerpy
+import asyncio
 from datetime import datetime
 import pandas as pd
 from pytest import raises
@@ -12,6 +13,33 @@ def test_get_table():
     df = econn.get_table(schema='small_areas', table_name='sector_dim')
     assert len(df) > 1
     assert isinstance(df, pd.DataFrame) == True
+
+def test_get_table_chunked():
+    econn = psrcelmerpy.ElmerConn()
+    df = econn.get_table(schema='small_areas', table_name='sector_dim')
+    chunks = list(econn.get_table(schema='small_areas', table_name='sector_dim', chunksize=5))
+    assert all(len(chunk) <= 5 for chunk in chunks)
+    assert sum(len(chunk) for chunk in chunks) == len(df)
+
+def test_iter_query():
+    econn = psrcelmerpy.ElmerConn()
+    sql = 'select top 3 * from small_areas.sector_dim'
+    chunks = list(econn.iter_query(sql, chunksize=2))
+    assert [len(chunk) for chunk in chunks] == [2, 1]
+    with raises(ValueError):
+        econn.iter_query(sql, chunksize=0)
+    
+def test_get_table_partitioned():
+    econn = psrcelmerpy.ElmerConn()
+    df = econn.get_table(schema='small_areas', table_name='sector_dim')
+    key = df.columns[0]
+    df_parts = econn.get_table(schema='small_areas', table_name='sector_dim',
+                               parallelism=3, partition_column=key)
+    assert len(df_parts) == len(df)
+    assert sorted(df_parts[key]) == sorted(df[key])
+    df_minmax = econn.get_table(schema='small_areas', table_name='sector_dim',
+                                parallelism=2, partition_column=key, partition_method='minmax')
+    assert len(df_minmax) == len(df)
     
 def test_get_query():
     econn = psrcelmerpy.ElmerConn()
@@ -20,6 +48,17 @@ def test_get_query():
     assert len(df) == 2
     assert isinstance(df, pd.DataFrame) == True
     
+def test_async_get_query():
+    async def main():
+        async with psrcelmerpy.AsyncElmerConn() as aconn:
+            sqls = ['select top {} * from small_areas.sector_dim'.format(n) for n in (1, 2, 3)]
+            dfs = await aconn.gather(*(aconn.get_query(sql) for sql in sqls))
+            recordsets = await aconn.list_recordsets(schema_name='HHSurvey')
+            return(dfs, recordsets)
+    dfs, recordsets = asyncio.run(main())
+    assert [len(df) for df in dfs] == [1, 2, 3]
+    assert len(recordsets) > 2
+
 def test_list_recordsets():
     econn = psrcelmerpy.ElmerConn()
     df = econn.list_recordsets(schema_name='HHSurvey')
@@ -28,6 +67,16 @@ def test_list_recordsets():
     df = econn.list_recordsets(schema_name='faa', include_base_tables=True)
     assert len(df) == 3
 
+def test_list_recordsets_stats():
+    econn = psrcelmerpy.ElmerConn()
+    df = econn.list_recordsets(schema_name='faa', include_base_tables=True)
+    assert {'row_count', 'size_mb', 'created', 'modified'} <= set(df.columns)
+    tables = df[df['recordset_type'] == 'BASE TABLE']
+    assert tables['row_count'].notna().all()
+    found = econn.find_recordsets(schema_name='FAA', recordset_type='base table')
+    assert sorted(found['recordset_name']) == sorted(tables['recordset_name'])
+    assert econn.recordset_index() is econn.recordset_index()
+
 def test_execute_sql():
     econn = psrcelmerpy.ElmerConn()
     thisdate = datetime.today().strftime('%Y_%m_%d')
@@ -40,6 +89,79 @@ def test_execute_sql():
     assert len(df) == 1
     econn.execute_sql('drop table if exists {}'.format(tblname))
 
+def test_execute_sql_params():
+    econn = psrcelmerpy.ElmerConn()
+    econn.execute_sql('drop table if exists stg.param_test')
+    econn.execute_sql('create table stg.param_test (id int, name varchar(20))')
+    econn.execute_sql('insert into stg.param_test values (:id, :name)',
+                      params=[{'id': 1, 'name': "o'brien"}, {'id': 2, 'name': 'smith'}])
+    df = econn.get_query('select name from stg.param_test where id = :id', params={'id': 1})
+    assert list(df['name']) == ["o'brien"]
+    econn.execute_sql('drop table stg.param_test')
+
+def test_query_timeout():
+    econn = psrcelmerpy.ElmerConn(login_timeout=15)
+    with raises(psrcelmerpy.QueryTimeout):
+        econn.execute_sql("waitfor delay '00:00:30'", timeout=1)
+    with raises(psrcelmerpy.QueryTimeout):
+        econn.get_query("waitfor delay '00:00:30'; select 1 as a", latency_budget=1)
+    assert econn.instrumentation.records[-1]['cancelled'] == 'latency_budget'
+    assert len(econn.get_query('select 1 as a', timeout=10)) == 1
+
+def test_connections_share_engine():
+    econn = psrcelmerpy.ElmerConn()
+    econn2 = psrcelmerpy.ElmerConn()
+    assert econn.engine is econn2.engine
+    for i in range(3):
+        econn.execute_sql('select 1')
+    stats = econn.pool_stats()
+    assert stats['database_name'] == 'Elmer'
+    assert stats['checkouts'] >= 3
+    assert stats['connects'] < stats['checkouts']
+
+def test_get_table_result_cache(tmp_path):
+    econn = psrcelmerpy.ElmerConn()
+    cache = econn.enable_result_cache(directory=str(tmp_path))
+    df = econn.get_table(schema='small_areas', table_name='sector_dim')
+    df2 = econn.get_table(schema='small_areas', table_name='sector_dim')
+    assert cache.stats()['hits'] == 1
+    assert cache.stats()['entries'] == 1
+    assert df.equals(df2)
+    econn.disable_result_cache()
+
+def test_export_table(tmp_path):
+    econn = psrcelmerpy.ElmerConn()
+    df = econn.get_table(schema='small_areas', table_name='sector_dim')
+    path = str(tmp_path / 'sector_dim.parquet')
+    stats = econn.export_table('small_areas', 'sector_dim', path, chunksize=5)
+    assert stats['rows'] == len(df)
+    assert len(pd.read_parquet(path)) == len(df)
+    stats = econn.export_table('small_areas', 'sector_dim', path + '.csv', format='csv')
+    assert len(pd.read_csv(path + '.csv')) == len(df)
+
+def test_memoization():
+    econn = psrcelmerpy.ElmerConn()
+    econn.enable_memoization()
+    sql = 'select top 2 * from small_areas.sector_dim'
+    df = econn.get_query(sql)
+    assert econn.get_query(sql).equals(df)
+    assert econn.memo.stats()['hits'] == 1
+    econn.stage_table(df, 'memo_test', if_exists='replace')
+    econn.get_query('select * from stg.memo_test')
+    econn.execute_sql('drop table stg.memo_test')
+    assert len(econn.memo) == 1
+
+def test_sync_table(tmp_path):
+    econn = psrcelmerpy.ElmerConn()
+    path = str(tmp_path / 'sync_test.parquet')
+    econn.stage_table(pd.DataFrame({'id': [1, 2], 'value': [10, 20]}), 'sync_test', if_exists='replace')
+    assert econn.sync_table('stg', 'sync_test', path, 'id')['mode'] == 'full'
+    econn.execute_sql('insert into stg.sync_test values (3, 30)')
+    stats = econn.sync_table('stg', 'sync_test', path, 'id', key_columns=None)
+    assert (stats['mode'], stats['rows_fetched'], stats['rows']) == ('incremental', 1, 3)
+    assert sorted(pd.read_parquet(path)['id']) == [1, 2, 3]
+    econn.execute_sql('drop table stg.sync_test')
+
 def test_build_recordset_sql():
     econn = psrcelmerpy.ElmerConn() 
     valid_query = ("SELECT t.TABLE_SCHEMA as [schema],",
@@ -51,13 +173,12 @@ def test_build_recordset_sql():
     valid_query = " ".join(valid_query)
     test_query = econn._build_recordset_sql()
     assert valid_query == test_query  
-    valid_query = f"{valid_query} AND t.TABLE_SCHEMA = 'someschema'"
     valid_query = ("SELECT t.TABLE_SCHEMA as [schema],",
                 "t.TABLE_NAME as recordset_name,",
                 "t.TABLE_TYPE AS recordset_type",
                 "FROM INFORMATION_SCHEMA.TABLES t",
                 "WHERE table_schema not in ('dbo', 'tSQLt', 'DBA', 'meta', 'stg')",
-                "AND t.TABLE_SCHEMA = 'someschema'",
+                "AND t.TABLE_SCHEMA = :schema_name",
                 "AND t.TABLE_TYPE = 'view'")
     valid_query = " ".join(valid_query)
     test_query = econn._build_recordset_sql(schema_name='someschema')
@@ -81,4 +202,22 @@ def test_stage_table():
     df2 = econn.get_table('stg', 'test_stage_table')
     assert len(df) == len(df2)
     assert df.equals(df2)
-    econn.execute_sql(sql)
\ No newline at end of file
+    econn.execute_sql(sql)
+
+def test_stage_table_bulk_options():
+    econn = psrcelmerpy.ElmerConn()
+    sql = 'drop table if exists stg.test_stage_table_bulk'
+    econn.execute_sql(sql)
+    df = pd.DataFrame({'col_a': [1, 2, 3],
+                       'col_b': ['a', 'b', None]})
+    assert econn.map_sql_types(df) == {'col_a': 'BIGINT', 'col_b': 'NVARCHAR(16)'}
+    stats = econn.stage_table(df, 'test_stage_table_bulk', chunksize=2)
+    assert stats['rows'] == 3
+    assert stats['batches'] == 2
+    with raises(ValueError):
+        econn.stage_table(df, 'test_stage_table_bulk')
+    econn.stage_table(df, 'test_stage_table_bulk', if_exists='append')
+    assert len(econn.get_table('stg', 'test_stage_table_bulk')) == 6
+    econn.stage_table(df, 'test_stage_table_bulk', if_exists='replace')
+    assert len(econn.get_table('stg', 'test_stage_table_bulk')) == 3
+    econn.execute_sql(sql)
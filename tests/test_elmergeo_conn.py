@@ -5,6 +5,7 @@
 #                                               build_fc_query)
 import psrcelmerpy
 import pytest
+from shapely.geometry import box
 #from datetime import datetime
 #import pandas as pd
 econn = psrcelmerpy.ElmerConn()
@@ -46,14 +47,26 @@ def test_build_fc_query():
     valid_str = valid_str + valid_order
     assert sql_str == valid_str 
 
-    f_class_filter = " AND d.PhysicalName = 'ElmerGeo.DBO.some_fc'"
-    f_dataset_filter = " AND o.[Name] = 'ElmerGeo.DBO.some_fd'"
+    f_class_filter = " AND d.PhysicalName = :feature_class"
+    f_dataset_filter = " AND o.[Name] = :feature_dataset"
     valid_base += f_class_filter
     valid_base += f_dataset_filter
     valid_base += valid_order
     valid_str = "".join(valid_base)
     sql_str = egconn.build_fc_query(feature_dataset = 'some_fd', feature_class='some_fc')
     assert sql_str == valid_str 
+    assert egconn.build_fc_params() is None
+    assert egconn.build_fc_params(feature_dataset='some_fd', feature_class='some_fc') == {
+        'feature_class': 'ElmerGeo.DBO.some_fc', 'feature_dataset': 'ElmerGeo.DBO.some_fd'}
+
+def test_find_feature_classes():
+    df = egconn.find_feature_classes(search='MICEN')
+    assert 'micen' in df['layer_name'].str.lower().tolist()
+    polygons = egconn.find_feature_classes(geometry_type='Polygon')
+    assert (polygons['geometry_type'] == 'esriGeometryPolygon').all()
+    assert egconn.feature_class_index() is egconn.feature_class_index()
+    assert len(egconn.list_feature_classes(feature_class='micen')) == \
+        len(egconn.list_feature_classes(feature_class='micen', use_cache=False))
 
 def test_list_feature_classes():
     df = egconn.list_feature_classes()
@@ -68,4 +81,86 @@ def test_query_with_no_records():
       egconn.get_query('SELECT OBJECTID FROM dbo.CITIES WHERE 1<>1')
       assert True
     except:
-      raise pytest.fail('unexpected error in test_query_with_no_records')
\ No newline at end of file
+      raise pytest.fail('unexpected error in test_query_with_no_records')
+
+def test_read_geolayer_wkb_matches_wkt():
+    gdf_wkb = egconn.read_geolayer('micen', geometry_format='wkb')
+    gdf_wkt = egconn.read_geolayer('micen', geometry_format='wkt')
+    assert len(gdf_wkb) == len(gdf_wkt) > 0
+    assert gdf_wkb.crs == gdf_wkt.crs
+    assert gdf_wkb.geometry.geom_equals_exact(gdf_wkt.geometry, tolerance=1e-6).all()
+
+
+def test_get_layer_metadata():
+    egconn.invalidate_catalog()
+    metadata = egconn.get_layer_metadata('micen')
+    assert metadata['layer_type'] in ('evw', 'nonversioned')
+    assert len(metadata['spatial_columns']) == 1
+    assert 'GDB_GEOMATTR_DATA' not in metadata['columns']
+    assert egconn.get_layer_metadata('micen') is metadata
+    assert egconn.find_layer_type('not_a_real_layer', 'dbo') == 'none'
+    egconn.invalidate_catalog('micen')
+    assert egconn.get_layer_metadata('micen') is not metadata
+
+
+def test_read_geolayer_pushdown():
+    gdf = egconn.read_geolayer('micen', project_to_wgs84=False)
+    minx, miny, maxx, maxy = gdf.total_bounds
+    bbox = (minx, miny, (minx + maxx) / 2, maxy)
+    gdf_bbox = egconn.read_geolayer('micen', project_to_wgs84=False, bbox=bbox)
+    assert 0 < len(gdf_bbox) <= len(gdf)
+    assert gdf_bbox.set_crs('EPSG:2285').intersects(box(*bbox)).all()
+    first_id = int(gdf['OBJECTID'].min())
+    gdf_where = egconn.read_geolayer('micen', columns=['OBJECTID'], where='OBJECTID = :id', params={'id': first_id})
+    assert list(gdf_where['OBJECTID']) == [first_id]
+    assert set(gdf_where.columns) == {'OBJECTID', 'geometry'}
+    with pytest.raises(ValueError):
+        egconn.read_geolayer('micen', columns=['not_a_column'])
+
+
+def test_read_geolayer_simplified():
+    gdf = egconn.read_geolayer('county_background', simplify_tolerance=100, grid_size=0.0001)
+    stats = gdf.attrs['geometry_stats']
+    assert stats['vertices'] < stats['source_vertices']
+    assert stats['bytes'] < stats['source_bytes']
+    assert 'SourceVertices' not in gdf.columns
+
+
+def test_read_geolayers():
+    layers = egconn.read_geolayers(['micen', 'county_background'])
+    assert list(layers) == ['micen', 'county_background']
+    assert len(layers['micen']) == len(egconn.read_geolayer('micen'))
+    assert all(gdf.crs == 'EPSG:4326' for gdf in layers.values())
+    assert layers['micen'].attrs['read_stats']['seconds'] > 0
+
+
+def test_read_geolayer_to_crs():
+    gdf = egconn.read_geolayer('micen', to_crs='EPSG:32610')
+    assert gdf.crs == 'EPSG:32610'
+    expected = egconn.read_geolayer('micen', project_to_wgs84=False).to_crs('EPSG:32610')
+    assert gdf.geometry.geom_equals_exact(expected.geometry, tolerance=1e-6).all()
+
+
+def test_read_geolayer_tiled():
+    gdf = egconn.read_geolayer('micen')
+    tiled = egconn.read_geolayer('micen', tiles=3)
+    assert sorted(tiled['OBJECTID']) == sorted(gdf['OBJECTID'])
+    assert tiled.attrs['tile_stats']['tiles'] == 9
+    ids = []
+    for tile in egconn.read_geolayer('micen', tiles=(2, 2), stream=True):
+        ids += tile['OBJECTID'].tolist()
+    assert sorted(ids) == sorted(gdf['OBJECTID'])
+    extent = egconn.layer_extent('micen')
+    assert extent[0] < extent[2] and extent[1] < extent[3]
+    indexed = egconn.read_geolayer('micen', tiles=2, extent_source='index', simplify_tolerance=10)
+    assert sorted(indexed['OBJECTID']) == sorted(gdf['OBJECTID'])
+    assert indexed.attrs['geometry_stats']['vertices'] > 0
+
+
+def test_export_geolayer(tmp_path):
+    import geopandas as gpd
+    path = str(tmp_path / 'micen.parquet')
+    stats = egconn.export_geolayer('micen', path, chunksize=5)
+    gdf = gpd.read_parquet(path)
+    assert stats['rows'] == len(gdf) == len(egconn.read_geolayer('micen'))
+    assert gdf.crs == 'EPSG:4326'
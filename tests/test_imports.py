@@ -0,0 +1,38 @@
+import subprocess
+import sys
+from pytest import raises
+
+GEO_MODULES = ('geopandas', 'shapely', 'pyproj')
+
+def loaded_geo_modules(code):
+    check = "import sys; print(','.join(m for m in {!r} if m in sys.modules))".format(GEO_MODULES)
+    out = subprocess.run([sys.executable, '-c', code + '; ' + check],
+                         capture_output=True, text=True, check=True)
+    return(out.stdout.strip())
+
+def test_import_does_not_load_geo_stack():
+    assert loaded_geo_modules('import psrcelmerpy') == ''
+
+def test_import_does_not_load_elmergeo_conn():
+    out = subprocess.run([sys.executable, '-c', "import sys, psrcelmerpy; "
+                          "print('psrcelmerpy.conn.elmergeo_conn' in sys.modules)"],
+                         capture_output=True, text=True, check=True)
+    assert out.stdout.strip() == 'False'
+
+def test_elmer_conn_does_not_load_geo_stack():
+    assert loaded_geo_modules('from psrcelmerpy import ElmerConn') == ''
+    assert loaded_geo_modules('import psrcelmerpy.conn') == ''
+
+def test_elmergeo_conn_is_importable_lazily():
+    assert loaded_geo_modules('import psrcelmerpy; psrcelmerpy.ElmerGeoConn') == ''
+    assert loaded_geo_modules('from psrcelmerpy import ElmerGeoConn') == ''
+
+def test_geo_stack_loads_on_use():
+    code = ("import psrcelmerpy; "
+            "psrcelmerpy.ElmerGeoConn.__new__(psrcelmerpy.ElmerGeoConn)._resolve_geometry_format('wkb')")
+    assert 'shapely' in loaded_geo_modules(code)
+
+def test_unknown_attribute():
+    import psrcelmerpy
+    with raises(AttributeError):
+        psrcelmerpy.NotAConn